@@ -0,0 +1,72 @@
+"""
+Benchmark: initializing many projects at once.
+
+Compares writing every project.json on its own (write_project_metadata(),
+one file fsync plus directory fsyncs per project) with one
+write_projects_metadata() batch, which fsyncs each directory once and
+updates the index with a single version bump. Both are run durable and
+non-durable; the durable numbers depend heavily on the filesystem.
+
+Usage (from backend/):
+    python -m benchmarks.bench_bulk_init [--count 500]
+"""
+from datetime import datetime, timezone
+from pathlib import Path
+import argparse
+import shutil
+import tempfile
+import time
+from modules.projects import service
+from modules.projects.models import ProjectMetadata
+
+
+def make_items(base: Path, count: int):
+    created = datetime(2025, 11, 15, 10, 30, tzinfo=timezone.utc)
+    return {
+        base / f"project-{i:06d}": ProjectMetadata(
+            project_name=f"Project {i}",
+            repo_name=f"project-{i:06d}",
+            description=f"Synthetic project number {i}",
+            created_at=created,
+        )
+        for i in range(count)
+    }
+
+
+def one_by_one(items, durable: bool) -> None:
+    for project_dir, metadata in items.items():
+        service.write_project_metadata(project_dir, metadata, durable)
+
+
+def batched(items, durable: bool) -> None:
+    service.write_projects_metadata(items, durable)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=500, help="number of projects")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        base = Path(tmp) / "projects"
+        service.settings.projects_base_dir = base
+        print(f"{args.count} projects")
+        for durable in (True, False):
+            for label, write in (("one by one", one_by_one), ("batch", batched)):
+                shutil.rmtree(base, ignore_errors=True)
+                service.project_index.clear()
+                service.metadata_cache.clear()
+                items = make_items(base, args.count)
+                version = service.project_index.version
+                
+                start = time.perf_counter()
+                write(items, durable)
+                seconds = time.perf_counter() - start
+                
+                bumps = service.project_index.version - version
+                mode = "durable" if durable else "no fsync"
+                print(f"  {mode:<9} {label:<11} {seconds * 1000:9.1f} ms  {args.count / seconds:9.0f} projects/s  {bumps} index versions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark: memory per project of the in-memory catalog.
+
+Parses --count synthetic project.json documents and uses tracemalloc to
+report bytes per project for:
+  - ProjectSummary models plus their lowercased sort-key strings (the
+    previous in-memory form)
+  - ProjectRecord objects (the current form)
+  - the whole catalog after a scan: metadata cache, project root and
+    project index, including paths and sort keys
+
+Usage (from backend/):
+    python -m benchmarks.bench_catalog_memory [--count 100000]
+"""
+from pathlib import Path
+import argparse
+import gc
+import json
+import tempfile
+import tracemalloc
+from benchmarks.synthetic import make_projects_tree
+from modules.projects import service
+from modules.projects.models import ProjectMetadata, ProjectSummary
+from modules.projects.records import ProjectRecord
+
+
+def measure(build) -> tuple:
+    """(bytes allocated and still held, result) for build()."""
+    gc.collect()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0] - before, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=100000)
+    args = parser.parse_args()
+    
+    documents = [
+        json.dumps({
+            "project_name": f"Project {i:06d}",
+            "repo_name": f"project-{i:06d}",
+            "description": f"Synthetic benchmark project number {i}",
+            "created_at": "2025-11-15T10:30:00Z",
+        }).encode("utf-8")
+        for i in range(args.count)
+    ]
+    print(f"{args.count} projects")
+    tracemalloc.start()
+    
+    def summaries():
+        models = [ProjectSummary.model_validate_json(d) for d in documents]
+        return models, [m.project_name.lower() for m in models]
+    
+    def records():
+        return [ProjectRecord.from_model(ProjectMetadata.model_validate_json(d)) for d in documents]
+    
+    for label, build in (("ProjectSummary + sort key", summaries), ("ProjectRecord", records)):
+        size, result = measure(build)
+        print(f"  {label:<28} {size / args.count:8.0f} bytes/project")
+        del result
+    
+    tracemalloc.stop()
+    with tempfile.TemporaryDirectory() as tmp:
+        service.settings.projects_base_dir = make_projects_tree(Path(tmp) / "projects", args.count)
+        service.settings.extra_projects_dirs = []
+        tracemalloc.start()
+        size, _ = measure(lambda: service.project_index.replace_all(service.scan_projects(), presorted=True))
+        tracemalloc.stop()
+        print(f"  {'catalog after scan':<28} {size / args.count:8.0f} bytes/project (cache, root, index)")
+
+
+if __name__ == "__main__":
+    main()
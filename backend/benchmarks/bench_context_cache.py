@@ -0,0 +1,71 @@
+"""
+Benchmark: assembling project context repeatedly.
+
+Builds --projects projects with --docs context documents each under
+.contextkeep/, half of them identical across projects (shared reference
+cards), then assembles every project's context --rounds times: once
+reading and decoding every file directly, once through
+context_documents() and the content cache.
+
+Usage (from backend/):
+    python -m benchmarks.bench_context_cache [--projects 50] [--docs 20]
+"""
+from pathlib import Path
+import argparse
+import os
+import tempfile
+import time
+from modules.files.cache import content_cache
+from modules.projects.service import context_documents
+
+
+def make_projects(base: Path, projects: int, docs: int) -> list:
+    shared = "# Reference card\n" + "Shared guidance line.\n" * 200
+    dirs = []
+    for p in range(projects):
+        project_dir = base / f"project-{p:04d}"
+        context = project_dir / ".contextkeep" / "cards"
+        context.mkdir(parents=True)
+        for d in range(docs):
+            text = shared + str(d) if d % 2 else f"# Work order {p}-{d}\n" + "Project specific line.\n" * 200
+            (context / f"doc{d:03d}.md").write_text(text)
+        dirs.append(project_dir)
+    return dirs
+
+
+def direct(project_dir: Path) -> dict:
+    documents = {}
+    context_dir = project_dir / ".contextkeep"
+    for directory, _, filenames in os.walk(context_dir):
+        for name in filenames:
+            with open(os.path.join(directory, name), "rb") as f:
+                documents[name] = f.read().decode("utf-8", errors="replace")
+    return documents
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--projects", type=int, default=50)
+    parser.add_argument("--docs", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        dirs = make_projects(Path(tmp), args.projects, args.docs)
+        print(f"{args.projects} projects x {args.docs} documents, {args.rounds} rounds")
+        for label, assemble in (("direct read + decode", direct), ("content cache", context_documents)):
+            content_cache.clear()
+            start = time.perf_counter()
+            for _ in range(args.rounds):
+                for project_dir in dirs:
+                    assemble(project_dir)
+            seconds = time.perf_counter() - start
+            per = seconds / (args.rounds * len(dirs)) * 1e6
+            print(f"  {label:<22} {per:9.1f} us per project context")
+        stats = content_cache.stats()
+        print(f"  cache: {stats['contents']} contents for {stats['paths']} paths, {stats['bytes'] / 2**20:.1f} MB, "
+              f"{stats['stamp_hits']} stamp hits, {stats['misses']} misses")
+
+
+if __name__ == "__main__":
+    main()
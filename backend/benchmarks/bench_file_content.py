@@ -0,0 +1,65 @@
+"""
+Benchmark: showing a window of a very large log file.
+
+Writes a --size-mb log and compares reading it whole (read_file_bytes()
+plus splitlines, what a naive content endpoint would do) with
+read_lines() windows: the first window after the file changed (builds
+the line index) and later windows deep into the file (cached index).
+Peak Python heap use is measured with tracemalloc.
+
+Usage (from backend/):
+    python -m benchmarks.bench_file_content [--size-mb 200]
+"""
+from pathlib import Path
+import argparse
+import tempfile
+import tracemalloc
+from benchmarks.synthetic import best_of
+from modules.files.content import line_index_cache, read_lines
+from modules.files.service import read_file_bytes
+
+
+def make_log(path: Path, size_mb: int) -> int:
+    line = b"2025-11-15T10:30:00.000Z INFO worker-07 request handled in 12.5 ms path=/api/projects status=200\n"
+    block = line * 10000
+    with open(path, "wb") as f:
+        for _ in range(size_mb * 2**20 // len(block)):
+            f.write(block)
+    return path.stat().st_size // len(line)
+
+
+def measure(label: str, fn, repeat: int) -> None:
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<34} {best_of(fn, repeat) * 1000:9.2f} ms  peak heap {peak / 2**20:8.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size-mb", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "big.log"
+        lines = make_log(path, args.size_mb)
+        print(f"{path.stat().st_size / 2**20:.0f} MB, {lines} lines")
+        
+        def whole_file():
+            return read_file_bytes(path).splitlines()[lines // 2 - 1:lines // 2 + 199]
+        
+        def cold_window():
+            line_index_cache.clear()
+            return read_lines(path, lines // 2, 200)
+        
+        assert cold_window().lines == [line.decode() for line in whole_file()]
+        measure("read whole file + splitlines", whole_file, args.repeat)
+        measure("read_lines, index build", cold_window, args.repeat)
+        measure("read_lines middle, cached index", lambda: read_lines(path, lines // 2, 200), args.repeat)
+        measure("read_lines last page, cached index", lambda: read_lines(path, lines - 199, 200), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark: git state (branch, HEAD, dirty, last commit) of many projects.
+
+Creates --count small git repositories (one in --dirty-every with an
+uncommitted edit) and measures:
+  - spawning git per project (`git status --porcelain=v2 --branch
+    --untracked-files=no` plus `git log -1`), as a naive handler would
+  - git_info() cold (empty cache, every repository read from .git)
+  - git_info() warm within git_status_seconds (stat() calls only)
+  - git_info() warm with the working tree re-checked
+
+Usage (from backend/):
+    python -m benchmarks.bench_git_info [--count 300] [--files 50] [--workers 8]
+"""
+from pathlib import Path
+import argparse
+import subprocess
+import tempfile
+from benchmarks.synthetic import best_of
+from modules.projects import gitinfo
+
+_GIT = ["git", "-c", "user.name=Bench", "-c", "user.email=bench@example.com"]
+
+
+def make_repos(base: Path, count: int, files: int, dirty_every: int) -> list:
+    repos = []
+    for n in range(count):
+        repo = base / f"repo-{n:05d}"
+        (repo / "src").mkdir(parents=True)
+        for f in range(files):
+            (repo / "src" / f"module_{f}.py").write_text(f"# module {f} of repo {n}\n" * 20)
+        subprocess.run([*_GIT, "init", "-q", "-b", "main"], cwd=repo, check=True)
+        subprocess.run([*_GIT, "add", "."], cwd=repo, check=True)
+        subprocess.run([*_GIT, "commit", "-q", "-m", f"Initial commit of repo {n}"], cwd=repo, check=True)
+        if dirty_every and n % dirty_every == 0:
+            (repo / "src" / "module_0.py").write_text("# edited\n")
+        repos.append(repo)
+    return repos
+
+
+def spawn_git(repos: list) -> None:
+    for repo in repos:
+        subprocess.run(
+            ["git", "status", "--porcelain=v2", "--branch", "--untracked-files=no"],
+            cwd=repo, check=True, capture_output=True,
+        )
+        subprocess.run(["git", "log", "-1", "--format=%H%x00%an%x00%ct%x00%s"], cwd=repo, check=True, capture_output=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=300)
+    parser.add_argument("--files", type=int, default=50, help="tracked files per repository")
+    parser.add_argument("--dirty-every", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    
+    gitinfo.settings.git_workers = args.workers
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"creating {args.count} repositories with {args.files} files each...")
+        repos = make_repos(Path(tmp), args.count, args.files, args.dirty_every)
+        
+        def cold():
+            gitinfo.git_cache.clear()
+            gitinfo.git_info(repos)
+        
+        def warm():
+            gitinfo.git_info(repos)
+        
+        dirty = sum(bool(info.dirty) for info in gitinfo.git_info(repos).values())
+        print(f"{len(repos)} repositories, {dirty} dirty, {args.workers} workers")
+        print(f"  git subprocesses          {best_of(lambda: spawn_git(repos), 1) * 1000:9.1f} ms")
+        print(f"  git_info cold             {best_of(cold, args.repeat) * 1000:9.1f} ms")
+        gitinfo.settings.git_status_seconds = 3600
+        gitinfo.git_info(repos)
+        print(f"  git_info warm (cached)    {best_of(warm, args.repeat) * 1000:9.1f} ms")
+        gitinfo.settings.git_status_seconds = 0
+        print(f"  git_info warm (re-check)  {best_of(warm, args.repeat) * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
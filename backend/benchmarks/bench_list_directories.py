@@ -0,0 +1,50 @@
+"""
+Benchmark: scandir-based directory listing vs the original pathlib version.
+
+Usage (from backend/):
+    python -m benchmarks.bench_list_directories [--count 10000]
+"""
+from pathlib import Path
+import argparse
+import tempfile
+from benchmarks.synthetic import best_of, make_projects_tree
+from modules.files.service import iter_directories, list_directories
+
+
+def list_directories_pathlib(base_path: Path):
+    """The original implementation: exists() + is_dir() + one stat per entry."""
+    if not base_path.exists() or not base_path.is_dir():
+        return []
+    
+    return [item for item in base_path.iterdir() if item.is_dir()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=10000, help="number of project directories")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        base = make_projects_tree(Path(tmp), args.count, plain_every=10)
+        # Loose files alongside the directories, as in a real home folder
+        for i in range(args.count // 10):
+            (base / f"notes-{i}.txt").write_text("x")
+        
+        cases = {
+            "pathlib iterdir + is_dir": lambda: list_directories_pathlib(base),
+            "scandir list_directories": lambda: list_directories(base),
+            "scandir with project.json filter": lambda: list(
+                iter_directories(base, require_file=".contextkeep/project.json")
+            ),
+        }
+        baseline = None
+        print(f"{args.count} directories, best of {args.repeat}")
+        for label, fn in cases.items():
+            seconds = best_of(fn, args.repeat)
+            baseline = baseline or seconds
+            print(f"  {label:<34} {seconds * 1000:8.2f} ms  ({baseline / seconds:4.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
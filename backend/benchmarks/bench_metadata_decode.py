@@ -0,0 +1,90 @@
+"""
+Benchmark: per-project cost of decoding and validating project.json.
+
+Compares the original pipeline (json.load, ProjectMetadata(**dict), then a
+validated ProjectSummary copy) with dict decoding on each installed JSON
+backend, and with validation straight from bytes as load_project() does
+now. The last case builds the summary with model_construct() instead,
+which skips validation but is slower in pydantic 2.x. Files are in the
+page cache, so this measures CPU cost only.
+
+Usage (from backend/):
+    python -m benchmarks.bench_metadata_decode [--count 2000]
+"""
+from pathlib import Path
+import argparse
+import json
+import tempfile
+from benchmarks.synthetic import best_of, make_projects_tree
+from modules.files.service import JSON_BACKENDS, json_backend, read_file_bytes, read_json_file
+from modules.projects.models import ProjectMetadata, ProjectSummary
+
+
+def summary_of(metadata: ProjectMetadata) -> ProjectSummary:
+    """Validated copy of the summary fields, as the original load_project made."""
+    return ProjectSummary(
+        project_name=metadata.project_name,
+        repo_name=metadata.repo_name,
+        description=metadata.description,
+        created_at=metadata.created_at
+    )
+
+
+def load_original(path: Path) -> ProjectSummary:
+    """The original load_project body."""
+    with open(path, 'r', encoding='utf-8') as f:
+        metadata_dict = json.load(f)
+    return summary_of(ProjectMetadata(**metadata_dict))
+
+
+def load_with_backend(loads):
+    def load(path: Path) -> ProjectSummary:
+        return summary_of(ProjectMetadata.model_validate(loads(read_file_bytes(path))))
+    return load
+
+
+def load_fast(path: Path) -> ProjectSummary:
+    """Validation straight from the file bytes, as load_project() reads metadata."""
+    return summary_of(read_json_file(path, ProjectMetadata))
+
+
+def load_fast_construct(path: Path) -> ProjectSummary:
+    metadata = read_json_file(path, ProjectMetadata)
+    return ProjectSummary.model_construct(
+        project_name=metadata.project_name,
+        repo_name=metadata.repo_name,
+        description=metadata.description,
+        created_at=metadata.created_at,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=2000, help="number of project.json files")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        base = make_projects_tree(Path(tmp), args.count)
+        paths = sorted(base.glob("*/.contextkeep/project.json"))
+        
+        cases = {"json.load + ProjectMetadata(**dict)": load_original}
+        for name in JSON_BACKENDS:
+            try:
+                cases[f"{name} loads + model_validate(dict)"] = load_with_backend(json_backend(name)[1])
+            except ImportError:
+                print(f"  ({name} not installed, skipped)")
+        cases["model_validate_json from bytes"] = load_fast
+        cases["model_validate_json + model_construct"] = load_fast_construct
+        
+        baseline = None
+        print(f"{len(paths)} files, best of {args.repeat}, per project")
+        for label, load in cases.items():
+            assert load(paths[0]) == load_original(paths[0])
+            seconds = best_of(lambda: [load(p) for p in paths], args.repeat)
+            baseline = baseline or seconds
+            print(f"  {label:<38} {seconds / len(paths) * 1e6:7.2f} us  ({baseline / seconds:4.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
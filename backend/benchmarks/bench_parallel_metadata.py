@@ -0,0 +1,54 @@
+"""
+Benchmark: sequential vs pooled project.json loading under simulated latency.
+
+Each read_json_file call sleeps for --latency-ms before reading, standing
+in for NFS / FUSE round trips. The metadata cache is cleared before every
+run so each run really reads every file.
+
+Usage (from backend/):
+    python -m benchmarks.bench_parallel_metadata [--count 500] [--latency-ms 2]
+"""
+from pathlib import Path
+from unittest.mock import patch
+import argparse
+import tempfile
+import time
+from benchmarks.synthetic import best_of, make_projects_tree
+from modules.files.service import read_json_file
+from modules.projects import service
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=500, help="number of projects")
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="simulated latency per file")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8, 16, 32])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    
+    latency = args.latency_ms / 1000
+    
+    def slow_read(file_path: Path, *args):
+        time.sleep(latency)
+        return read_json_file(file_path, *args)
+    
+    def run():
+        service.metadata_cache.clear()
+        return service.list_projects()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        base = make_projects_tree(Path(tmp), args.count, invalid_every=20)
+        service.settings.projects_base_dir = base
+        print(f"{args.count} projects, {args.latency_ms} ms per file, best of {args.repeat}")
+        
+        with patch("modules.projects.service.read_json_file", slow_read):
+            baseline = None
+            for workers in args.workers:
+                service.settings.metadata_workers = workers
+                seconds = best_of(run, args.repeat)
+                baseline = baseline or seconds
+                print(f"  workers={workers:<3} {seconds * 1000:9.1f} ms  ({baseline / seconds:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark: listing projects from several project roots.
+
+Splits --count projects over --roots roots and measures, with warm
+metadata caches:
+  - scan_projects() across all roots (concurrent per-root scans + merge)
+  - combining the per-root sorted results: merge_roots() (run merge by
+    list.sort), heapq.merge(), and sorting the same entries unordered
+  - scan_projects() while one root hangs for --hang seconds, bounded by
+    --timeout
+
+Usage (from backend/):
+    python -m benchmarks.bench_roots [--count 20000] [--roots 3] [--timeout 0.5]
+"""
+from operator import itemgetter
+from pathlib import Path
+import argparse
+import heapq
+import random
+import tempfile
+import time
+from benchmarks.synthetic import best_of, make_projects_tree
+from modules.projects import service
+from modules.projects.roots import merge_roots
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=20000)
+    parser.add_argument("--roots", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=0.5)
+    parser.add_argument("--hang", type=float, default=3.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        per_root = args.count // args.roots
+        paths = [make_projects_tree(Path(tmp) / f"root{r}", per_root, start=r * per_root) for r in range(args.roots)]
+        service.settings.projects_base_dir = paths[0]
+        service.settings.extra_projects_dirs = paths[1:]
+        # No timeout for the cold scan that fills the caches
+        service.settings.root_scan_timeout = 3600
+        service.scan_projects()
+        service.settings.root_scan_timeout = args.timeout
+        roots = service.project_roots()
+        total = sum(len(root.projects) for root in roots)
+        print(f"{total} projects in {len(roots)} roots")
+        
+        seconds = best_of(service.scan_projects, args.repeat)
+        print(f"  scan_projects (warm)      {seconds * 1000:9.1f} ms")
+        
+        def heap_merge():
+            merged = heapq.merge(*(root.ordered for root in roots), key=itemgetter(0))
+            return {d: s for _, d, s in merged}
+        
+        shuffled = [entry for root in roots for entry in root.ordered]
+        random.shuffle(shuffled)
+        
+        def full_sort():
+            return {d: s for _, d, s in sorted(shuffled, key=itemgetter(0))}
+        
+        for label, combine in (
+            ("merge_roots (run merge)", lambda: merge_roots(roots)),
+            ("heapq.merge", heap_merge),
+            ("sort unordered", full_sort),
+        ):
+            seconds = best_of(combine, args.repeat)
+            print(f"  {label:<25} {seconds * 1000:9.1f} ms")
+        
+        real_list = service.list_directories
+        hung = paths[-1]
+        
+        def list_directories(path):
+            if path == hung:
+                time.sleep(args.hang)
+            return real_list(path)
+        
+        service.list_directories = list_directories
+        try:
+            start = time.perf_counter()
+            projects = service.scan_projects()
+            seconds = time.perf_counter() - start
+        finally:
+            service.list_directories = real_list
+        print(f"  one root hung {args.hang:.1f}s       {seconds * 1000:9.1f} ms ({len(projects)} projects served)")
+
+
+if __name__ == "__main__":
+    main()
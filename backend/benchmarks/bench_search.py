@@ -0,0 +1,59 @@
+"""
+Benchmark: typeahead latency of the project search index.
+
+Builds the index for --count synthetic projects and times every prefix of
+a few queries, as a user typing them would issue.
+
+Usage (from backend/):
+    python -m benchmarks.bench_search [--count 10000]
+"""
+from datetime import datetime
+from pathlib import Path
+import argparse
+import random
+import time
+from modules.projects.models import ProjectSummary
+from modules.projects.search import SearchIndex
+
+WORDS = (
+    "weather karaoke task flow queue api data service bot sync cloud edge "
+    "graph stream ledger vision audio agent index cache shard render"
+).split()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=10000)
+    args = parser.parse_args()
+    
+    rng = random.Random(42)
+    entries = {}
+    for i in range(args.count):
+        name = "".join(w.capitalize() for w in rng.sample(WORDS, 2)) + str(i)
+        entries[Path(f"/projects/p{i}")] = ProjectSummary(
+            project_name=name,
+            repo_name=name.lower(),
+            description=" ".join(rng.sample(WORDS, 6)),
+            created_at=datetime(2025, 11, 15),
+        )
+    
+    index = SearchIndex()
+    start = time.perf_counter()
+    index.sync(1, entries)
+    print(f"{args.count} projects indexed in {(time.perf_counter() - start) * 1000:.1f} ms")
+    index.search("warm-up")
+    
+    for query in ["weather", "karaoke bot", "stream ledger"]:
+        timings = []
+        for n in range(1, len(query) + 1):
+            start = time.perf_counter()
+            index.search(query[:n])
+            timings.append(time.perf_counter() - start)
+        print(
+            f"  {query!r:<16} {len(timings)} keystrokes  "
+            f"max {max(timings) * 1000:6.2f} ms  mean {sum(timings) / len(timings) * 1000:6.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
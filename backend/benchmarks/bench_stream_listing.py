@@ -0,0 +1,72 @@
+"""
+Benchmark: full JSON listing vs NDJSON streaming, memory and first byte.
+
+Fills the live project index with --count synthetic projects and compares
+serializing the whole ProjectListResponse (as GET /api/projects does)
+with draining the NDJSON stream chunk by chunk. Reports the tracemalloc
+peak and the time until the first bytes are ready.
+
+Usage (from backend/):
+    python -m benchmarks.bench_stream_listing [--count 100000]
+"""
+from datetime import datetime
+from pathlib import Path
+import argparse
+import asyncio
+import time
+import tracemalloc
+from modules.projects import service
+from modules.projects.api import _ndjson_listing
+from modules.projects.models import ProjectListResponse
+from modules.projects.records import ProjectRecord
+
+
+def full_listing() -> float:
+    start = time.perf_counter()
+    ProjectListResponse(projects=[p.to_summary() for p in service.list_projects()]).model_dump_json().encode("utf-8")
+    return time.perf_counter() - start
+
+
+async def ndjson_listing() -> float:
+    start = time.perf_counter()
+    first = None
+    async for _ in _ndjson_listing():
+        first = first or time.perf_counter() - start
+    return first
+
+
+def measure(fn):
+    tracemalloc.start()
+    first_byte = fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return first_byte, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=100000)
+    args = parser.parse_args()
+    
+    service.project_index.replace_all({
+        Path(f"/projects/project-{i:06d}"): ProjectRecord(
+            f"Project {i:06d}",
+            f"project-{i:06d}",
+            f"Synthetic benchmark project number {i}",
+            datetime(2025, 11, 15, 10, 30),
+        )
+        for i in range(args.count)
+    })
+    service.project_index.live = True
+    
+    print(f"{args.count} projects in the live index")
+    for label, fn in (
+        ("full JSON body", full_listing),
+        ("NDJSON stream", lambda: asyncio.run(ndjson_listing())),
+    ):
+        first_byte, peak = measure(fn)
+        print(f"  {label:<16} first byte {first_byte * 1000:8.1f} ms  peak {peak / 2**20:8.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
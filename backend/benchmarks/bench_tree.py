@@ -0,0 +1,63 @@
+"""
+Benchmark: opening a large repository in the Files tab.
+
+Builds a synthetic monorepo (--dirs directories of --files files each,
+plus an ignored node_modules/ of the same size) and compares a full
+os.walk() of it, which a non-lazy tree would need, with listing the
+root and one package the way the Files tab expands it, cold and from
+the per-directory cache.
+
+Usage (from backend/):
+    python -m benchmarks.bench_tree [--dirs 200] [--files 50]
+"""
+from pathlib import Path
+import argparse
+import os
+import tempfile
+from benchmarks.synthetic import best_of
+from modules.files.tree import TreeCache, list_tree_page
+
+
+def make_repo(base: Path, dirs: int, files: int) -> None:
+    (base / ".gitignore").write_text("node_modules/\n*.log\n")
+    for top in ("packages", "node_modules"):
+        for d in range(dirs):
+            directory = base / top / f"pkg{d:04d}" / "src"
+            directory.mkdir(parents=True)
+            for f in range(files):
+                (directory / f"module{f:03d}.py").write_text("")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--dirs", type=int, default=200)
+    parser.add_argument("--files", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base = Path(tmp)
+        make_repo(base, args.dirs, args.files)
+
+        def walk():
+            return sum(len(names) for _, _, names in os.walk(base))
+
+        def expand(cache):
+            list_tree_page(base, cache=cache)
+            list_tree_page(base, "packages", limit=200, cache=cache)
+            list_tree_page(base, "packages/pkg0000/src", cache=cache)
+
+        warm = TreeCache()
+        expand(warm)
+        cases = {
+            "os.walk (whole tree)": walk,
+            "lazy expand, cold cache": lambda: expand(TreeCache()),
+            "lazy expand, warm cache": lambda: expand(warm),
+        }
+        print(f"{walk()} files in {2 * args.dirs} packages, best of {args.repeat}")
+        for label, fn in cases.items():
+            print(f"  {label:<26} {best_of(fn, args.repeat) * 1000:9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""
+Load test: GET /api/projects against several uvicorn worker processes.
+
+Starts `uvicorn main:app --workers N` on a synthetic projects tree in
+each of three setups and keeps --concurrency clients busy for
+--duration seconds against it:
+
+    scan    no watcher: every worker scans on each (uncached) listing
+    watch   every worker runs its own watcher over the whole tree
+    shared  CK_SHARED_INDEX=1: one elected worker watches, the rest
+            follow the shared index
+
+Listings use a query string, so the ETag body cache doesn't absorb them.
+Reports requests per second and latency, plus the full scans every
+worker ran, read from /metrics (scraped until each worker answered once,
+told apart by contextkeep_worker_pid).
+
+Usage (from backend/):
+    python -m benchmarks.load_multiworker [--workers 4] [--projects 2000] [--duration 10]
+    python -m benchmarks.load_multiworker --modes shared --workers 1 2 4 8
+"""
+from pathlib import Path
+from typing import Dict, List
+import argparse
+import asyncio
+import importlib.util
+import os
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import httpx
+from benchmarks.synthetic import make_projects_tree
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+PATH = "/api/projects?limit=100"
+
+MODES = {
+    "scan": {"CK_WATCH_PROJECTS": "false", "CK_PERSIST_CATALOG": "false"},
+    "watch": {"CK_WATCH_PROJECTS": "true", "CK_PERSIST_CATALOG": "false"},
+    "shared": {"CK_SHARED_INDEX": "true", "CK_PERSIST_CATALOG": "false"},
+}
+
+_PID_RE = re.compile(r"^contextkeep_worker_pid (\S+)$", re.M)
+_SCANS_RE = re.compile(r'^contextkeep_span_duration_seconds_count\{span="scan"\} (\S+)$', re.M)
+_SCANNER_RE = re.compile(r"^contextkeep_shared_index_scanner (\S+)$", re.M)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(base_dir: Path, workers: int, mode: str, port: int) -> subprocess.Popen:
+    """Run uvicorn with workers processes on port; returns once it answers."""
+    env = dict(os.environ, CK_PROJECTS_BASE_DIR=str(base_dir), **MODES[mode])
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "main:app",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(workers), "--log-level", "warning",
+        ],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with status {process.returncode}")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/", timeout=1).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    stop_server(process)
+    raise RuntimeError("uvicorn did not start within 30 s")
+
+
+def stop_server(process: subprocess.Popen) -> None:
+    process.terminate()
+    try:
+        process.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+async def load(client: httpx.AsyncClient, concurrency: int, duration: float) -> dict:
+    """Keep concurrency clients requesting PATH for duration seconds."""
+    latencies: List[float] = []
+    deadline = time.perf_counter() + duration
+    
+    async def client_loop():
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            response = await client.get(PATH)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+    wall = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "req_per_s": len(latencies) / wall,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+async def scrape_workers(client: httpx.AsyncClient, workers: int) -> Dict[int, dict]:
+    """{pid: {"scans", "scanner"}} per worker, from repeated /metrics scrapes."""
+    seen: Dict[int, dict] = {}
+    for _ in range(workers * 50):
+        text = (await client.get("/metrics")).text
+        pid = int(float(_PID_RE.search(text).group(1)))
+        scans = _SCANS_RE.search(text)
+        scanner = _SCANNER_RE.search(text)
+        seen[pid] = {
+            "scans": int(float(scans.group(1))) if scans else 0,
+            "scanner": bool(scanner and float(scanner.group(1))),
+        }
+        if len(seen) == workers:
+            break
+    return seen
+
+
+async def measure(port: int, workers: int, args) -> dict:
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=None, limits=limits) as client:
+        # Let the watchers / shared index settle before measuring
+        await load(client, args.concurrency, args.warmup)
+        result = await load(client, args.concurrency, args.duration)
+        result["workers"] = await scrape_workers(client, workers)
+        return result
+
+
+def _report(mode: str, workers: int, result: dict) -> None:
+    per_worker = result["workers"]
+    scans = sum(w["scans"] for w in per_worker.values())
+    scanners = sum(w["scanner"] for w in per_worker.values())
+    print(
+        f"  {mode:<7} {workers:3d} workers  {result['req_per_s']:8.1f} req/s  "
+        f"p50 {result['p50_ms']:7.1f} ms  p99 {result['p99_ms']:7.1f} ms  "
+        f"{scans:6d} scans in {len(per_worker)} workers seen"
+        + (f" ({scanners} scanner)" if mode == "shared" else "")
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, nargs="+", default=[4])
+    parser.add_argument("--modes", nargs="+", choices=sorted(MODES), default=["scan", "watch", "shared"])
+    parser.add_argument("--projects", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of measured load")
+    parser.add_argument("--warmup", type=float, default=2.0, help="seconds of unmeasured load first")
+    args = parser.parse_args()
+    
+    if importlib.util.find_spec("uvicorn") is None:
+        sys.exit("uvicorn is required (pip install 'uvicorn[standard]')")
+    
+    print(f"{args.projects} projects, {args.concurrency} clients, {args.duration:g} s per run, GET {PATH}")
+    for workers in args.workers:
+        for mode in args.modes:
+            # A fresh tree per run, so no run inherits another's shared database
+            with tempfile.TemporaryDirectory() as tmp:
+                base_dir = make_projects_tree(Path(tmp), args.projects)
+                port = _free_port()
+                process = start_server(base_dir, workers, mode, port)
+                try:
+                    _report(mode, workers, asyncio.run(measure(port, workers, args)))
+                finally:
+                    stop_server(process)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Load test: many concurrent GET /api/projects requests.
+
+By default runs in-process against main:app over httpx's ASGI transport,
+comparing the async endpoint with the old sync handler (registered here
+as /api/projects-sync) while file reads sleep for --latency-ms. It also
+times a health check (GET /) issued in the middle of the burst, to show
+whether the server stays responsive. It then counts the project scans
+per burst at growing concurrency, which single-flight coalescing should
+keep flat. With --url it targets a running server instead (no latency
+simulation, no sync comparison, no scan counts).
+
+Usage (from backend/):
+    python -m benchmarks.load_projects_api [--concurrency 200] [--projects 50]
+    python -m benchmarks.load_projects_api --url http://localhost:8000
+"""
+from pathlib import Path
+from unittest.mock import patch
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+import httpx
+from benchmarks.synthetic import make_projects_tree
+
+
+async def _timed_get(client: httpx.AsyncClient, path: str) -> float:
+    start = time.perf_counter()
+    response = await client.get(path)
+    response.raise_for_status()
+    return time.perf_counter() - start
+
+
+async def burst(client: httpx.AsyncClient, path: str, concurrency: int) -> dict:
+    """Fire concurrency requests at once and summarise their latencies."""
+    start = time.perf_counter()
+    tasks = [asyncio.create_task(_timed_get(client, path)) for _ in range(concurrency)]
+    await asyncio.sleep(0.01)
+    health = await _timed_get(client, "/")
+    latencies = sorted(await asyncio.gather(*tasks))
+    wall = time.perf_counter() - start
+    return {
+        "wall_s": wall,
+        "req_per_s": concurrency / wall,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "health_ms": health * 1000,
+    }
+
+
+def _report(label: str, result: dict) -> None:
+    print(
+        f"  {label:<22} wall {result['wall_s'] * 1000:8.1f} ms  "
+        f"{result['req_per_s']:7.1f} req/s  p50 {result['p50_ms']:8.1f} ms  "
+        f"p99 {result['p99_ms']:8.1f} ms  health {result['health_ms']:7.1f} ms"
+    )
+
+
+async def run_in_process(args) -> None:
+    from main import app
+    from modules.files.service import read_json_file
+    from modules.projects import service
+    from modules.projects.models import ProjectListResponse
+    
+    @app.get("/api/projects-sync", response_model=ProjectListResponse)
+    def get_projects_sync():
+        return ProjectListResponse(projects=service.list_projects())
+    
+    latency = args.latency_ms / 1000
+    
+    def slow_read(file_path: Path, *args):
+        time.sleep(latency)
+        return read_json_file(file_path, *args)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        service.settings.projects_base_dir = make_projects_tree(Path(tmp), args.projects)
+        # Every request should really hit storage
+        service.metadata_cache.max_entries = 0
+        service.metadata_cache.clear()
+        
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=None) as client:
+            with patch("modules.projects.service.read_json_file", slow_read):
+                print(
+                    f"{args.concurrency} concurrent requests, {args.projects} projects, "
+                    f"{args.latency_ms} ms per file"
+                )
+                _report("sync def handler", await burst(client, "/api/projects-sync", args.concurrency))
+                _report("async def handler", await burst(client, "/api/projects", args.concurrency))
+                
+                # A query string bypasses the ETag body cache, so every request needs a fresh scan
+                print("scans per burst (single-flight)")
+                for concurrency in (1, 10, 50, args.concurrency):
+                    runs = service._scan_flight.runs
+                    result = await burst(client, "/api/projects?limit=1000", concurrency)
+                    scans = service._scan_flight.runs - runs
+                    print(f"  concurrency {concurrency:<5} {scans:4d} scans  p50 {result['p50_ms']:8.1f} ms")
+
+
+async def run_remote(args) -> None:
+    async with httpx.AsyncClient(base_url=args.url, timeout=None) as client:
+        print(f"{args.concurrency} concurrent requests against {args.url}")
+        _report("GET /api/projects", await burst(client, "/api/projects", args.concurrency))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--projects", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=1.0, help="simulated latency per file")
+    parser.add_argument("--url", help="target a running server instead of the in-process app")
+    args = parser.parse_args()
+    
+    asyncio.run(run_remote(args) if args.url else run_in_process(args))
+
+
+if __name__ == "__main__":
+    main()
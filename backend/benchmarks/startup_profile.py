@@ -0,0 +1,106 @@
+"""
+Startup profiler: where the API process spends its cold-start time.
+
+Imports main:app in a fresh interpreter with -X importtime and groups
+the import cost by top-level package (and by module for our own code),
+then runs the app's lifespan startup and reports how long it took.
+Each run uses a new process, so nothing is cached between runs except
+the OS page cache and bytecode. The child's project root is an empty
+temporary directory, so the watchers it starts and the catalog and
+search index it saves at shutdown never touch the real projects.
+
+Usage (from backend/):
+    python -m benchmarks.startup_profile [--top 15] [--repeat 5] [--json]
+"""
+from collections import defaultdict
+from typing import Dict, List, Tuple
+import argparse
+import json
+import statistics
+import os
+import subprocess
+import sys
+import tempfile
+
+OWN_PACKAGES = ("main", "config", "modules")
+
+# Run in the child: time `import main`, then the lifespan startup/shutdown
+_CHILD = """
+import asyncio, json, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+async def lifespan():
+    async with main.lifespan(main.app):
+        return time.perf_counter()
+ready = asyncio.run(lifespan())
+print(json.dumps({"import_s": imported - start, "lifespan_s": ready - imported}))
+"""
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int]]:
+    """(module, self microseconds) for every line of -X importtime output."""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, _cumulative, name = line[len("import time:"):].split("|")
+        if self_us.strip().isdigit():
+            modules.append((name.strip(), int(self_us)))
+    return modules
+
+
+def group(modules: List[Tuple[str, int]]) -> Dict[str, int]:
+    """Self time per top-level package; own modules are listed individually."""
+    totals: Dict[str, int] = defaultdict(int)
+    for name, self_us in modules:
+        top = name.split(".")[0]
+        totals[name if top in OWN_PACKAGES else top] += self_us
+    return dict(totals)
+
+
+def run_once() -> Tuple[dict, Dict[str, int]]:
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {k: v for k, v in os.environ.items() if not k.upper().startswith("CK_")}
+        env.update(CK_PROJECTS_BASE_DIR=tmp, CK_EXTRA_PROJECTS_DIRS="[]")
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", _CHILD],
+            capture_output=True, text=True, check=True, env=env,
+        )
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    return timings, group(parse_importtime(result.stderr))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--top", type=int, default=15, help="packages to list")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+    
+    runs = [run_once() for _ in range(args.repeat)]
+    import_s = statistics.median(t["import_s"] for t, _ in runs)
+    lifespan_s = statistics.median(t["lifespan_s"] for t, _ in runs)
+    packages = {
+        name: statistics.median(g.get(name, 0) for _, g in runs)
+        for name in set().union(*(g for _, g in runs))
+    }
+    ranked = sorted(packages.items(), key=lambda item: -item[1])
+    
+    if args.json:
+        print(json.dumps({
+            "import_ms": import_s * 1000,
+            "lifespan_ms": lifespan_s * 1000,
+            "packages_ms": {name: us / 1000 for name, us in ranked},
+        }, indent=2))
+        return
+    
+    print(f"import main: {import_s * 1000:.1f} ms, lifespan startup: {lifespan_s * 1000:.1f} ms (median of {args.repeat})")
+    own = sum(us for name, us in packages.items() if name.split(".")[0] in OWN_PACKAGES)
+    print(f"  own code: {own / 1000:.1f} ms")
+    for name, us in ranked[:args.top]:
+        print(f"  {name:<40} {us / 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+Benchmark suite: scan, read and API numbers across project counts.
+
+For each size (default 10 / 1k / 10k / 100k projects) a synthetic
+projects_base_dir is generated with some invalid project.json files and
+some directories without metadata, then measured:
+
+    list_directories_ms     one list_directories() of the base dir
+    read_json_file_us       read_json_file() per file (up to 1000 files)
+    list_projects_cold_ms   list_projects() with empty cache and index
+    list_projects_warm_ms   list_projects() with everything cached
+    scan_peak_mb            tracemalloc peak during the cold scan
+    api_full_rps / _p50_ms  GET /api/projects through the ASGI app
+    api_page_rps / _p50_ms  GET /api/projects?limit=50 (scans every time)
+
+Timings are the best of --repeat runs. The metadata cache is sized to
+hold every project so warm numbers stay warm at 100k. Results are written
+as JSON (--output); pass an earlier file as --baseline to print the
+relative change of every metric.
+
+Trees are generated in --workdir when given and reused by later runs,
+since 100k projects take a while to create.
+
+Usage (from backend/):
+    python -m benchmarks.suite [--sizes 10 1000 10000 100000] [--output results.json]
+    python -m benchmarks.suite --sizes 1000 --baseline results.json
+"""
+from pathlib import Path
+from typing import Dict, Optional
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import httpx
+from benchmarks.synthetic import best_of, make_projects_tree
+from modules.files.service import json_backend, list_directories, read_json_file
+from modules.projects import service
+
+RESULTS_VERSION = 1
+
+# Metrics where a larger value is better (everything else: lower is better)
+HIGHER_IS_BETTER = {"api_full_rps", "api_page_rps"}
+
+
+def projects_tree(workdir: Path, count: int) -> Path:
+    """Generated (or previously generated) tree of count projects."""
+    base = workdir / f"projects-{count}"
+    marker = base / ".complete"
+    if not marker.exists():
+        make_projects_tree(base, count, invalid_every=50, plain_every=25)
+        marker.write_text("")
+    return base
+
+
+def _reset() -> None:
+    service.stop_watching()
+    service.metadata_cache.clear()
+
+
+def measure_scan(base: Path, repeat: int) -> Dict[str, float]:
+    service.settings.projects_base_dir = base
+    results = {}
+    results["list_directories_ms"] = best_of(lambda: list_directories(base), repeat) * 1000
+    
+    files = sorted(base.glob("*/.contextkeep/project.json"))[:1000]
+    
+    def read_all():
+        for path in files:
+            try:
+                read_json_file(path)
+            except ValueError:
+                pass
+    results["read_json_file_us"] = best_of(read_all, repeat) / max(len(files), 1) * 1e6
+    
+    def cold():
+        _reset()
+        service.list_projects()
+    results["list_projects_cold_ms"] = best_of(cold, repeat) * 1000
+    results["list_projects_warm_ms"] = best_of(service.list_projects, repeat) * 1000
+    
+    _reset()
+    tracemalloc.start()
+    service.list_projects()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    results["scan_peak_mb"] = peak / 2**20
+    return results
+
+
+async def _throughput(client: httpx.AsyncClient, path: str, requests: int, concurrency: int) -> Dict[str, float]:
+    latencies = []
+    queue = iter(range(requests))
+    
+    async def worker():
+        for _ in queue:
+            start = time.perf_counter()
+            response = await client.get(path)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - start
+    return {"rps": requests / wall, "p50_ms": statistics.median(latencies) * 1000}
+
+
+async def measure_api(base: Path, requests: int, concurrency: int) -> Dict[str, float]:
+    from main import app
+    service.settings.projects_base_dir = base
+    _reset()
+    
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        for name, path in (("api_full", "/api/projects"), ("api_page", "/api/projects?limit=50")):
+            await client.get(path)
+            numbers = await _throughput(client, path, requests, concurrency)
+            results[f"{name}_rps"] = numbers["rps"]
+            results[f"{name}_p50_ms"] = numbers["p50_ms"]
+    return results
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict, baseline: dict) -> None:
+    """Print each metric next to the baseline, with the relative change."""
+    print(f"vs baseline {baseline['meta'].get('git_revision')} ({baseline['meta'].get('timestamp')})")
+    for size, metrics in results["results"].items():
+        old_metrics = baseline["results"].get(size)
+        if old_metrics is None:
+            continue
+        print(f"  {size} projects")
+        for name, value in metrics.items():
+            old = old_metrics.get(name)
+            if not old:
+                continue
+            change = (value - old) / old * 100
+            better = change > 0 if name in HIGHER_IS_BETTER else change < 0
+            verdict = "better" if better else "worse"
+            print(f"    {name:<24} {old:12.2f} -> {value:12.2f}  {change:+7.1f}% {verdict}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--requests", type=int, default=200, help="API requests per endpoint and size")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--workdir", type=Path, help="keep generated trees here for reuse")
+    parser.add_argument("--output", type=Path, help="write JSON results to this file")
+    parser.add_argument("--baseline", type=Path, help="earlier JSON results to compare against")
+    args = parser.parse_args()
+    
+    service.settings.watch_projects = False
+    service.metadata_cache.max_entries = max(max(args.sizes), service.settings.metadata_cache_size)
+    
+    results = {
+        "version": RESULTS_VERSION,
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "git_revision": _git_revision(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "json_backend": json_backend()[0],
+            "metadata_workers": service.settings.metadata_workers,
+            "repeat": args.repeat,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+        },
+        "results": {},
+    }
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = args.workdir or Path(tmp)
+        workdir.mkdir(parents=True, exist_ok=True)
+        for size in args.sizes:
+            print(f"{size} projects", file=sys.stderr)
+            base = projects_tree(workdir, size)
+            metrics = measure_scan(base, args.repeat)
+            metrics.update(asyncio.run(measure_api(base, args.requests, args.concurrency)))
+            results["results"][str(size)] = metrics
+            for name, value in metrics.items():
+                print(f"  {name:<24} {value:12.2f}", file=sys.stderr)
+        _reset()
+    
+    results["meta"]["max_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+    else:
+        print(json.dumps(results, indent=2))
+    if args.baseline:
+        compare(results, json.loads(args.baseline.read_text()))
+
+
+if __name__ == "__main__":
+    main()
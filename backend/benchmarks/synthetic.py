@@ -0,0 +1,53 @@
+"""
+Synthetic projects_base_dir trees for benchmarks.
+"""
+from pathlib import Path
+import json
+import time
+
+
+def make_projects_tree(base: Path, count: int, invalid_every: int = 0, plain_every: int = 0, start: int = 0) -> Path:
+    """
+    Populate base with count project directories.
+    
+    Args:
+        base: Directory to fill (created if missing)
+        count: Number of project directories
+        invalid_every: Every Nth project gets malformed project.json (0 = never)
+        plain_every: Every Nth directory has no .contextkeep/ at all (0 = never)
+        start: Number of the first project, so several trees can hold
+            distinct projects
+    
+    Returns:
+        base
+    """
+    base.mkdir(parents=True, exist_ok=True)
+    for i in range(start, start + count):
+        project_dir = base / f"project-{i:06d}"
+        if plain_every and i % plain_every == 0:
+            project_dir.mkdir(exist_ok=True)
+            continue
+        metadata_dir = project_dir / ".contextkeep"
+        metadata_dir.mkdir(parents=True, exist_ok=True)
+        if invalid_every and i % invalid_every == 0:
+            content = "{ not valid json"
+        else:
+            content = json.dumps({
+                "project_name": f"Project {i:06d}",
+                "repo_name": f"project-{i:06d}",
+                "description": f"Synthetic benchmark project number {i}",
+                "created_at": "2025-11-15T10:30:00Z",
+                "contextkeep_version": "0.1.0"
+            })
+        (metadata_dir / "project.json").write_text(content)
+    return base
+
+
+def best_of(fn, repeat: int = 5) -> float:
+    """Run fn repeat times and return the fastest wall-clock time in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
@@ -2,6 +2,7 @@
 Configuration settings for ContextKeep.
 """
 from pathlib import Path
+from typing import List, Optional
 from pydantic_settings import BaseSettings
 
 
@@ -10,10 +11,45 @@ class Settings(BaseSettings):
     
     # Projects
     projects_base_dir: Path = Path.home() / "contextkeep-projects"
+    # More roots to list projects from (JSON list in CK_EXTRA_PROJECTS_DIRS)
+    extra_projects_dirs: List[Path] = []
+    root_scan_timeout: float = 10.0
+    metadata_cache_size: int = 10000
+    metadata_workers: int = 8
+    io_workers: int = 32
+    watch_projects: bool = True
+    persist_catalog: bool = True
+    watch_poll_interval: float = 2.0
+    json_backend: str = "auto"
+    scan_stale_seconds: float = 0.0
+    # Within scan_stale_seconds, scans younger than this aren't revalidated
+    scan_fresh_seconds: float = 1.0
+    
+    # Files
+    tree_cache_size: int = 2000
+    content_cache_bytes: int = 64 * 2**20
+    
+    # Git
+    git_workers: int = 8
+    git_status_seconds: float = 5.0
+    
+    # Phases
+    phase_refresh_seconds: float = 1.0
+    
+    # Workers
+    # Share one project index between worker processes (see modules/projects/shared.py)
+    shared_index: bool = False
+    shared_index_path: Optional[Path] = None
+    shared_index_interval: float = 0.5
     
     # API
     api_host: str = "0.0.0.0"
     api_port: int = 8000
+    server_timing: bool = False
+    
+    def project_roots(self) -> List[Path]:
+        """projects_base_dir followed by extra_projects_dirs, without duplicates."""
+        return list(dict.fromkeys([self.projects_base_dir, *self.extra_projects_dirs]))
     
     class Config:
         env_prefix = "CK_"
@@ -1,14 +1,65 @@
 """
 FastAPI application setup.
 """
+from contextlib import asynccontextmanager
+from threading import Thread
+import logging
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from config import settings
+from modules.files.api import router as files_router
+from modules.metrics.api import router as metrics_router
+from modules.metrics.middleware import TimingMiddleware
+from modules.phases.api import router as phases_router
+from modules.projects import service as projects_service
 from modules.projects.api import router as projects_router
 
+logger = logging.getLogger(__name__)
+
+# Seconds shutdown waits for a project startup stuck on a slow mount
+STARTUP_JOIN_TIMEOUT = 10.0
+
+
+def start_projects() -> None:
+    """Seed the project index from the catalog and start keeping it current"""
+    catalog_loaded = settings.persist_catalog and projects_service.load_catalog() > 0
+    if settings.shared_index:
+        # Several workers: one elected scanner watches, the others follow it
+        projects_service.start_shared_index()
+    elif settings.watch_projects:
+        projects_service.start_watching()
+    elif catalog_loaded:
+        projects_service.reconcile_in_background()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start background services on startup, stop them on shutdown"""
+    # uvicorn binds only once startup returns, so nothing is loaded here;
+    # until the index is live, listings scan on demand as without a watcher
+    Thread(target=projects_service.ensure_search_index, name="search-index-load", daemon=True).start()
+    projects_startup = Thread(target=start_projects, name="projects-startup", daemon=True)
+    projects_startup.start()
+    yield
+    # Watchers started late would outlive the stop calls below
+    projects_startup.join(STARTUP_JOIN_TIMEOUT)
+    if projects_startup.is_alive():
+        logger.warning("Project startup still running after %.0f s, shutting down without it", STARTUP_JOIN_TIMEOUT)
+    # Only the worker that scans writes the files shared by all workers
+    owner = projects_service.owns_projects()
+    if owner and settings.persist_catalog:
+        projects_service.save_catalog()
+    projects_service.stop_shared_index()
+    projects_service.stop_watching()
+    if owner:
+        projects_service.save_search_index()
+
+
 app = FastAPI(
     title="ContextKeep API",
     description="Backend API for ContextKeep IDE",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan
 )
 
 # CORS middleware for frontend
@@ -23,8 +74,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-route latency histograms (outermost, so CORS is timed too)
+app.add_middleware(TimingMiddleware, server_timing=settings.server_timing)
+
 # Include routers
 app.include_router(projects_router, prefix="/api", tags=["projects"])
+app.include_router(files_router, prefix="/api", tags=["files"])
+app.include_router(phases_router, prefix="/api", tags=["phases"])
+app.include_router(metrics_router, tags=["metrics"])
 
 
 @app.get("/")
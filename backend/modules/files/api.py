@@ -0,0 +1,144 @@
+"""
+Files API endpoints.
+"""
+from functools import partial
+from pathlib import Path
+from typing import Optional, Tuple
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import FileResponse
+from modules.files.content import read_lines, sniff_file
+from modules.files.models import FileContent, TreePage
+from modules.files.service import run_io
+from modules.files.tree import list_tree_page, resolve_tree_path
+from modules.metrics.service import span
+from modules.projects.service import find_project_dir
+
+router = APIRouter()
+
+
+def project_root(project: str) -> Path:
+    """
+    Directory of a project, by its id (the directory name).
+    
+    Raises:
+        HTTPException: 400 for ids that are not a plain directory name
+    """
+    try:
+        return find_project_dir(project)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/files/tree", response_model=TreePage)
+async def get_tree(
+    project: str = Query(..., description="Project id (its directory name)"),
+    path: Optional[str] = Query(None, description="Directory relative to the project, omit for the root"),
+    cursor: Optional[str] = None,
+    limit: int = Query(200, ge=1, le=5000),
+    show_ignored: bool = Query(False, description="Include entries excluded by .gitignore"),
+):
+    """
+    List one directory of a project's file tree.
+    
+    The tree is meant to be expanded lazily: each call lists a single
+    directory (directories first, then files, case-insensitively by name)
+    with type, size and mtime per entry. Entries matched by .gitignore
+    (and .git itself) are left out unless show_ignored is set. Large
+    directories are paged; follow next_cursor to fetch the next page.
+    
+    Returns:
+        TreePage with the entries of the requested page.
+    """
+    root = project_root(project)
+    try:
+        with span("tree"):
+            return await run_io(partial(
+                list_tree_page,
+                root,
+                path=path,
+                cursor=cursor,
+                limit=limit,
+                show_ignored=show_ignored,
+            ))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except (FileNotFoundError, NotADirectoryError):
+        raise HTTPException(status_code=404, detail="Directory not found")
+
+
+def project_file(project: str, path: str) -> Tuple[Path, str]:
+    """
+    Absolute and normalized relative path of a file in a project.
+    
+    Raises:
+        HTTPException: 400 for invalid ids or paths leaving the project
+    """
+    root = project_root(project)
+    try:
+        rel_path = resolve_tree_path(root, path)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not rel_path:
+        raise HTTPException(status_code=400, detail="path must name a file")
+    return root / rel_path, rel_path
+
+
+@router.get("/files/content", response_model=FileContent)
+async def get_file_content(
+    project: str = Query(..., description="Project id (its directory name)"),
+    path: str = Query(..., description="File relative to the project"),
+    start_line: int = Query(1, ge=1, description="First line to return (1-based)"),
+    line_count: int = Query(200, ge=1, le=5000),
+):
+    """
+    A window of lines of a text file.
+    
+    Lines are located through a cached sparse line index and read with
+    bounded os.pread() calls, so windows deep into very large files are
+    cheap and the file is never loaded as a whole. Binary files (and UTF-16/32
+    text) are detected up front and come back without lines; fetch them
+    through /files/raw instead.
+    
+    Returns:
+        FileContent with the detected encoding, total line count and lines.
+    """
+    file_path, rel_path = project_file(project, path)
+    try:
+        with span("file_content"):
+            return await run_io(read_lines, file_path, start_line, line_count, rel_path)
+    except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+        raise HTTPException(status_code=404, detail="File not found")
+
+
+@router.get("/files/raw")
+async def get_file_raw(
+    project: str = Query(..., description="Project id (its directory name)"),
+    path: str = Query(..., description="File relative to the project"),
+):
+    """
+    Raw file bytes, with HTTP Range support.
+    
+    Single and multiple byte ranges (206 Partial Content), If-Range and
+    416 for unsatisfiable ranges are handled by Starlette's FileResponse,
+    which streams the file in chunks (or hands it to the server through
+    the ASGI pathsend extension) instead of reading it into memory. Text
+    is served as text/plain with the detected charset, everything else
+    as application/octet-stream.
+    """
+    file_path, _ = project_file(project, path)
+    try:
+        st, binary, encoding = await run_io(sniff_file, file_path)
+    except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+        raise HTTPException(status_code=404, detail="File not found")
+    
+    if binary:
+        media_type = "application/octet-stream"
+    else:
+        charset = {"utf-8-sig": "utf-8", "latin-1": "iso-8859-1"}.get(encoding, encoding)
+        media_type = f"text/plain; charset={charset}"
+    return FileResponse(
+        file_path,
+        stat_result=st,
+        media_type=media_type,
+        headers={"X-Content-Type-Options": "nosniff"},
+    )
@@ -0,0 +1,207 @@
+"""
+Content-addressed cache of small documents (context documents, metadata).
+
+Files are keyed by a BLAKE2b digest of their bytes. A read first compares
+the file's stamp (mtime_ns, size, inode) with the one seen last time and,
+if unchanged, returns the cached content without touching the file.
+Otherwise the file is read and hashed; identical content under different
+paths (the same reference card copied into many projects) is stored once,
+and parse results are kept per content, so a changed stamp with unchanged
+bytes does not re-parse either.
+
+The cache is bounded by the total size of the cached contents and evicts
+least recently used contents first.
+"""
+from collections import OrderedDict
+from pathlib import Path
+from threading import Lock
+from typing import Any, Callable, Dict, Hashable, Optional, Set, Tuple, TypeVar, Union
+import hashlib
+import os
+from modules.files.service import BYTES_READ, FILES_READ, FileStamp
+from modules.metrics.service import registry
+from config import settings
+
+T = TypeVar("T")
+
+DIGEST_SIZE = 16
+
+PathLike = Union[str, Path]
+
+
+class _Content:
+    """One distinct file content, its parse results and the paths that have it."""
+    
+    __slots__ = ("data", "parsed", "paths")
+    
+    def __init__(self, data: bytes):
+        self.data = data
+        self.parsed: Dict[Hashable, Any] = {}
+        self.paths: Set[str] = set()
+
+
+def content_digest(data: bytes) -> str:
+    """Hex BLAKE2b digest used as the content key."""
+    return hashlib.blake2b(data, digest_size=DIGEST_SIZE).hexdigest()
+
+
+class ContentCache:
+    """
+    Documents cached by content digest, with stamp short-circuiting.
+    
+    Parse results are shared between all callers (and all paths with the
+    same content) and must be treated as read-only. Thread-safe.
+    
+    Args:
+        max_bytes: Bound on the summed size of cached contents; files
+            larger than this are read but never cached
+    """
+    
+    def __init__(self, max_bytes: int = 64 * 2**20):
+        self.max_bytes = max_bytes
+        self.size = 0
+        # Served on an unchanged stamp without reading the file
+        self.stamp_hits = 0
+        # Read, but the content was already cached (changed stamp or another path)
+        self.content_hits = 0
+        self.misses = 0
+        # str(path) -> (stamp, digest); strings keep lookups cheaper than Path
+        self._paths: Dict[str, Tuple[FileStamp, str]] = {}
+        self._contents: "OrderedDict[str, _Content]" = OrderedDict()
+        self._lock = Lock()
+    
+    def __len__(self) -> int:
+        return len(self._contents)
+    
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._paths.clear()
+            self._contents.clear()
+            self.size = 0
+            self.stamp_hits = self.content_hits = self.misses = 0
+    
+    def _cached(self, path: str) -> Optional[_Content]:
+        try:
+            st = os.stat(path)
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        with self._lock:
+            known = self._paths.get(path)
+            if known is None or known[0] != (st.st_mtime_ns, st.st_size, st.st_ino):
+                return None
+            content = self._contents.get(known[1])
+            if content is not None:
+                self._contents.move_to_end(known[1])
+                self.stamp_hits += 1
+            return content
+    
+    def _evict(self) -> None:
+        # Called with the lock held
+        while self.size > self.max_bytes and self._contents:
+            digest, content = self._contents.popitem(last=False)
+            self.size -= len(content.data)
+            for path in content.paths:
+                if self._paths.get(path, (None, None))[1] == digest:
+                    del self._paths[path]
+    
+    def _load(self, path: PathLike) -> _Content:
+        path = os.fspath(path)
+        content = self._cached(path)
+        if content is not None:
+            return content
+        
+        # Stamp and bytes come from the same open file, so they match
+        with open(path, "rb") as f:
+            st = os.fstat(f.fileno())
+            data = f.read()
+        FILES_READ.inc()
+        BYTES_READ.inc(len(data))
+        stamp = (st.st_mtime_ns, st.st_size, st.st_ino)
+        digest = content_digest(data)
+        
+        with self._lock:
+            content = self._contents.get(digest)
+            if content is not None:
+                self.content_hits += 1
+                self._contents.move_to_end(digest)
+            else:
+                self.misses += 1
+                content = _Content(data)
+                if len(data) > self.max_bytes:
+                    return content
+                self._contents[digest] = content
+                self.size += len(data)
+            
+            previous = self._paths.get(path)
+            if previous is not None and previous[1] != digest:
+                old = self._contents.get(previous[1])
+                if old is not None:
+                    old.paths.discard(path)
+            self._paths[path] = (stamp, digest)
+            content.paths.add(path)
+            self._evict()
+        return content
+    
+    def read(self, path: PathLike) -> bytes:
+        """
+        Contents of path.
+        
+        Raises:
+            FileNotFoundError: If path doesn't exist
+        """
+        return self._load(path).data
+    
+    def load(self, path: PathLike, parser: Callable[[bytes], T], key: Optional[Hashable] = None) -> T:
+        """
+        parser(contents of path), parsed at most once per distinct content.
+        
+        Args:
+            path: File to read
+            parser: Turns the bytes into the wanted value; exceptions
+                propagate and nothing is cached for them
+            key: Cache key for the parser (defaults to the parser itself)
+        
+        Raises:
+            FileNotFoundError: If path doesn't exist
+        """
+        content = self._load(path)
+        key = parser if key is None else key
+        try:
+            return content.parsed[key]
+        except KeyError:
+            pass
+        value = parser(content.data)
+        content.parsed.setdefault(key, value)
+        return value
+    
+    def stats(self) -> dict:
+        """Current size, bound and hit/miss counters."""
+        return {
+            "contents": len(self._contents),
+            "paths": len(self._paths),
+            "bytes": self.size,
+            "max_bytes": self.max_bytes,
+            "stamp_hits": self.stamp_hits,
+            "content_hits": self.content_hits,
+            "misses": self.misses,
+        }
+
+
+content_cache = ContentCache(max_bytes=settings.content_cache_bytes)
+
+registry.callback(
+    "contextkeep_content_cache_bytes", "Bytes held by the document content cache", lambda: content_cache.size
+)
+registry.callback(
+    "contextkeep_content_cache_stamp_hits_total", "Documents served without reading the file",
+    lambda: content_cache.stamp_hits, kind="counter",
+)
+registry.callback(
+    "contextkeep_content_cache_content_hits_total", "Documents read whose content was already cached",
+    lambda: content_cache.content_hits, kind="counter",
+)
+registry.callback(
+    "contextkeep_content_cache_misses_total", "Documents read with new content",
+    lambda: content_cache.misses, kind="counter",
+)
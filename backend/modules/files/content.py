@@ -0,0 +1,315 @@
+"""
+File content reads for the file viewer.
+
+A byte range or a window of lines from a big file (logs, generated code)
+is read with bounded os.pread() calls, so only the part that is shown is
+loaded onto the Python heap, and a file truncated while it is read just
+ends early. Encoding and binary detection look at the first SNIFF_SIZE
+bytes only.
+
+Line windows are located through a sparse line index: the byte offset of
+every LINE_INDEX_STRIDE-th line, built in one chunked pass per file
+version and cached by file stamp.
+"""
+from collections import OrderedDict
+from itertools import accumulate
+from pathlib import Path
+from threading import Lock
+from typing import List, NamedTuple, Optional, Tuple
+import codecs
+import os
+import stat
+from modules.files.models import FileContent
+from modules.files.service import BYTES_READ, FILES_READ, FileStamp
+from modules.metrics.service import span
+
+# Bytes looked at by detect_encoding()
+SNIFF_SIZE = 8192
+# A line index entry every this many lines
+LINE_INDEX_STRIDE = 1024
+# Bytes read per step while building a line index
+LINE_INDEX_CHUNK = 1 << 20
+# Bytes read per step while walking the lines of a window
+READ_CHUNK = 64 * 1024
+# Files whose line index is kept
+LINE_INDEX_CACHE_SIZE = 64
+# Longer lines are cut off in line windows (minified files, binary-ish logs)
+MAX_LINE_BYTES = 64 * 1024
+
+# Checked in order: the UTF-32 LE BOM starts with the UTF-16 LE one
+_BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+# Encodings in which b"\n" always is a line break
+LINE_ENCODINGS = frozenset({"utf-8", "utf-8-sig", "latin-1"})
+# Control bytes that are unusual in text
+_CONTROL_BYTES = bytes(b for b in range(0x20) if b not in b"\t\n\r\f\b\x1b")
+
+
+def detect_encoding(sample: bytes, complete: bool = False) -> Tuple[bool, Optional[str]]:
+    """
+    Classify the start of a file as binary or text.
+    
+    A BOM decides; otherwise NUL bytes or more than 10% control characters
+    mean binary, valid UTF-8 means utf-8 and anything else is read as latin-1
+    (every byte sequence decodes).
+    
+    Args:
+        sample: The first bytes of the file
+        complete: True if sample is the whole file (a multi-byte character
+            cut off at the end of the sample is then an error)
+    
+    Returns:
+        (binary, encoding), encoding being None for binary files.
+    """
+    for bom, encoding in _BOMS:
+        if sample.startswith(bom):
+            return False, encoding
+    if b"\0" in sample:
+        return True, None
+    control = len(sample) - len(sample.translate(None, _CONTROL_BYTES))
+    if control > len(sample) // 10:
+        return True, None
+    try:
+        sample.decode("utf-8")
+        return False, "utf-8"
+    except UnicodeDecodeError as e:
+        if not complete and e.reason == "unexpected end of data" and e.start >= len(sample) - 3:
+            return False, "utf-8"
+    return False, "latin-1"
+
+
+class LineIndex(NamedTuple):
+    """Byte offset of every LINE_INDEX_STRIDE-th line of one file version."""
+    stamp: FileStamp
+    offsets: List[int]
+    total_lines: int
+
+
+def _pread(fd: int, length: int, offset: int) -> bytes:
+    """Up to length bytes at offset; fewer only at the end of the file."""
+    parts = []
+    while length > 0:
+        data = os.pread(fd, length, offset)
+        if not data:
+            break
+        parts.append(data)
+        length -= len(data)
+        offset += len(data)
+    return b"".join(parts)
+
+
+class _Window:
+    """Forward reads of an open file, READ_CHUNK bytes per os.pread()."""
+    
+    def __init__(self, fd: int, size: int):
+        self.fd = fd
+        # Lowered if the file turns out shorter (truncated after fstat())
+        self.size = size
+        self._start = 0
+        self._buffer = b""
+    
+    def line_end(self, pos: int) -> int:
+        """Offset of the first b"\\n" at or after pos, or the end of the file."""
+        while pos < self.size:
+            if not self._start <= pos < self._start + len(self._buffer):
+                self._start, self._buffer = pos, _pread(self.fd, READ_CHUNK, pos)
+                if not self._buffer:
+                    self.size = pos
+                    break
+            found = self._buffer.find(b"\n", pos - self._start)
+            if found >= 0:
+                return self._start + found
+            pos = self._start + len(self._buffer)
+        return self.size
+    
+    def read(self, start: int, stop: int) -> bytes:
+        """Bytes [start, stop), from the buffer if it holds them."""
+        if self._start <= start and stop <= self._start + len(self._buffer):
+            return self._buffer[start - self._start:stop - self._start]
+        return _pread(self.fd, stop - start, start)
+
+
+def _build_line_index(fd: int, size: int, stamp: FileStamp) -> LineIndex:
+    offsets = [0]
+    newlines = 0
+    next_mark = LINE_INDEX_STRIDE
+    read, last = 0, b""
+    for start in range(0, size, LINE_INDEX_CHUNK):
+        chunk = _pread(fd, min(LINE_INDEX_CHUNK, size - start), start)
+        if not chunk:
+            break
+        read, last = start + len(chunk), chunk[-1:]
+        count = chunk.count(b"\n")
+        if newlines + count >= next_mark:
+            # Offset after the i-th newline of the chunk is the summed
+            # length of the first i + 1 pieces plus i + 1 newlines
+            ends = list(accumulate(map(len, chunk.split(b"\n"))))
+            while newlines + count >= next_mark:
+                i = next_mark - newlines - 1
+                offsets.append(start + ends[i] + i + 1)
+                next_mark += LINE_INDEX_STRIDE
+        newlines += count
+    # A last line without trailing newline still counts
+    total = newlines + (1 if read and last != b"\n" else 0)
+    return LineIndex(stamp, offsets, total)
+
+
+class LineIndexCache:
+    """Line indexes of recently viewed files, keyed by path and checked against the file stamp."""
+    
+    def __init__(self, max_entries: int = LINE_INDEX_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Path, LineIndex]" = OrderedDict()
+        self._lock = Lock()
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+    
+    def get(self, path: Path, fd: int, size: int, stamp: FileStamp) -> LineIndex:
+        with self._lock:
+            index = self._entries.get(path)
+            if index is not None and index.stamp == stamp:
+                self._entries.move_to_end(path)
+                return index
+        with span("line_index"):
+            index = _build_line_index(fd, size, stamp)
+        with self._lock:
+            self._entries[path] = index
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return index
+
+
+line_index_cache = LineIndexCache()
+
+
+def _open(path: Path):
+    """Open path for reading; returns (fd, stat result). Rejects anything but regular files."""
+    # Non-blocking, so opening a FIFO returns (and is then rejected)
+    # instead of waiting for a writer; regular files ignore the flag
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_NONBLOCK", 0))
+    st = os.fstat(fd)
+    if not stat.S_ISREG(st.st_mode):
+        os.close(fd)
+        raise IsADirectoryError(str(path))
+    return fd, st
+
+
+def sniff_file(path: Path) -> Tuple[os.stat_result, bool, Optional[str]]:
+    """
+    Stat a file and detect_encoding() its first SNIFF_SIZE bytes.
+    
+    Returns:
+        (stat result, binary, encoding)
+    
+    Raises:
+        FileNotFoundError, IsADirectoryError: If path is not a readable file
+    """
+    fd, st = _open(path)
+    try:
+        sample = os.read(fd, SNIFF_SIZE)
+    finally:
+        os.close(fd)
+    binary, encoding = detect_encoding(sample, complete=st.st_size <= SNIFF_SIZE)
+    return st, binary, encoding
+
+
+def read_range(path: Path, start: int = 0, length: Optional[int] = None) -> bytes:
+    """
+    Bytes [start, start + length) of a file, read with os.pread().
+    
+    The range is clamped to the file size; only the requested bytes are read.
+    
+    Raises:
+        ValueError: If start or length is negative
+        FileNotFoundError, IsADirectoryError: If path is not a readable file
+    """
+    if start < 0 or (length is not None and length < 0):
+        raise ValueError("start and length must not be negative")
+    fd, st = _open(path)
+    try:
+        end = st.st_size if length is None else min(st.st_size, start + length)
+        if start >= end:
+            return b""
+        data = _pread(fd, end - start, start)
+    finally:
+        os.close(fd)
+    FILES_READ.inc()
+    BYTES_READ.inc(len(data))
+    return data
+
+
+def read_lines(path: Path, start_line: int = 1, line_count: int = 200, rel_path: str = "") -> FileContent:
+    """
+    A window of lines from a text file, plus what was detected about it.
+    
+    Args:
+        path: File to read
+        start_line: First line to return (1-based)
+        line_count: Maximum number of lines to return
+        rel_path: Path reported in the result
+    
+    Returns:
+        FileContent; for binary files (and encodings where b"\\n" is not
+        a line break, i.e. UTF-16/32) lines is empty and total_lines None.
+        Lines longer than MAX_LINE_BYTES are cut off and listed in
+        truncated_lines.
+    
+    Raises:
+        ValueError: If start_line or line_count is below 1
+        FileNotFoundError, IsADirectoryError: If path is not a readable file
+    """
+    if start_line < 1 or line_count < 1:
+        raise ValueError("start_line and line_count must be at least 1")
+    fd, st = _open(path)
+    try:
+        size = st.st_size
+        content = FileContent(path=rel_path, size=size, mtime=st.st_mtime, binary=False, start_line=start_line)
+        if size == 0:
+            content.encoding = "utf-8"
+            content.total_lines = 0
+            return content
+        
+        sample = _pread(fd, min(SNIFF_SIZE, size), 0)
+        content.binary, content.encoding = detect_encoding(sample, complete=size <= SNIFF_SIZE)
+        if content.binary or content.encoding not in LINE_ENCODINGS:
+            return content
+        
+        index = line_index_cache.get(path, fd, size, (st.st_mtime_ns, size, st.st_ino))
+        content.total_lines = index.total_lines
+        first = start_line - 1
+        if first >= index.total_lines:
+            return content
+        
+        # Jump to the nearest indexed line, then walk the rest
+        window = _Window(fd, size)
+        pos = index.offsets[first // LINE_INDEX_STRIDE]
+        for _ in range(first % LINE_INDEX_STRIDE):
+            pos = window.line_end(pos) + 1
+        
+        lines, read = [], 0
+        while len(lines) < line_count and pos < window.size:
+            end = window.line_end(pos)
+            if pos >= window.size:
+                break
+            stop = end
+            if end - pos > MAX_LINE_BYTES:
+                stop = pos + MAX_LINE_BYTES
+                content.truncated_lines.append(start_line + len(lines))
+            raw = window.read(pos, stop)
+            read += len(raw)
+            lines.append(raw.decode(content.encoding, errors="replace").removesuffix("\r"))
+            pos = end + 1
+        content.lines = lines
+    finally:
+        os.close(fd)
+    FILES_READ.inc()
+    BYTES_READ.inc(read)
+    return content
@@ -1,9 +1,9 @@
 """
 File operation models for ContextKeep.
 """
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from pathlib import Path
-from typing import List
+from typing import List, Literal, Optional
 
 
 class DirectoryListing(BaseModel):
@@ -14,4 +14,38 @@ class DirectoryListing(BaseModel):
 class FileReadResult(BaseModel):
     """Result of reading a file"""
     content: dict
-    path: Path
\ No newline at end of file
+    path: Path
+
+
+class TreeEntry(BaseModel):
+    """A file, directory or symlink in a project's file tree"""
+    name: str
+    path: str = Field(..., description="Path relative to the project directory, '/'-separated")
+    type: Literal["file", "dir", "symlink"]
+    size: Optional[int] = Field(default=None, description="Size in bytes (null for directories)")
+    mtime: float = Field(..., description="Modification time, seconds since the epoch")
+    ignored: bool = Field(default=False, description="Excluded by .gitignore")
+
+
+class TreePage(BaseModel):
+    """
+    API response for GET /api/files/tree: one page of a directory
+    """
+    path: str = Field(..., description="Listed directory relative to the project, '' for the root")
+    entries: List[TreeEntry] = Field(default_factory=list)
+    next_cursor: Optional[str] = Field(default=None, description="Cursor for the next page, null on the last page")
+
+
+class FileContent(BaseModel):
+    """
+    API response for GET /api/files/content: a window of lines of a file
+    """
+    path: str = Field(..., description="Path relative to the project, '/'-separated")
+    size: int
+    mtime: float
+    binary: bool = Field(..., description="Detected as binary; no lines are returned")
+    encoding: Optional[str] = Field(default=None, description="Detected text encoding")
+    total_lines: Optional[int] = Field(default=None, description="Number of lines (null if not line-addressable)")
+    start_line: int = Field(..., description="Line number (1-based) of the first returned line")
+    lines: List[str] = Field(default_factory=list, description="Lines without their line terminators")
+    truncated_lines: List[int] = Field(default_factory=list, description="Line numbers cut off at MAX_LINE_BYTES")
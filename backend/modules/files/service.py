@@ -2,11 +2,79 @@
 Low-level file system operations.
 
 This module provides basic file I/O functionality used by other modules.
-All functions are synchronous for simplicity in MVP.
+Writes are atomic (temp file + fsync + rename), so readers only ever see
+the old or the new content of a file. Functions are synchronous; the
+*_async variants run them on a dedicated I/O executor so async callers
+never block the event loop (and don't tie up Starlette's shared
+threadpool).
+
+JSON is decoded with orjson or msgspec when installed (see
+settings.json_backend), falling back to the standard library.
 """
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import List
+from threading import Lock
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple, Type, TypeVar, Union, overload
+import asyncio
+import contextvars
 import json
+import os
+from pydantic import BaseModel
+from modules.metrics.service import registry, span
+from config import settings
+
+T = TypeVar("T")
+M = TypeVar("M", bound=BaseModel)
+
+# (mtime_ns, size, inode) - changes whenever a file is rewritten or replaced
+FileStamp = Tuple[int, int, int]
+
+DIRECTORIES_SCANNED = registry.counter("contextkeep_directories_scanned_total", "Directories yielded by directory listings")
+FILES_READ = registry.counter("contextkeep_files_read_total", "Files read")
+BYTES_READ = registry.counter("contextkeep_bytes_read_total", "Bytes read from files")
+FILES_WRITTEN = registry.counter("contextkeep_files_written_total", "Files written atomically")
+BYTES_WRITTEN = registry.counter("contextkeep_bytes_written_total", "Bytes written to files")
+
+
+def iter_directories(base_path: Path, require_file: Optional[str] = None) -> Iterator[Path]:
+    """
+    Stream the immediate subdirectories of a base path (non-recursive).
+    
+    Uses os.scandir, so the entry type comes from the directory listing
+    itself (d_type) and no per-entry stat is needed except for symlinks
+    and filesystems that don't report a type.
+    
+    Args:
+        base_path: Directory to scan
+        require_file: Optional relative path (e.g. ".contextkeep/project.json");
+            when given, only directories containing that file are yielded
+    
+    Yields:
+        Path objects for subdirectories, in directory order.
+        Yields nothing if base_path doesn't exist or is not a directory.
+    """
+    try:
+        entries = os.scandir(base_path)
+    except (FileNotFoundError, NotADirectoryError):
+        return
+    
+    yielded = 0
+    try:
+        with entries:
+            for entry in entries:
+                try:
+                    if not entry.is_dir():
+                        continue
+                except OSError:
+                    continue
+                if require_file is not None and not os.path.isfile(os.path.join(entry.path, require_file)):
+                    continue
+                yielded += 1
+                yield Path(entry.path)
+    finally:
+        # Counted once per listing to keep the per-entry loop lean
+        DIRECTORIES_SCANNED.inc(yielded)
 
 
 def list_directories(base_path: Path) -> List[Path]:
@@ -15,30 +83,359 @@ def list_directories(base_path: Path) -> List[Path]:
     
     Args:
         base_path: Directory to scan
-        
+    
     Returns:
         List of Path objects for immediate subdirectories only.
         Returns empty list if base_path doesn't exist or is not a directory.
     """
-    if not base_path.exists() or not base_path.is_dir():
-        return []
+    with span("list_dirs"):
+        return list(iter_directories(base_path))
+
+
+def _stdlib_loads(data: bytes) -> Any:
+    return json.loads(data)
+
+
+def _orjson_loads() -> Callable[[bytes], Any]:
+    import orjson
+    # orjson.JSONDecodeError already subclasses json.JSONDecodeError
+    return orjson.loads
+
+
+def _msgspec_loads() -> Callable[[bytes], Any]:
+    import msgspec
+    decode = msgspec.json.decode
+    
+    def loads(data: bytes) -> Any:
+        try:
+            return decode(data)
+        except msgspec.DecodeError as e:
+            raise json.JSONDecodeError(str(e), data.decode("utf-8", "replace"), 0) from None
+    return loads
+
+
+JSON_BACKENDS = {
+    "orjson": _orjson_loads,
+    "msgspec": _msgspec_loads,
+    "json": lambda: _stdlib_loads,
+}
+
+_json_backend: Optional[Tuple[str, Callable[[bytes], Any]]] = None
+
+
+def json_backend(name: Optional[str] = None) -> Tuple[str, Callable[[bytes], Any]]:
+    """
+    Select (or return the selected) JSON decoder.
+    
+    Args:
+        name: "orjson", "msgspec", "json" or "auto" (the first one that
+            imports, in that order). None keeps the current choice, or
+            uses settings.json_backend on first call.
+    
+    Returns:
+        (backend name, loads function taking bytes)
+    
+    Raises:
+        ImportError: If the named backend is not installed
+        ValueError: If name is not a known backend
+    """
+    global _json_backend
+    if name is None:
+        if _json_backend is not None:
+            return _json_backend
+        name = settings.json_backend
     
-    return [item for item in base_path.iterdir() if item.is_dir()]
+    if name == "auto":
+        for candidate in JSON_BACKENDS:
+            try:
+                return json_backend(candidate)
+            except ImportError:
+                continue
+    if name not in JSON_BACKENDS:
+        raise ValueError(f"Unknown JSON backend: {name}")
+    _json_backend = (name, JSON_BACKENDS[name]())
+    return _json_backend
 
 
-def read_json_file(file_path: Path) -> dict:
+def read_file_bytes(file_path: Path) -> bytes:
+    """
+    Read a whole file as bytes.
+    
+    Raises:
+        FileNotFoundError: If file doesn't exist
+    """
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    FILES_READ.inc()
+    BYTES_READ.inc(len(data))
+    return data
+
+
+@overload
+def read_json_file(file_path: Path) -> dict: ...
+@overload
+def read_json_file(file_path: Path, model: Type[M]) -> M: ...
+
+
+def read_json_file(file_path: Path, model: Optional[Type[M]] = None) -> Union[dict, M]:
     """
     Read and parse a JSON file.
     
     Args:
         file_path: Path to JSON file
-        
+        model: Optional Pydantic model; when given, the raw bytes are
+            validated straight into it (model_validate_json) without
+            building an intermediate dict
+    
     Returns:
-        Parsed JSON as dict
-        
+        Parsed JSON as dict, or a model instance
+    
     Raises:
         FileNotFoundError: If file doesn't exist
         JSONDecodeError: If file contains invalid JSON
+        pydantic.ValidationError: If model is given and the content is not
+            valid JSON or does not match the model
+    """
+    data = read_file_bytes(file_path)
+    if model is not None:
+        return model.model_validate_json(data)
+    return json_backend()[1](data)
+
+
+def file_stamp(file_path: Path) -> Optional[FileStamp]:
     """
-    with open(file_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
\ No newline at end of file
+    Get a cheap change-detection stamp for a file.
+    
+    Args:
+        file_path: Path to file
+    
+    Returns:
+        (mtime_ns, size, inode) tuple, or None if the file can't be stat'ed.
+    """
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _fsync_directory(directory: Path) -> None:
+    """Persist a directory's entries (new names, renames) to disk."""
+    try:
+        fd = os.open(directory, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+    except OSError:
+        # Not supported on this platform (e.g. Windows); rename is still atomic
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _make_directories(directory: Path, created: Set[Path]) -> None:
+    """mkdir -p that records every directory it had to create."""
+    missing = []
+    while not directory.exists():
+        missing.append(directory)
+        directory = directory.parent
+    for path in reversed(missing):
+        try:
+            path.mkdir()
+        except FileExistsError:
+            continue
+        created.add(path)
+
+
+def _encode(content: Union[bytes, str, dict, BaseModel]) -> bytes:
+    if isinstance(content, bytes):
+        return content
+    if isinstance(content, str):
+        return content.encode("utf-8")
+    if isinstance(content, BaseModel):
+        return content.model_dump_json(indent=2).encode("utf-8") + b"\n"
+    return json.dumps(content, indent=2, ensure_ascii=False).encode("utf-8") + b"\n"
+
+
+class WriteBatch:
+    """
+    Stage several file writes and make them visible together.
+    
+    Each write() goes to a temp file next to its target (fsynced when
+    durable); commit() renames them all into place and then fsyncs each
+    affected directory once, however many files it received. Until
+    commit() nothing is visible, and abort() (or an exception inside a
+    with block) removes the temp files again. Every individual file is
+    replaced atomically; the renames themselves are not one atomic step.
+    If a rename fails, the files renamed before it stay in place and the
+    temp files of the rest are removed.
+    
+    Args:
+        durable: fsync files and directories (turn off for scratch data)
+    
+    Example:
+        with WriteBatch() as batch:
+            batch.write(path_a, {"key": "value"})
+            batch.write(path_b, model)
+        stamps = batch.stamps
+    """
+    
+    def __init__(self, durable: bool = True):
+        self.durable = durable
+        # target -> (temp path, stamp, size)
+        self._staged: Dict[Path, Tuple[Path, FileStamp, int]] = {}
+        self._created_dirs: Set[Path] = set()
+        self.stamps: Dict[Path, FileStamp] = {}
+    
+    def __enter__(self) -> "WriteBatch":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+    
+    def write(self, file_path: Path, content: Union[bytes, str, dict, BaseModel]) -> None:
+        """
+        Stage new content for file_path.
+        
+        Args:
+            file_path: Target file; missing parent directories are created
+            content: Raw bytes, text (UTF-8), a dict (written as JSON) or a
+                Pydantic model (written as its JSON)
+        """
+        file_path = Path(file_path)
+        data = _encode(content)
+        _make_directories(file_path.parent, self._created_dirs)
+        
+        tmp = file_path.with_name(f".{file_path.name}.{os.urandom(4).hex()}.tmp")
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+        try:
+            try:
+                # Keep the permissions of the file being replaced
+                os.chmod(tmp, os.stat(file_path).st_mode & 0o7777)
+            except FileNotFoundError:
+                pass
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+            if self.durable:
+                os.fsync(fd)
+            st = os.fstat(fd)
+        except BaseException:
+            os.close(fd)
+            os.unlink(tmp)
+            raise
+        os.close(fd)
+        
+        previous = self._staged.get(file_path)
+        if previous is not None:
+            os.unlink(previous[0])
+        # The inode and mtime carry over through the rename
+        self._staged[file_path] = (tmp, (st.st_mtime_ns, st.st_size, st.st_ino), len(data))
+    
+    def commit(self) -> Dict[Path, FileStamp]:
+        """
+        Move every staged file into place.
+        
+        Returns:
+            {file_path: stamp} of the written files (also kept in .stamps)
+        """
+        with span("write_batch"):
+            directories = set()
+            try:
+                for file_path in list(self._staged):
+                    tmp, stamp, size = self._staged[file_path]
+                    os.replace(tmp, file_path)
+                    del self._staged[file_path]
+                    directories.add(file_path.parent)
+                    self.stamps[file_path] = stamp
+                    FILES_WRITTEN.inc()
+                    BYTES_WRITTEN.inc(size)
+            except BaseException:
+                # Only the files not renamed yet are still staged
+                self.abort()
+                raise
+            # New directories must be made durable in their parents too
+            directories.update(d.parent for d in self._created_dirs)
+            if self.durable:
+                for directory in directories:
+                    _fsync_directory(directory)
+            self._staged = {}
+            self._created_dirs = set()
+            return self.stamps
+    
+    def abort(self) -> None:
+        """Discard every staged write (created directories are left in place)."""
+        for tmp, _, _ in self._staged.values():
+            try:
+                os.unlink(tmp)
+            except FileNotFoundError:
+                pass
+        self._staged = {}
+
+
+def write_file_atomic(file_path: Path, content: Union[bytes, str, dict, BaseModel], durable: bool = True) -> FileStamp:
+    """
+    Atomically replace (or create) a file.
+    
+    Args:
+        file_path: Target file; missing parent directories are created
+        content: Raw bytes, text (UTF-8), a dict (written as JSON) or a
+            Pydantic model (written as its JSON)
+        durable: fsync the file and its directory before returning
+    
+    Returns:
+        Stamp of the written file.
+    """
+    with WriteBatch(durable=durable) as batch:
+        batch.write(file_path, content)
+    return batch.stamps[Path(file_path)]
+
+
+_io_executor: Optional[ThreadPoolExecutor] = None
+_io_executor_lock = Lock()
+
+
+def io_executor() -> ThreadPoolExecutor:
+    """Dedicated executor for blocking file I/O, sized by settings.io_workers."""
+    global _io_executor
+    with _io_executor_lock:
+        if _io_executor is None:
+            _io_executor = ThreadPoolExecutor(
+                max_workers=settings.io_workers, thread_name_prefix="file-io"
+            )
+        return _io_executor
+
+
+async def run_io(func: Callable[..., T], *args: Any) -> T:
+    """
+    Run a blocking function on the I/O executor and await its result.
+    
+    Args:
+        func: Blocking callable
+        *args: Positional arguments for func
+    
+    Returns:
+        Whatever func returns; exceptions propagate unchanged.
+    """
+    loop = asyncio.get_running_loop()
+    # Run inside a copy of the caller's context so request-scoped state
+    # (e.g. metrics spans) follows the call onto the executor thread
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(io_executor(), partial(context.run, func, *args))
+
+
+async def list_directories_async(base_path: Path) -> List[Path]:
+    """Async variant of list_directories()."""
+    return await run_io(list_directories, base_path)
+
+
+async def read_json_file_async(file_path: Path) -> dict:
+    """Async variant of read_json_file()."""
+    return await run_io(read_json_file, file_path)
+
+
+async def write_file_atomic_async(file_path: Path, content: Union[bytes, str, dict, BaseModel], durable: bool = True) -> FileStamp:
+    """Async variant of write_file_atomic()."""
+    return await run_io(write_file_atomic, file_path, content, durable)
\ No newline at end of file
@@ -0,0 +1,381 @@
+"""
+Lazy directory tree listings for the Files tab.
+
+A tree is expanded one directory at a time: list_tree_page() lists a
+single directory of a project with one scandir pass (type, size and
+mtime per entry), marks entries excluded by .gitignore and returns one
+page of them. Listings are cached per directory and reused until the
+directory's mtime (or a .gitignore that applies to it) changes.
+
+Only the directory itself changes mtime when entries are added, removed
+or renamed; a file rewritten in place keeps its directory's mtime, so
+its size/mtime in a cached listing can lag until the next change there.
+"""
+from bisect import bisect_right
+from collections import OrderedDict
+from pathlib import Path, PurePosixPath
+from threading import Lock
+from typing import Dict, List, NamedTuple, Optional, Tuple
+import base64
+import os
+import re
+import stat
+from modules.files.models import TreeEntry, TreePage
+from modules.files.service import FileStamp, file_stamp, read_file_bytes
+from modules.metrics.service import registry, span
+from config import settings
+
+GITIGNORE_FILE = ".gitignore"
+# Repository-local excludes, read for the tree root only
+GIT_EXCLUDE_FILE = Path(".git") / "info" / "exclude"
+# Never shown unless ignored entries are requested (git hides it too)
+ALWAYS_IGNORED = frozenset({".git"})
+
+TREE_CACHE_HITS = registry.counter("contextkeep_tree_cache_hits_total", "Directory listings served from cache")
+TREE_CACHE_MISSES = registry.counter("contextkeep_tree_cache_misses_total", "Directory listings read from disk")
+
+
+class IgnoreRule(NamedTuple):
+    """One .gitignore pattern, relative to the directory of its file."""
+    base: str
+    regex: "re.Pattern"
+    anchored: bool
+    negate: bool
+    dir_only: bool
+
+
+def _glob_to_regex(pattern: str) -> str:
+    """Translate a gitignore glob into a regex over '/'-separated paths."""
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "*":
+            if pattern.startswith("**", i):
+                i += 2
+                if pattern.startswith("/", i):
+                    # "**/" matches zero or more directories
+                    out.append("(?:.*/)?")
+                    i += 1
+                else:
+                    out.append(".*")
+                continue
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            # A leading ! negates; a ] right after [ or [! is literal
+            j = i + 1
+            if j < n and pattern[j] == "!":
+                j += 1
+            if j < n and pattern[j] == "]":
+                j += 1
+            end = pattern.find("]", j)
+            if end < 0:
+                out.append(re.escape(c))
+            else:
+                body = pattern[i + 1:end]
+                negated = body.startswith("!")
+                if negated:
+                    body = body[1:]
+                body = body.replace("\\", "\\\\").replace("[", "\\[").replace("]", "\\]").replace("^", "\\^")
+                out.append("[" + ("^" if negated else "") + body + "]")
+                i = end
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+def parse_gitignore(text: str, base: str = "") -> List[IgnoreRule]:
+    """
+    Rules of one .gitignore file.
+    
+    Supports comments, negation (!), directory-only patterns (trailing /),
+    anchoring (a leading or inner /), *, ?, [...] and ** as in gitignore(5).
+    
+    Args:
+        text: File contents
+        base: Directory of the file, relative to the tree root ("" for the root)
+    """
+    rules = []
+    for line in text.splitlines():
+        if not line.strip() or line.startswith("#"):
+            continue
+        if not line.endswith("\\ "):
+            line = line.rstrip()
+        negate = line.startswith("!")
+        if negate:
+            line = line[1:]
+        elif line.startswith("\\!") or line.startswith("\\#"):
+            line = line[1:]
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        if not line:
+            continue
+        anchored = "/" in line
+        line = line.lstrip("/")
+        rules.append(IgnoreRule(base, re.compile(_glob_to_regex(line)), anchored, negate, dir_only))
+    return rules
+
+
+def is_ignored(rules: List[IgnoreRule], rel_path: str, is_dir: bool) -> bool:
+    """
+    Whether rel_path (relative to the tree root) is excluded by rules.
+    
+    Rules are in precedence order (root first, deeper files later); the
+    last matching rule decides, as in git.
+    """
+    name = rel_path.rpartition("/")[2]
+    if name in ALWAYS_IGNORED:
+        return True
+    for rule in reversed(rules):
+        if rule.dir_only and not is_dir:
+            continue
+        if rule.base:
+            if not rel_path.startswith(rule.base + "/"):
+                continue
+            local = rel_path[len(rule.base) + 1:]
+        else:
+            local = rel_path
+        if rule.regex.fullmatch(local if rule.anchored else name):
+            return not rule.negate
+    return False
+
+
+class TreeListing(NamedTuple):
+    """Every entry of one directory in display order, with aligned sort keys."""
+    keys: List[Tuple]
+    entries: List[TreeEntry]
+    ignored: bool
+
+
+def _entry_key(entry_type: str, name: str) -> Tuple:
+    # Directories first, then case-insensitive by name
+    return (entry_type != "dir", name.lower(), name)
+
+
+def _encode_cursor(key: Tuple) -> str:
+    raw = "\0".join([str(int(key[0])), key[1], key[2]]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Tuple:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        is_file, lower, name = raw.split("\0")
+        return (bool(int(is_file)), lower, name)
+    except ValueError:
+        raise ValueError("Invalid cursor")
+
+
+class TreeCache:
+    """
+    Per-directory listing cache with mtime invalidation, bounded LRU.
+    
+    A listing is valid while the directory's stamp and the stamps of every
+    .gitignore file that applies to it are unchanged. Parsed .gitignore
+    files are cached by stamp as well. Thread-safe.
+    
+    Args:
+        max_entries: Directory listings kept
+    """
+    
+    def __init__(self, max_entries: int = 2000):
+        self.max_entries = max_entries
+        # abs dir -> (validity key, listing)
+        self._listings: "OrderedDict[Path, Tuple[tuple, TreeListing]]" = OrderedDict()
+        # abs ignore file -> (stamp, rules)
+        self._rules: Dict[Path, Tuple[FileStamp, List[IgnoreRule]]] = {}
+        self._lock = Lock()
+    
+    def __len__(self) -> int:
+        return len(self._listings)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._listings.clear()
+            self._rules.clear()
+    
+    def _ignore_file(self, path: Path, base: str) -> Tuple[Optional[FileStamp], List[IgnoreRule]]:
+        stamp = file_stamp(path)
+        if stamp is None:
+            return None, []
+        with self._lock:
+            cached = self._rules.get(path)
+        if cached is not None and cached[0] == stamp:
+            return stamp, cached[1]
+        try:
+            rules = parse_gitignore(read_file_bytes(path).decode("utf-8", errors="replace"), base)
+        except OSError:
+            return None, []
+        with self._lock:
+            self._rules[path] = (stamp, rules)
+            if len(self._rules) > self.max_entries:
+                self._rules.pop(next(iter(self._rules)))
+        return stamp, rules
+    
+    def _rules_for(self, root: Path, rel_dir: str) -> Tuple[tuple, List[IgnoreRule], bool]:
+        """Stamps of the applicable ignore files, their rules, and whether rel_dir itself is ignored."""
+        stamp, rules = self._ignore_file(root / GIT_EXCLUDE_FILE, "")
+        stamps = [stamp]
+        dir_ignored = False
+        parts = rel_dir.split("/") if rel_dir else []
+        for depth in range(len(parts) + 1):
+            base = "/".join(parts[:depth])
+            if depth and not dir_ignored:
+                dir_ignored = is_ignored(rules, base, True)
+            stamp, file_rules = self._ignore_file(root / base / GITIGNORE_FILE, base)
+            stamps.append(stamp)
+            rules = rules + file_rules
+        return tuple(stamps), rules, dir_ignored
+    
+    def listing(self, root: Path, rel_dir: str) -> TreeListing:
+        """
+        All entries of root/rel_dir, from cache when still valid.
+        
+        Raises:
+            FileNotFoundError: If the directory does not exist
+            NotADirectoryError: If the path is not a directory
+        """
+        directory = root / rel_dir if rel_dir else root
+        st = os.stat(directory)
+        if not stat.S_ISDIR(st.st_mode):
+            raise NotADirectoryError(str(directory))
+        ignore_stamps, rules, dir_ignored = self._rules_for(root, rel_dir)
+        key = ((st.st_mtime_ns, st.st_ino), ignore_stamps)
+        
+        with self._lock:
+            cached = self._listings.get(directory)
+            if cached is not None and cached[0] == key:
+                self._listings.move_to_end(directory)
+                TREE_CACHE_HITS.inc()
+                return cached[1]
+        TREE_CACHE_MISSES.inc()
+        
+        with span("tree_scan"):
+            listing = _scan_directory(directory, rel_dir, rules, dir_ignored)
+        if self.max_entries > 0:
+            with self._lock:
+                self._listings[directory] = (key, listing)
+                self._listings.move_to_end(directory)
+                while len(self._listings) > self.max_entries:
+                    self._listings.popitem(last=False)
+        return listing
+
+
+def _scan_directory(directory: Path, rel_dir: str, rules: List[IgnoreRule], dir_ignored: bool) -> TreeListing:
+    rows = []
+    with os.scandir(directory) as it:
+        for entry in it:
+            try:
+                st = entry.stat(follow_symlinks=False)
+            except FileNotFoundError:
+                # Removed between readdir and stat
+                continue
+            if stat.S_ISDIR(st.st_mode):
+                entry_type = "dir"
+            elif stat.S_ISLNK(st.st_mode):
+                entry_type = "symlink"
+            else:
+                entry_type = "file"
+            rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            ignored = dir_ignored or is_ignored(rules, rel_path, entry_type == "dir")
+            rows.append((_entry_key(entry_type, entry.name), TreeEntry(
+                name=entry.name,
+                path=rel_path,
+                type=entry_type,
+                size=st.st_size if entry_type != "dir" else None,
+                mtime=st.st_mtime,
+                ignored=ignored,
+            )))
+    rows.sort(key=lambda row: row[0])
+    return TreeListing([k for k, _ in rows], [e for _, e in rows], dir_ignored)
+
+
+def normalize_tree_path(path: Optional[str]) -> str:
+    """
+    Clean a client-supplied directory path relative to the tree root.
+    
+    Raises:
+        ValueError: If the path is absolute or leaves the root
+    """
+    if not path:
+        return ""
+    pure = PurePosixPath(path)
+    if pure.is_absolute() or ".." in pure.parts:
+        raise ValueError("path must be relative to the project and must not contain '..'")
+    return "/".join(part for part in pure.parts if part != ".")
+
+
+def resolve_tree_path(root: Path, path: Optional[str]) -> str:
+    """
+    normalize_tree_path(), also rejecting paths that leave root via symlinks.
+    
+    Raises:
+        ValueError: If the path is absolute, contains '..' or resolves
+            outside root
+    """
+    rel_path = normalize_tree_path(path)
+    if rel_path:
+        real_root = os.path.realpath(root)
+        real_path = os.path.realpath(root / rel_path)
+        if os.path.commonpath([real_root, real_path]) != real_root:
+            raise ValueError("path resolves outside the project")
+    return rel_path
+
+
+def list_tree_page(
+    root: Path,
+    path: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = 200,
+    show_ignored: bool = False,
+    cache: Optional[TreeCache] = None,
+) -> TreePage:
+    """
+    One page of the entries of a directory under root.
+    
+    Args:
+        root: Tree root (the project directory)
+        path: Directory relative to root ("" or None for the root)
+        cursor: next_cursor from the previous page
+        limit: Page size
+        show_ignored: Include entries excluded by .gitignore (marked ignored)
+        cache: Listing cache (defaults to the module-wide tree_cache)
+    
+    Returns:
+        TreePage, directories first and then by case-insensitive name.
+    
+    Raises:
+        ValueError: If path or cursor is invalid, limit is below 1, or
+            path resolves (via symlinks) outside root
+        FileNotFoundError, NotADirectoryError: If path is not a directory
+    """
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+    rel_dir = resolve_tree_path(root, path)
+    listing = (cache if cache is not None else tree_cache).listing(root, rel_dir)
+    keys, entries = listing.keys, listing.entries
+    
+    start = 0
+    if cursor:
+        start = bisect_right(keys, _decode_cursor(cursor))
+    
+    # Collect up to limit + 1 visible entries; the extra one only signals a next page
+    page: List[TreeEntry] = []
+    last = start
+    for i in range(start, len(entries)):
+        if show_ignored or not entries[i].ignored:
+            if len(page) == limit:
+                return TreePage(path=rel_dir, entries=page, next_cursor=_encode_cursor(keys[last]))
+            page.append(entries[i])
+            last = i
+    return TreePage(path=rel_dir, entries=page, next_cursor=None)
+
+
+# Module-wide listing cache
+tree_cache = TreeCache(max_entries=settings.tree_cache_size)
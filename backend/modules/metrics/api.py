@@ -0,0 +1,20 @@
+"""
+Metrics API endpoints.
+"""
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from modules.metrics.service import registry
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    """
+    Process metrics in the Prometheus text exposition format.
+    
+    Returns:
+        Request latency histograms per route, span timings and the scan,
+        read and cache counters.
+    """
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,69 @@
+"""
+ASGI middleware that times every HTTP request.
+"""
+import time
+from modules.metrics.service import (
+    registry,
+    request_timings,
+    server_timing_header,
+    start_request_timing,
+    stop_request_timing,
+)
+
+REQUEST_SECONDS = registry.histogram(
+    "contextkeep_http_request_duration_seconds",
+    "HTTP request latency by route handler",
+    ["method", "handler", "status"],
+)
+
+
+class TimingMiddleware:
+    """
+    Records per-route latency and collects span timings per request.
+    
+    Implemented as plain ASGI (not BaseHTTPMiddleware) so streaming
+    responses pass through untouched.
+    
+    Args:
+        app: ASGI application to wrap
+        server_timing: Add a Server-Timing header with the request's spans
+    """
+    
+    def __init__(self, app, server_timing: bool = False):
+        self.app = app
+        self.server_timing = server_timing
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        start = time.perf_counter()
+        status = 500
+        token = start_request_timing()
+        
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.server_timing:
+                    value = server_timing_header(request_timings(), time.perf_counter() - start)
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", value.encode("latin-1")))
+                    message = {**message, "headers": headers}
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            stop_request_timing(token)
+            # The router stores the matched route in the scope. Its name (the
+            # endpoint function) is one series per route whatever the path
+            # parameters or router prefix
+            handler = getattr(scope.get("route"), "name", None) or "unmatched"
+            REQUEST_SECONDS.observe(
+                time.perf_counter() - start,
+                method=scope["method"],
+                handler=handler,
+                status=str(status),
+            )
@@ -0,0 +1,228 @@
+"""
+Process-wide metrics and request timing spans.
+
+Counters and histograms live in a module-level registry and are rendered
+in the Prometheus text exposition format. span() times a block of code,
+records it in a histogram and, while an HTTP request is being handled,
+adds it to that request's Server-Timing breakdown.
+"""
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+import time
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    escaped = (
+        str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        for v in values
+    )
+    return "{" + ",".join(f'{n}="{v}"' for n, v in zip(names, escaped)) + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Counter:
+    """Monotonic counter with optional labels. Thread-safe."""
+    
+    kind = "counter"
+    
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = Lock()
+    
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = tuple(labels[n] for n in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+    
+    def value(self, **labels: str) -> float:
+        return self._values.get(tuple(labels[n] for n in self.labels), 0)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._values = {}
+    
+    def render(self) -> Iterator[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            yield f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+
+
+class Histogram:
+    """Cumulative-bucket histogram with optional labels. Thread-safe."""
+    
+    kind = "histogram"
+    
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> (per-bucket counts with +Inf last, [sum])
+        self._values: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+        self._lock = Lock()
+    
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(labels[n] for n in self.labels)
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = ([0] * (len(self.buckets) + 1), [0.0])
+            entry[0][i] += 1
+            entry[1][0] += value
+    
+    def count(self, **labels: str) -> int:
+        entry = self._values.get(tuple(labels[n] for n in self.labels))
+        return sum(entry[0]) if entry else 0
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._values = {}
+    
+    def render(self) -> Iterator[str]:
+        with self._lock:
+            values = sorted((key, (list(counts), total[0])) for key, (counts, total) in self._values.items())
+        bucket_labels = self.labels + ("le",)
+        for key, (counts, total) in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _format_value(bound)
+                yield f"{self.name}_bucket{_format_labels(bucket_labels, key + (le,))} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labels, key)} {_format_value(total)}"
+            yield f"{self.name}_count{_format_labels(self.labels, key)} {cumulative}"
+
+
+class CallbackMetric:
+    """Unlabelled metric whose value is read from a function at render time."""
+    
+    def __init__(self, name: str, help: str, func: Callable[[], float], kind: str = "gauge"):
+        self.name = name
+        self.help = help
+        self.kind = kind
+        self._func = func
+    
+    def clear(self) -> None:
+        pass
+    
+    def render(self) -> Iterator[str]:
+        yield f"{self.name} {_format_value(self._func())}"
+
+
+class Registry:
+    """Named metrics, rendered together. Registering a name twice returns the existing metric."""
+    
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = Lock()
+    
+    def _register(self, metric):
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+    
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labels))
+    
+    def histogram(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help, labels, buckets))
+    
+    def callback(self, name: str, help: str, func: Callable[[], float], kind: str = "gauge") -> CallbackMetric:
+        return self._register(CallbackMetric(name, help, func, kind))
+    
+    def clear(self) -> None:
+        """Reset every recorded value (metrics stay registered)."""
+        for metric in list(self._metrics.values()):
+            metric.clear()
+    
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        for name in sorted(self._metrics):
+            metric = self._metrics[name]
+            lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+SPAN_SECONDS = registry.histogram(
+    "contextkeep_span_duration_seconds", "Time spent in instrumented code sections", ["span"]
+)
+
+# span name -> [total seconds, count] for the request being handled, if any
+_request_timings: ContextVar[Optional[Dict[str, List[float]]]] = ContextVar("request_timings", default=None)
+
+
+def start_request_timing():
+    """
+    Start collecting spans for the current request (context).
+    
+    Returns:
+        Token for stop_request_timing().
+    """
+    return _request_timings.set({})
+
+
+def request_timings() -> Dict[str, List[float]]:
+    """Spans recorded so far for the current request, {name: [seconds, count]}."""
+    return _request_timings.get() or {}
+
+
+def stop_request_timing(token) -> None:
+    _request_timings.reset(token)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time the enclosed block as the named span."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        SPAN_SECONDS.observe(elapsed, span=name)
+        timings = _request_timings.get()
+        if timings is not None:
+            entry = timings.get(name)
+            if entry is None:
+                timings[name] = [elapsed, 1]
+            else:
+                entry[0] += elapsed
+                entry[1] += 1
+
+
+def server_timing_header(timings: Dict[str, List[float]], total: Optional[float] = None) -> str:
+    """
+    Server-Timing header value for recorded spans.
+    
+    Args:
+        timings: {name: [seconds, count]} as returned by request_timings()
+        total: Optional whole-request time in seconds, reported as "total"
+    """
+    parts = []
+    for name, (seconds, count) in timings.items():
+        part = f"{name};dur={seconds * 1000:.2f}"
+        if count > 1:
+            part += f';desc="{int(count)}x"'
+        parts.append(part)
+    if total is not None:
+        parts.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(parts)
@@ -0,0 +1,48 @@
+"""
+Phases API endpoints.
+"""
+from fastapi import APIRouter, HTTPException
+from modules.files.service import run_io
+from modules.metrics.service import span
+from modules.phases.models import HandlerPhaseUpdate, ProjectServicesResponse, ServiceStatus
+from modules.phases.service import project_services, set_handler_phase
+
+router = APIRouter()
+
+
+@router.get("/projects/{project_id}/services", response_model=ProjectServicesResponse)
+async def get_project_services(project_id: str):
+    """
+    Phase status of every microservice of a project.
+    
+    Statuses are derived incrementally from the handler state files and
+    served from memory; the files are re-checked at most once every
+    CK_PHASE_REFRESH_SECONDS, and only changed files are re-parsed.
+    
+    Returns:
+        ProjectServicesResponse with the services sorted by name.
+    """
+    try:
+        with span("phases"):
+            services = await run_io(project_services, project_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return ProjectServicesResponse(project=project_id, services=services)
+
+
+@router.put("/projects/{project_id}/services/{service}/handlers/{handler}", response_model=ServiceStatus)
+async def put_handler_phase(project_id: str, service: str, handler: str, update: HandlerPhaseUpdate):
+    """
+    Set the phase of one handler.
+    
+    Returns:
+        The service's status after the change.
+    """
+    try:
+        return await run_io(set_handler_phase, project_id, service, handler, update.phase)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Project not found")
@@ -0,0 +1,163 @@
+"""
+Incremental evaluation over a dependency graph.
+
+Source nodes hold values set from outside (parsed state files); derived
+nodes are computed from their inputs. Changing a source recomputes only
+the derived nodes downstream of it, in dependency order, and stops early
+wherever a recomputed value equals the previous one.
+"""
+from itertools import count
+from threading import RLock
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Set, Tuple
+import heapq
+
+_MISSING = object()
+
+
+class DependencyGraph:
+    """
+    Source and derived values with incremental recomputation. Thread-safe.
+    
+    Values are compared with == to decide whether a change propagates, so
+    they should be immutable (tuples, frozen models) and cheap to compare.
+    `recomputations` counts compute calls, for tests and benchmarks.
+    """
+    
+    def __init__(self):
+        self._values: Dict[Hashable, Any] = {}
+        self._inputs: Dict[Hashable, Tuple[Hashable, ...]] = {}
+        self._compute: Dict[Hashable, Callable[..., Any]] = {}
+        self._dependents: Dict[Hashable, Set[Hashable]] = {}
+        # 0 for sources, 1 + the highest input rank for derived nodes;
+        # processing by rank computes every node after all of its inputs
+        self._rank: Dict[Hashable, int] = {}
+        self._seq = count()
+        self.recomputations = 0
+        self._lock = RLock()
+    
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._rank
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Current value of a node (computed eagerly, so this is a dict lookup)."""
+        return self._values.get(key, default)
+    
+    def set(self, key: Hashable, value: Any) -> Set[Hashable]:
+        """
+        Set a source node and recompute what depends on it.
+        
+        Returns:
+            Keys whose value changed (including key itself).
+        
+        Raises:
+            ValueError: If key is a derived node
+        """
+        with self._lock:
+            if key in self._compute:
+                raise ValueError(f"{key!r} is a derived node")
+            if self._values.get(key, _MISSING) == value:
+                return set()
+            self._values[key] = value
+            self._rank.setdefault(key, 0)
+            return {key} | self._propagate(self._dependents.get(key, ()))
+    
+    def define(self, key: Hashable, inputs: Iterable[Hashable], compute: Callable[..., Any]) -> Set[Hashable]:
+        """
+        Create or redefine a derived node as compute(*input values).
+        
+        Inputs that don't exist yet are created as sources with value None.
+        
+        Returns:
+            Keys whose value changed.
+        
+        Raises:
+            ValueError: If the definition would create a cycle
+        """
+        inputs = tuple(inputs)
+        with self._lock:
+            if key in inputs or any(self._reaches(key, k) for k in inputs if k in self._rank):
+                raise ValueError(f"{key!r} would depend on itself")
+            for k in self._inputs.get(key, ()):
+                self._dependents[k].discard(key)
+            for k in inputs:
+                if k not in self._rank:
+                    self._rank[k] = 0
+                    self._values[k] = None
+                self._dependents.setdefault(k, set()).add(key)
+            self._inputs[key] = inputs
+            self._compute[key] = compute
+            self._rerank(key)
+            return self._propagate([key])
+    
+    def discard(self, key: Hashable) -> Set[Hashable]:
+        """
+        Remove a node.
+        
+        A node that other nodes still use as input stays behind as a source
+        with value None, so their computations see None in its place.
+        
+        Returns:
+            Keys whose value changed.
+        """
+        with self._lock:
+            if key not in self._rank:
+                return set()
+            for k in self._inputs.pop(key, ()):
+                self._dependents[k].discard(key)
+            self._compute.pop(key, None)
+            dependents = self._dependents.get(key)
+            if dependents:
+                self._rank[key] = 0
+                if self._values.get(key) is None:
+                    return set()
+                self._values[key] = None
+                return {key} | self._propagate(dependents)
+            del self._rank[key]
+            self._values.pop(key, None)
+            self._dependents.pop(key, None)
+            return {key}
+    
+    def _reaches(self, start: Hashable, target: Hashable) -> bool:
+        """True if target is downstream of (or equal to) start."""
+        stack, seen = [start], set()
+        while stack:
+            node = stack.pop()
+            if node == target:
+                return True
+            if node not in seen:
+                seen.add(node)
+                stack.extend(self._dependents.get(node, ()))
+        return False
+    
+    def _rerank(self, key: Hashable) -> None:
+        stack = [key]
+        while stack:
+            node = stack.pop()
+            rank = 1 + max((self._rank[k] for k in self._inputs[node]), default=-1)
+            if self._rank.get(node) != rank:
+                self._rank[node] = rank
+                stack.extend(self._dependents.get(node, ()))
+    
+    def _propagate(self, keys: Iterable[Hashable]) -> Set[Hashable]:
+        heap: List[Tuple[int, int, Hashable]] = []
+        queued = set()
+        for key in keys:
+            if key in self._compute and key not in queued:
+                queued.add(key)
+                heapq.heappush(heap, (self._rank[key], next(self._seq), key))
+        
+        changed = set()
+        while heap:
+            _, _, key = heapq.heappop(heap)
+            queued.discard(key)
+            value = self._compute[key](*(self._values.get(k) for k in self._inputs[key]))
+            self.recomputations += 1
+            if self._values.get(key, _MISSING) == value:
+                continue
+            self._values[key] = value
+            changed.add(key)
+            for d in self._dependents.get(key, ()):
+                if d not in queued:
+                    queued.add(d)
+                    heapq.heappush(heap, (self._rank[d], next(self._seq), d))
+        return changed
@@ -0,0 +1,58 @@
+"""
+Data models for microservice phase states.
+"""
+from datetime import datetime
+from enum import Enum
+from typing import Dict, List, Optional
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class Phase(str, Enum):
+    """
+    Phases of a handler, in the order they are passed through
+    """
+    SPEC_ADDABLE = "SPEC_ADDABLE"
+    SPEC_DRAFTED = "SPEC_DRAFTED"
+    SPEC_ACCEPTED = "SPEC_ACCEPTED"
+    IMPLEMENTING = "IMPLEMENTING"
+    IMPLEMENTED = "IMPLEMENTED"
+    VERIFIED = "VERIFIED"
+
+
+# Phase -> position in the lifecycle
+PHASE_ORDER: Dict[Phase, int] = {phase: i for i, phase in enumerate(Phase)}
+
+
+class HandlerState(BaseModel):
+    """
+    Handler state stored in .contextkeep/services/<service>/handlers/<handler>.json
+    """
+    phase: Phase
+    updated_at: Optional[datetime] = None
+
+
+class ServiceStatus(BaseModel):
+    """
+    Derived phase status of one microservice
+    """
+    model_config = ConfigDict(frozen=True)
+    
+    name: str
+    phase: Optional[Phase] = Field(default=None, description="Least advanced handler phase, null without valid handlers")
+    handlers: Dict[str, Optional[Phase]] = Field(default_factory=dict, description="Phase per handler, null for an invalid state file")
+    counts: Dict[Phase, int] = Field(default_factory=dict, description="Number of handlers per phase")
+
+
+class HandlerPhaseUpdate(BaseModel):
+    """
+    API request body for PUT /api/projects/{project_id}/services/{service}/handlers/{handler}
+    """
+    phase: Phase
+
+
+class ProjectServicesResponse(BaseModel):
+    """
+    API response for GET /api/projects/{project_id}/services
+    """
+    project: str
+    services: List[ServiceStatus] = Field(default_factory=list)
@@ -0,0 +1,259 @@
+"""
+Phase states of the microservices of every project.
+
+State lives in one file per handler:
+
+    <project>/.contextkeep/services/<service>/handlers/<handler>.json
+
+Each file is a source node of a DependencyGraph, each service a derived
+node over its handlers (its phase is the least advanced handler phase)
+and each project a derived node over its services. PhaseEngine.refresh()
+re-parses only state files whose stamp changed and the graph recomputes
+only what depends on them, so the status of every service of a project
+is always ready in memory.
+"""
+from datetime import datetime, timezone
+from pathlib import Path
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+import os
+import time
+from pydantic import ValidationError
+from modules.files.cache import content_cache
+from modules.files.service import FileStamp, write_file_atomic
+from modules.metrics.service import span
+from modules.phases.engine import DependencyGraph
+from modules.phases.models import PHASE_ORDER, HandlerState, Phase, ServiceStatus
+from modules.projects.service import find_project_dir
+from config import settings
+
+SERVICES_DIR = "services"
+HANDLERS_DIR = "handlers"
+STATE_SUFFIX = ".json"
+
+# (service, handler)
+HandlerKey = Tuple[str, str]
+
+
+def services_dir(project_dir: Path) -> Path:
+    """Directory holding a project's microservice state."""
+    return project_dir / ".contextkeep" / SERVICES_DIR
+
+
+def handler_state_path(project_dir: Path, service: str, handler: str) -> Path:
+    """Location of one handler's state file."""
+    return services_dir(project_dir) / service / HANDLERS_DIR / f"{handler}{STATE_SUFFIX}"
+
+
+def _parse_state(data: bytes) -> Optional[Phase]:
+    try:
+        return HandlerState.model_validate_json(data).phase
+    except ValidationError:
+        return None
+
+
+def _service_status(name: str, handlers: Tuple[str, ...]):
+    def compute(*phases: Optional[Phase]) -> ServiceStatus:
+        counts: Dict[Phase, int] = {}
+        for phase in phases:
+            if phase is not None:
+                counts[phase] = counts.get(phase, 0) + 1
+        return ServiceStatus(
+            name=name,
+            phase=min(counts, key=PHASE_ORDER.__getitem__) if counts else None,
+            handlers=dict(zip(handlers, phases)),
+            counts=counts,
+        )
+    return compute
+
+
+def _project_services(*services: ServiceStatus) -> Tuple[ServiceStatus, ...]:
+    return tuple(sorted(services, key=lambda s: s.name))
+
+
+def _scan_state_files(project_dir: Path) -> Dict[HandlerKey, Tuple[str, FileStamp]]:
+    """{(service, handler): (path, stamp)} of every handler state file."""
+    found = {}
+    try:
+        services = list(os.scandir(services_dir(project_dir)))
+    except (FileNotFoundError, NotADirectoryError):
+        return found
+    for service in services:
+        if service.name.startswith(".") or not service.is_dir():
+            continue
+        try:
+            handlers = list(os.scandir(os.path.join(service.path, HANDLERS_DIR)))
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        for entry in handlers:
+            name = entry.name
+            if name.startswith(".") or not name.endswith(STATE_SUFFIX):
+                continue
+            try:
+                st = entry.stat()
+            except FileNotFoundError:
+                continue
+            found[(service.name, name[:-len(STATE_SUFFIX)])] = (entry.path, (st.st_mtime_ns, st.st_size, st.st_ino))
+    return found
+
+
+class PhaseEngine:
+    """
+    Phase status of every microservice, kept up to date incrementally.
+    
+    Graph keys are ("handler", project, service, handler), ("service",
+    project, service) and ("project", project). Thread-safe.
+    """
+    
+    def __init__(self):
+        self.graph = DependencyGraph()
+        # project -> {(service, handler): stamp} as last applied
+        self._stamps: Dict[str, Dict[HandlerKey, FileStamp]] = {}
+        # project -> service -> handler names, as defined in the graph
+        self._layout: Dict[str, Dict[str, Tuple[str, ...]]] = {}
+        self._refreshed_at: Dict[str, float] = {}
+        self._lock = Lock()
+    
+    def services(self, project: str) -> Tuple[ServiceStatus, ...]:
+        """Status of every service of project (sorted by name), from memory."""
+        return self.graph.get(("project", project), ())
+    
+    def refreshed_at(self, project: str) -> Optional[float]:
+        """time.monotonic() of the project's last refresh, if any."""
+        return self._refreshed_at.get(project)
+    
+    def _apply(self, project: str, phases: Dict[HandlerKey, Optional[Phase]], removed: List[HandlerKey]) -> None:
+        # Called with the lock held
+        graph = self.graph
+        for (service, handler), phase in phases.items():
+            graph.set(("handler", project, service, handler), phase)
+        
+        layout: Dict[str, List[str]] = {}
+        for service, handler in self._stamps[project]:
+            layout.setdefault(service, []).append(handler)
+        new_layout = {s: tuple(sorted(h)) for s, h in layout.items()}
+        old_layout = self._layout.get(project, {})
+        
+        for service, handlers in new_layout.items():
+            if old_layout.get(service) != handlers:
+                graph.define(
+                    ("service", project, service),
+                    [("handler", project, service, h) for h in handlers],
+                    _service_status(service, handlers),
+                )
+        if new_layout.keys() != old_layout.keys() or ("project", project) not in graph:
+            graph.define(
+                ("project", project),
+                [("service", project, s) for s in sorted(new_layout)],
+                _project_services,
+            )
+        # Only once nothing uses them any more
+        for service in old_layout.keys() - new_layout.keys():
+            graph.discard(("service", project, service))
+        for service, handler in removed:
+            graph.discard(("handler", project, service, handler))
+        self._layout[project] = new_layout
+    
+    def refresh(self, project: str, directory: Path) -> int:
+        """
+        Bring one project in line with its state files.
+        
+        Every state file is stat()ed; only new or changed ones are parsed
+        (through the shared content cache) and only their services and
+        the project node are recomputed.
+        
+        Returns:
+            Number of state files that were added, changed or removed.
+        """
+        with span("phase_refresh"):
+            found = _scan_state_files(directory)
+            with self._lock:
+                known = self._stamps.setdefault(project, {})
+                changed = {key: path for key, (path, stamp) in found.items() if known.get(key) != stamp}
+                removed = [key for key in known if key not in found]
+            phases = {}
+            for key, path in changed.items():
+                try:
+                    phases[key] = content_cache.load(path, _parse_state)
+                except FileNotFoundError:
+                    # Deleted since the scan; the next refresh sees it gone
+                    pass
+            with self._lock:
+                for key in removed:
+                    known.pop(key, None)
+                for key in phases:
+                    known[key] = found[key][1]
+                if changed or removed or ("project", project) not in self.graph:
+                    self._apply(project, phases, removed)
+                self._refreshed_at[project] = time.monotonic()
+            return len(phases) + len(removed)
+    
+    def set_handler_phase(self, project: str, directory: Path, service: str, handler: str, phase: Phase) -> ServiceStatus:
+        """
+        Write a handler's state file atomically and apply it right away.
+        
+        Returns:
+            The service's new status.
+        """
+        path = handler_state_path(directory, service, handler)
+        state = HandlerState(phase=phase, updated_at=datetime.now(timezone.utc))
+        stamp = write_file_atomic(path, state)
+        with self._lock:
+            self._stamps.setdefault(project, {})[(service, handler)] = stamp
+            self._apply(project, {(service, handler): phase}, [])
+        return self.graph.get(("service", project, service))
+    
+    def forget(self, project: str) -> None:
+        """Drop everything known about a project."""
+        with self._lock:
+            layout = self._layout.pop(project, {})
+            self._stamps.pop(project, None)
+            self._refreshed_at.pop(project, None)
+            self.graph.discard(("project", project))
+            for service, handlers in layout.items():
+                self.graph.discard(("service", project, service))
+                for handler in handlers:
+                    self.graph.discard(("handler", project, service, handler))
+
+
+phase_engine = PhaseEngine()
+
+
+def project_services(project_id: str) -> List[ServiceStatus]:
+    """
+    Phase status of every microservice of a project.
+    
+    Served from memory; the project's state files are re-checked first
+    when the last check is older than settings.phase_refresh_seconds.
+    
+    Raises:
+        ValueError: For an invalid project id
+        FileNotFoundError: If the project directory doesn't exist
+    """
+    directory = find_project_dir(project_id)
+    last = phase_engine.refreshed_at(project_id)
+    if last is None or time.monotonic() - last >= settings.phase_refresh_seconds:
+        if not directory.is_dir():
+            phase_engine.forget(project_id)
+            raise FileNotFoundError(str(directory))
+        phase_engine.refresh(project_id, directory)
+    return list(phase_engine.services(project_id))
+
+
+def set_handler_phase(project_id: str, service: str, handler: str, phase: Phase) -> ServiceStatus:
+    """
+    Record a handler's phase (see PhaseEngine.set_handler_phase).
+    
+    Raises:
+        ValueError: For invalid project, service or handler names
+        FileNotFoundError: If the project directory doesn't exist
+    """
+    directory = find_project_dir(project_id)
+    for name in (service, handler):
+        if not name or name.startswith(".") or "/" in name or "\\" in name:
+            raise ValueError("Invalid service or handler name")
+    if not directory.is_dir():
+        raise FileNotFoundError(str(directory))
+    if phase_engine.refreshed_at(project_id) is None:
+        phase_engine.refresh(project_id, directory)
+    return phase_engine.set_handler_phase(project_id, directory, service, handler, phase)
@@ -1,20 +1,232 @@
 """
 Projects API endpoints.
 """
-from fastapi import APIRouter
-from modules.projects.service import list_projects
-from modules.projects.models import ProjectListResponse
+from datetime import datetime
+from email.utils import formatdate
+from functools import partial
+from itertools import islice
+from typing import AsyncIterator, Iterator, List, Optional, Tuple
+import asyncio
+from fastapi import APIRouter, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from modules.files.service import run_io
+from modules.metrics.service import span
+from modules.projects.gitinfo import project_git_info
+from modules.projects.service import (
+    event_id,
+    iter_projects,
+    list_projects,
+    parse_event_id,
+    project_event,
+    project_index,
+    projects_etag,
+    query_projects,
+    search_projects,
+)
+from modules.projects.models import (
+    ProjectGitResponse,
+    ProjectListResponse,
+    ProjectSearchResponse,
+    ProjectSnapshotEvent,
+    ProjectSort,
+)
+from modules.projects.records import to_summary
+from config import settings
 
 router = APIRouter()
 
+# Seconds between index version checks for stream subscribers while the
+# index is live (an O(1) check); otherwise the stream rescans every
+# settings.watch_poll_interval
+STREAM_CHECK_INTERVAL = 0.25
+# Idle seconds before a comment line is sent to keep proxies from timing out
+STREAM_HEARTBEAT_INTERVAL = 15.0
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+# Projects serialized per executor hop when streaming NDJSON
+NDJSON_BATCH_SIZE = 100
+
+# (etag, serialized body) of the last full listing sent
+_listing_cache: Optional[Tuple[str, bytes]] = None
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """RFC 9110 weak comparison of an If-None-Match header against etag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
 
 @router.get("/projects", response_model=ProjectListResponse)
-def get_projects():
+async def get_projects(
+    request: Request,
+    q: Optional[str] = Query(None, description="Substring of project name or description"),
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    sort: ProjectSort = ProjectSort.project_name,
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+):
     """
     List all ContextKeep projects.
     
+    Without parameters returns every project sorted alphabetically, with
+    ETag / Last-Modified headers; a matching If-None-Match gets 304 Not
+    Modified without listing anything, and repeat hits reuse the
+    serialized body. Filter, sort and limit/cursor parameters select a
+    page instead; follow next_cursor to fetch the following page.
+    
+    With "Accept: application/x-ndjson" (and no parameters) projects are
+    streamed instead, one ProjectSummary JSON object per line, as they
+    are loaded; the order is then unspecified.
+    
+    The listing runs on the files I/O executor, so concurrent requests
+    don't occupy Starlette's threadpool or block the event loop.
+    
+    Returns:
+        ProjectListResponse with the matching projects.
+    """
+    if (q, created_after, created_before, cursor, limit) == (None,) * 5 \
+            and sort == ProjectSort.project_name and order == "asc":
+        if NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+            return StreamingResponse(_ndjson_listing(), media_type=NDJSON_MEDIA_TYPE)
+        return await _full_listing(request)
+    
+    try:
+        with span("query"):
+            return await run_io(partial(
+                query_projects,
+                q=q,
+                created_after=created_after,
+                created_before=created_before,
+                sort=sort,
+                descending=order == "desc",
+                cursor=cursor,
+                limit=limit,
+            ))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _serialize_batch(projects: Iterator, size: int) -> List[bytes]:
+    return [to_summary(p).model_dump_json().encode("utf-8") + b"\n" for p in islice(projects, size)]
+
+
+async def _ndjson_listing() -> AsyncIterator[bytes]:
+    # The generator is advanced on the I/O executor a batch at a time, so
+    # only one batch is ever buffered and the first lines go out early
+    projects = iter_projects()
+    while True:
+        batch = await run_io(_serialize_batch, projects, NDJSON_BATCH_SIZE)
+        if not batch:
+            return
+        yield b"".join(batch)
+
+
+async def _full_listing(request: Request) -> Response:
+    global _listing_cache
+    etag, last_modified = await run_io(projects_etag)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(last_modified, usegmt=True),
+        "Cache-Control": "no-cache",
+    }
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    
+    cached = _listing_cache
+    if cached is not None and cached[0] == etag:
+        body = cached[1]
+    else:
+        projects = await run_io(list_projects)
+        with span("serialize"):
+            # Records become API models here, only for the response
+            response = ProjectListResponse(projects=[to_summary(p) for p in projects])
+            body = response.model_dump_json().encode("utf-8")
+        _listing_cache = (etag, body)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+async def project_event_stream(since: Optional[int] = None) -> AsyncIterator[bytes]:
+    """
+    Server-sent events for the project list, starting after version since.
+    
+    Emits a "snapshot" event first (unless since can be caught up with a
+    delta), then a "delta" event whenever projects change. Each event is
+    only computed once the previous one was consumed, with all changes in
+    between coalesced, so memory per subscriber stays constant however
+    slowly it reads.
+    """
+    idle = 0.0
+    while True:
+        if since is None or not project_index.live or project_index.version != since:
+            version, event = await run_io(project_event, since)
+            if event is not None:
+                kind = "snapshot" if isinstance(event, ProjectSnapshotEvent) else "delta"
+                since, idle = version, 0.0
+                yield f"id: {event_id(version)}\nevent: {kind}\ndata: {event.model_dump_json()}\n\n".encode("utf-8")
+                continue
+        
+        interval = STREAM_CHECK_INTERVAL if project_index.live else settings.watch_poll_interval
+        await asyncio.sleep(interval)
+        idle += interval
+        if idle >= STREAM_HEARTBEAT_INTERVAL:
+            idle = 0.0
+            yield b": keep-alive\n\n"
+
+
+@router.get("/projects/stream")
+async def get_project_stream(last_event_id: Optional[str] = Header(None)):
+    """
+    Stream project list changes as server-sent events.
+    
+    The first event is a full snapshot; after that only deltas (added,
+    updated and removed projects, keyed by directory name) are sent. A
+    client reconnecting with Last-Event-ID resumes with a delta when the
+    server still has the changes since then.
+    """
+    return StreamingResponse(
+        project_event_stream(parse_event_id(last_event_id)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/projects/search", response_model=ProjectSearchResponse)
+async def get_project_search(
+    q: str = Query(..., min_length=1, description="Search text; each word matches as a prefix"),
+    limit: int = Query(20, ge=1, le=100),
+):
+    """
+    Search projects by name, repo name and description.
+    
+    Returns:
+        ProjectSearchResponse with ranked results, best match first.
+    """
+    with span("search"):
+        results = await run_io(search_projects, q, limit)
+    return ProjectSearchResponse(results=results)
+
+
+@router.get("/projects/git", response_model=ProjectGitResponse)
+async def get_projects_git(
+    ids: Optional[List[str]] = Query(None, description="Project ids (directory names); every project if omitted"),
+):
+    """
+    Git state of many projects at once: branch, HEAD, dirty state and last commit.
+    
+    Read from each project's .git directory without running git, cached
+    per project until its HEAD, index or branch ref changes, and filled
+    in for all requested projects in one parallel pass.
+    
     Returns:
-        ProjectListResponse with list of projects sorted alphabetically.
+        ProjectGitResponse with one entry per id (git is null for unknown
+        projects and projects that aren't git repositories).
     """
-    projects = list_projects()
-    return ProjectListResponse(projects=projects)
\ No newline at end of file
+    with span("git"):
+        projects = await run_io(project_git_info, ids)
+    return ProjectGitResponse(projects=projects)
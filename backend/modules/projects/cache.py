@@ -0,0 +1,104 @@
+"""
+In-process cache of parsed project metadata.
+
+Entries are keyed by metadata file path and validated against the file's
+stamp (mtime_ns, size, inode), so only new or changed files get re-parsed.
+"""
+from collections import OrderedDict
+from pathlib import Path
+from threading import Lock
+from typing import Iterable, List, Optional, Tuple
+from modules.files.service import FileStamp
+from modules.projects.records import ProjectRecord
+
+# Returned by MetadataCache.get() when there is no usable entry.
+# (None is a valid cached value: it marks a file that failed validation.)
+MISS = object()
+
+
+class MetadataCache:
+    """
+    Bounded LRU cache of ProjectRecord objects keyed by metadata path.
+    
+    Invalid metadata is cached as None so a broken project.json is not
+    re-parsed on every scan either. Thread-safe.
+    """
+    
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Path, tuple]" = OrderedDict()
+        self._lock = Lock()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, path: Path, stamp: FileStamp):
+        """
+        Look up the cached summary for path.
+        
+        Returns:
+            The cached ProjectRecord (or None for known-invalid metadata)
+            if the stored stamp matches, otherwise MISS.
+        """
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None or entry[0] != stamp:
+                self.misses += 1
+                return MISS
+            self._entries.move_to_end(path)
+            self.hits += 1
+            return entry[1]
+    
+    def put(self, path: Path, stamp: FileStamp, summary: Optional[ProjectRecord]) -> None:
+        """Store the parse result for path, evicting the least recently used entry if full."""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[path] = (stamp, summary)
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def items(self) -> List[Tuple[Path, FileStamp, Optional[ProjectRecord]]]:
+        """Snapshot of all (path, stamp, summary) entries, without touching LRU order."""
+        with self._lock:
+            return [(path, stamp, summary) for path, (stamp, summary) in self._entries.items()]
+    
+    def discard(self, path: Path) -> None:
+        """Remove the entry for path, if any."""
+        with self._lock:
+            self._entries.pop(path, None)
+    
+    def retain(self, paths: Iterable[Path]) -> int:
+        """
+        Evict every entry whose path is not in paths.
+        
+        Used after a full scan to drop projects that have been deleted.
+        
+        Returns:
+            Number of evicted entries.
+        """
+        keep = set(paths)
+        with self._lock:
+            stale = [path for path in self._entries if path not in keep]
+            for path in stale:
+                del self._entries[path]
+        return len(stale)
+    
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+    
+    def stats(self) -> dict:
+        """Current size, bound and hit/miss counters."""
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -0,0 +1,104 @@
+"""
+Persistent project catalog for fast cold startup.
+
+Stores one row per valid project: the summary fields plus the
+project.json stamp the row was built from. On boot the rows seed the
+metadata cache and the project index, so the first listing needs neither
+a directory walk nor Pydantic validation; a background scan then
+reconciles against the filesystem (re-parsing only changed files).
+"""
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, List, Tuple
+import sqlite3
+from modules.files.service import FileStamp
+from modules.projects.records import ProjectRecord
+
+SCHEMA_VERSION = 1
+
+# (project_dir, stamp of its project.json, summary)
+CatalogRow = Tuple[Path, FileStamp, ProjectRecord]
+
+
+class ProjectCatalog:
+    """SQLite-backed snapshot of the project index."""
+    
+    def __init__(self, path: Path):
+        self.path = path
+    
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=5.0)
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            conn.executescript(f"""
+                DROP TABLE IF EXISTS projects;
+                CREATE TABLE projects (
+                    project_dir TEXT PRIMARY KEY,
+                    mtime_ns INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    inode INTEGER NOT NULL,
+                    project_name TEXT NOT NULL,
+                    repo_name TEXT NOT NULL,
+                    description TEXT NOT NULL,
+                    created_at TEXT NOT NULL
+                );
+                PRAGMA user_version = {SCHEMA_VERSION};
+            """)
+        return conn
+    
+    def load(self) -> List[CatalogRow]:
+        """
+        Read every catalog row.
+        
+        Rows were validated before they were saved, so records are built
+        straight from the columns, without Pydantic, on the boot path.
+        
+        Returns:
+            Catalog rows; empty if the catalog is missing or unreadable.
+        """
+        if not self.path.exists():
+            return []
+        try:
+            conn = self._connect()
+            try:
+                cursor = conn.execute(
+                    "SELECT project_dir, mtime_ns, size, inode, project_name,"
+                    " repo_name, description, created_at FROM projects"
+                )
+                return [
+                    (
+                        Path(row[0]),
+                        (row[1], row[2], row[3]),
+                        ProjectRecord(row[4], row[5], row[6], datetime.fromisoformat(row[7])),
+                    )
+                    for row in cursor
+                ]
+            finally:
+                conn.close()
+        except (sqlite3.Error, ValueError):
+            return []
+    
+    def save(self, rows: Iterable[CatalogRow]) -> None:
+        """
+        Replace the catalog contents with rows in a single transaction.
+        
+        Raises:
+            sqlite3.Error: If the catalog can't be written
+        """
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM projects")
+                conn.executemany(
+                    "INSERT INTO projects VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        (
+                            str(project_dir), *stamp,
+                            summary.project_name, summary.repo_name,
+                            summary.description, summary.created_at.isoformat(),
+                        )
+                        for project_dir, stamp, summary in rows
+                    ),
+                )
+        finally:
+            conn.close()
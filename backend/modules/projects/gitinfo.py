@@ -0,0 +1,251 @@
+"""
+Git state of every project, for the expanded project view.
+
+Branch, HEAD, last commit and dirty state are read in-process from each
+project's .git directory (see gitrepo.py); git itself is never run.
+Results are cached per project, keyed by the stamps of .git/HEAD,
+.git/index, the checked-out branch's ref and packed-refs (a commit moves
+the branch ref, not HEAD). While those are unchanged, only the working
+tree is re-checked, at most every settings.git_status_seconds.
+git_info() fills in a whole listing in one pass on a pool of
+settings.git_workers threads.
+"""
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Tuple
+import struct
+import time
+import zlib
+from modules.files.service import FileStamp, file_stamp
+from modules.metrics.service import registry
+from modules.projects.gitrepo import Repository, find_git_dir
+from modules.projects.index import sort_key
+from modules.projects.models import GitCommit, GitInfo, ProjectGitEntry
+from config import settings
+
+# What reading a damaged repository can raise; such projects report unknown state
+_READ_ERRORS = (OSError, ValueError, LookupError, struct.error, zlib.error)
+
+# Stamps of HEAD, index, branch ref and packed-refs
+RepoKey = Tuple[Optional[FileStamp], ...]
+
+
+class _RepoState:
+    """What is known about one repository. Replaced, never mutated."""
+    
+    __slots__ = ("repo", "ref", "key", "info", "index", "checked_at")
+    
+    def __init__(self, repo: Repository, ref: Optional[str], key: RepoKey, info: GitInfo, index, checked_at: float):
+        self.repo = repo
+        self.ref = ref
+        self.key = key
+        self.info = info
+        # Index entries the working tree is checked against; None when
+        # dirty doesn't depend on the working tree (staged changes,
+        # conflicts, unreadable index or HEAD tree)
+        self.index = index
+        self.checked_at = checked_at
+
+
+def _key(repo: Repository, ref: Optional[str]) -> RepoKey:
+    return (
+        file_stamp(repo.git_dir / "HEAD"),
+        file_stamp(repo.index_path()),
+        file_stamp(repo.ref_path(ref)) if ref else None,
+        file_stamp(repo.common_dir / "packed-refs"),
+    )
+
+
+def _index_mtime(key: RepoKey) -> int:
+    return key[1][0] if key[1] else 0
+
+
+def _commit_model(repo: Repository, sha: Optional[str]) -> Tuple[Optional[GitCommit], Optional[str]]:
+    """(last commit, its tree) for HEAD's sha."""
+    commit = repo.commit(sha) if sha else None
+    if commit is None:
+        return None, None
+    zone = timezone(timedelta(minutes=commit.offset_minutes))
+    return GitCommit(
+        sha=commit.sha,
+        summary=commit.summary,
+        author=commit.author,
+        committed_at=datetime.fromtimestamp(commit.timestamp, zone),
+    ), commit.tree
+
+
+def _read_state(repo: Repository, previous: Optional[_RepoState]) -> _RepoState:
+    # Stamps are taken before reading, so a change while reading is seen next time
+    ref_guess = previous.ref if previous is not None else None
+    key = _key(repo, ref_guess)
+    ref, head = repo.head()
+    if ref != ref_guess:
+        key = key[:2] + _key(repo, ref)[2:]
+    last_commit, tree_sha = _commit_model(repo, head)
+    
+    index = repo.read_index()
+    entries = None
+    dirty: Optional[bool] = None
+    if index is not None and index.conflicted:
+        dirty = True
+    elif index is not None:
+        tree = repo.tree_paths(tree_sha) if tree_sha else {}
+        if tree is not None:
+            if {e.path: (e.mode, e.sha) for e in index.entries} != tree:
+                dirty = True
+            else:
+                entries = index.entries
+                dirty = repo.worktree_modified(entries, _index_mtime(key))
+    info = GitInfo(
+        branch=ref.removeprefix("refs/heads/") if ref else None,
+        head=head,
+        dirty=dirty,
+        last_commit=last_commit,
+    )
+    return _RepoState(repo, ref, key, info, entries, time.monotonic())
+
+
+class GitInfoCache:
+    """
+    Bounded LRU cache of per-project git state. Thread-safe.
+    
+    Concurrent lookups of one project may both read it; the last one to
+    finish is kept.
+    """
+    
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Path, _RepoState]" = OrderedDict()
+        self._lock = Lock()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+    
+    def get(self, project_dir: Path) -> Optional[GitInfo]:
+        """
+        Git state of the repository at project_dir.
+        
+        Returns:
+            None if project_dir is not a git repository; fields that
+            can't be read are None.
+        """
+        with self._lock:
+            state = self._entries.get(project_dir)
+            if state is not None:
+                self._entries.move_to_end(project_dir)
+        
+        try:
+            if state is None:
+                git_dir = find_git_dir(project_dir)
+                if git_dir is None:
+                    return None
+                state = _read_state(Repository(project_dir, git_dir), None)
+            elif _key(state.repo, state.ref) != state.key:
+                state = _read_state(state.repo, state)
+            elif state.index is None or time.monotonic() - state.checked_at < settings.git_status_seconds:
+                self.hits += 1
+                return state.info
+            else:
+                # HEAD, refs and index unchanged: only the working tree can have changed
+                dirty = state.repo.worktree_modified(state.index, _index_mtime(state.key))
+                info = state.info if dirty == state.info.dirty else state.info.model_copy(update={"dirty": dirty})
+                state = _RepoState(state.repo, state.ref, state.key, info, state.index, time.monotonic())
+        except _READ_ERRORS:
+            # Gone or damaged; .git is looked up again next time
+            with self._lock:
+                self._entries.pop(project_dir, None)
+            return None
+        
+        self.misses += 1
+        if self.max_entries > 0:
+            with self._lock:
+                self._entries[project_dir] = state
+                self._entries.move_to_end(project_dir)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return state.info
+
+
+# One entry per project, like the metadata cache
+git_cache = GitInfoCache(max_entries=settings.metadata_cache_size)
+
+registry.callback("contextkeep_git_cache_hits_total", "Git state cache hits", lambda: git_cache.hits, kind="counter")
+registry.callback(
+    "contextkeep_git_cache_misses_total", "Git state cache misses (repositories read)", lambda: git_cache.misses,
+    kind="counter",
+)
+
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = Lock()
+
+
+def _executor() -> ThreadPoolExecutor:
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != settings.git_workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            _pool = ThreadPoolExecutor(max_workers=settings.git_workers, thread_name_prefix="git-info")
+            _pool_workers = settings.git_workers
+        return _pool
+
+
+def git_info(project_dirs: Iterable[Path]) -> Dict[Path, Optional[GitInfo]]:
+    """
+    Git state of many projects in one parallel pass.
+    
+    Cached projects whose HEAD, index and refs are unchanged cost a few
+    stat() calls (plus a working tree check once the cached one is older
+    than settings.git_status_seconds); the rest are read on a pool of
+    settings.git_workers threads (1 = sequential).
+    
+    Returns:
+        {project_dir: GitInfo, or None if it is not a git repository}
+    """
+    dirs = list(project_dirs)
+    if len(dirs) <= 1 or settings.git_workers <= 1:
+        results = map(git_cache.get, dirs)
+    else:
+        results = _executor().map(git_cache.get, dirs)
+    return dict(zip(dirs, results))
+
+
+def project_git_info(ids: Optional[List[str]] = None) -> List[ProjectGitEntry]:
+    """
+    Git state of listed projects, by id (the directory name).
+    
+    Args:
+        ids: Projects to report, in this order; every project (in
+            project_name order) if None. Ids resolve like
+            find_project_dir() (the first root holding one wins); unknown
+            ids get git=None.
+    """
+    from modules.projects.service import find_project_dir, refresh_projects
+    _, entries = refresh_projects().entries()
+    if ids is None:
+        dirs = [d for d, _ in sorted(entries.items(), key=lambda item: sort_key(*item))]
+        pairs = [(d.name, d) for d in dirs]
+    else:
+        pairs = []
+        for project_id in ids:
+            try:
+                project_dir = find_project_dir(project_id)
+            except ValueError:
+                project_dir = None
+            pairs.append((project_id, project_dir if project_dir in entries else None))
+    
+    found = git_info(d for _, d in pairs if d is not None)
+    return [
+        ProjectGitEntry(id=project_id, git=found[d] if d is not None else None)
+        for project_id, d in pairs
+    ]
@@ -0,0 +1,483 @@
+"""
+Read-only access to git repositories without running git.
+
+Reads what the expanded project view needs straight from the .git
+directory: HEAD and refs (loose and packed-refs), commit and tree
+objects (loose, or in pack files through their v2 .idx, with ofs/ref
+deltas resolved) and the index (versions 2 to 4). Working trees are
+compared with the index by stat data, as git does, hashing only files
+whose stat data doesn't match or is racy.
+
+Not supported: SHA-256 repositories, alternates, split and sparse
+indexes (reported as unknown); clean/smudge filters and CRLF conversion
+are not applied, so a file they would normalize counts as modified.
+"""
+from bisect import bisect_left
+from pathlib import Path
+from threading import Lock
+from typing import Dict, List, NamedTuple, Optional, Tuple
+import hashlib
+import os
+import stat
+import struct
+import zlib
+
+HASH_SIZE = 20
+HEX_SIZE = 2 * HASH_SIZE
+
+OBJ_COMMIT, OBJ_TREE, OBJ_BLOB, OBJ_TAG = 1, 2, 3, 4
+OBJ_OFS_DELTA, OBJ_REF_DELTA = 6, 7
+_TYPE_NAMES = {b"commit": OBJ_COMMIT, b"tree": OBJ_TREE, b"blob": OBJ_BLOB, b"tag": OBJ_TAG}
+
+MODE_TREE = 0o040000
+MODE_SYMLINK = 0o120000
+MODE_GITLINK = 0o160000
+
+# Symbolic refs followed at most this deep (as git's own limit)
+MAX_SYMREF_DEPTH = 5
+
+# Index entry flags
+_EXTENDED = 0x4000
+_SKIP_WORKTREE = 0x4000  # in the extended flags
+_INTENT_TO_ADD = 0x2000  # in the extended flags
+
+
+class IndexEntry(NamedTuple):
+    """One stage-0 entry of the index, with the stat data git compares."""
+    path: str
+    mode: int
+    sha: bytes
+    mtime_ns: int
+    size: int
+    skip_worktree: bool
+    intent_to_add: bool
+
+
+class Commit(NamedTuple):
+    sha: str
+    tree: str
+    author: str
+    # Committer time: seconds since the epoch and UTC offset in minutes
+    timestamp: int
+    offset_minutes: int
+    summary: str
+
+
+class GitIndex(NamedTuple):
+    entries: List[IndexEntry]
+    # Unmerged (conflicted) paths present
+    conflicted: bool
+
+
+def find_git_dir(worktree: Path) -> Optional[Path]:
+    """The .git directory of worktree (following a "gitdir:" file), or None."""
+    dot_git = worktree / ".git"
+    if dot_git.is_dir():
+        return dot_git
+    try:
+        text = dot_git.read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError):
+        return None
+    if not text.startswith("gitdir:"):
+        return None
+    git_dir = Path(text[len("gitdir:"):].strip())
+    return git_dir if git_dir.is_absolute() else worktree / git_dir
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    # Big-endian varint with git's +1 per continuation byte (OFS_DELTA base
+    # offsets, index v4 path prefixes)
+    byte = data[pos]
+    offset = byte & 0x7F
+    while byte & 0x80:
+        pos += 1
+        byte = data[pos]
+        offset = ((offset + 1) << 7) | (byte & 0x7F)
+    return offset, pos + 1
+
+
+def _read_delta_size(delta: bytes, pos: int) -> Tuple[int, int]:
+    size = shift = 0
+    while True:
+        byte = delta[pos]
+        pos += 1
+        size |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80:
+            return size, pos
+
+
+def apply_delta(base: bytes, delta: bytes) -> bytes:
+    """Rebuild an object from its base and a git delta."""
+    base_size, pos = _read_delta_size(delta, 0)
+    if base_size != len(base):
+        raise ValueError("Delta base size mismatch")
+    result_size, pos = _read_delta_size(delta, pos)
+    out = bytearray()
+    end = len(delta)
+    while pos < end:
+        op = delta[pos]
+        pos += 1
+        if op & 0x80:
+            # Copy from the base: up to 4 offset and 3 size bytes, present per bit
+            offset = size = 0
+            for i in range(4):
+                if op & (1 << i):
+                    offset |= delta[pos] << (8 * i)
+                    pos += 1
+            for i in range(3):
+                if op & (0x10 << i):
+                    size |= delta[pos] << (8 * i)
+                    pos += 1
+            out += base[offset:offset + (size or 0x10000)]
+        elif op:
+            out += delta[pos:pos + op]
+            pos += op
+        else:
+            raise ValueError("Invalid delta opcode")
+    if len(out) != result_size:
+        raise ValueError("Delta result size mismatch")
+    return bytes(out)
+
+
+class PackFile:
+    """One pack and its v2 .idx, looked up by binary search over the sorted hashes."""
+    
+    def __init__(self, idx_path: Path):
+        data = idx_path.read_bytes()
+        if data[:4] != b"\377tOc" or struct.unpack_from(">I", data, 4)[0] != 2:
+            raise ValueError(f"Unsupported pack index {idx_path}")
+        self.pack_path = idx_path.with_suffix(".pack")
+        self._fanout = struct.unpack_from(">256I", data, 8)
+        count = self._fanout[255]
+        names_at = 8 + 256 * 4
+        self._names = [data[names_at + i * HASH_SIZE:names_at + (i + 1) * HASH_SIZE] for i in range(count)]
+        offsets_at = names_at + count * (HASH_SIZE + 4)
+        self._offsets = struct.unpack_from(f">{count}I", data, offsets_at)
+        self._large_at = offsets_at + count * 4
+        self._idx = data
+    
+    def offset(self, sha: bytes) -> Optional[int]:
+        """Offset of sha in the pack, or None if the pack doesn't have it."""
+        lo = self._fanout[sha[0] - 1] if sha[0] else 0
+        hi = self._fanout[sha[0]]
+        i = bisect_left(self._names, sha, lo, hi)
+        if i == hi or self._names[i] != sha:
+            return None
+        offset = self._offsets[i]
+        if offset & 0x80000000:
+            offset = struct.unpack_from(">Q", self._idx, self._large_at + (offset & 0x7FFFFFFF) * 8)[0]
+        return offset
+
+
+class Repository:
+    """
+    A git repository read directly from disk. Thread-safe.
+    
+    Args:
+        worktree: The repository's working tree (the project directory)
+        git_dir: Its .git directory (see find_git_dir())
+    """
+    
+    def __init__(self, worktree: Path, git_dir: Path):
+        self.worktree = worktree
+        self.git_dir = git_dir
+        # Linked worktrees keep refs and objects in the main repository
+        try:
+            common = (git_dir / "commondir").read_text(encoding="utf-8").strip()
+            self.common_dir = git_dir / common
+        except OSError:
+            self.common_dir = git_dir
+        self.objects_dir = self.common_dir / "objects"
+        self._packs: Dict[str, PackFile] = {}
+        self._lock = Lock()
+    
+    # Refs
+    
+    def head(self) -> Tuple[Optional[str], Optional[str]]:
+        """
+        What HEAD points to.
+        
+        Returns:
+            (ref name or None if detached, commit sha or None if unborn)
+        """
+        name = "HEAD"
+        for _ in range(MAX_SYMREF_DEPTH):
+            value = self._read_ref(name)
+            if value is None or not value.startswith("ref:"):
+                return (name if name != "HEAD" else None), value
+            name = value[4:].strip()
+        return name, None
+    
+    def ref_path(self, name: str) -> Path:
+        """File of a loose ref (HEAD and other pseudo-refs are per worktree)."""
+        return (self.git_dir if "/" not in name else self.common_dir) / name
+    
+    def _read_ref(self, name: str) -> Optional[str]:
+        try:
+            return self.ref_path(name).read_text(encoding="utf-8").strip()
+        except (OSError, UnicodeDecodeError):
+            pass
+        try:
+            with open(self.common_dir / "packed-refs", encoding="utf-8") as f:
+                for line in f:
+                    if line[0] in "#^":
+                        continue
+                    sha, _, ref = line.rstrip("\n").partition(" ")
+                    if ref == name:
+                        return sha
+        except (OSError, UnicodeDecodeError):
+            pass
+        return None
+    
+    # Objects
+    
+    def _pack_files(self) -> List[PackFile]:
+        pack_dir = self.objects_dir / "pack"
+        try:
+            names = sorted(n for n in os.listdir(pack_dir) if n.endswith(".idx"))
+        except OSError:
+            return []
+        with self._lock:
+            packs = {}
+            for name in names:
+                pack = self._packs.get(name)
+                if pack is None:
+                    try:
+                        pack = PackFile(pack_dir / name)
+                    except (OSError, ValueError, struct.error):
+                        continue
+                packs[name] = pack
+            self._packs = packs
+            return list(packs.values())
+    
+    def read_object(self, sha: str) -> Optional[Tuple[int, bytes]]:
+        """(type, content) of an object, or None if it can't be found."""
+        if len(sha) != HEX_SIZE:
+            return None
+        try:
+            with open(self.objects_dir / sha[:2] / sha[2:], "rb") as f:
+                raw = zlib.decompress(f.read())
+            header, _, content = raw.partition(b"\0")
+            return _TYPE_NAMES[header.split(b" ", 1)[0]], content
+        except FileNotFoundError:
+            pass
+        binary = bytes.fromhex(sha)
+        for pack in self._pack_files():
+            offset = pack.offset(binary)
+            if offset is not None:
+                with open(pack.pack_path, "rb") as f:
+                    return self._read_packed(f, offset)
+        return None
+    
+    def _read_packed(self, f, offset: int) -> Tuple[int, bytes]:
+        f.seek(offset)
+        # Header plus the largest base reference (a 20-byte ref or a varint offset)
+        head = f.read(32)
+        byte = head[0]
+        kind = (byte >> 4) & 7
+        pos = 1
+        while byte & 0x80:
+            byte = head[pos]
+            pos += 1
+        if kind == OBJ_OFS_DELTA:
+            distance, pos = _read_varint(head, pos)
+            base = self._read_packed(f, offset - distance)
+        elif kind == OBJ_REF_DELTA:
+            base = self.read_object(head[pos:pos + HASH_SIZE].hex())
+            pos += HASH_SIZE
+            if base is None:
+                raise ValueError("Missing delta base")
+        f.seek(offset + pos)
+        inflater = zlib.decompressobj()
+        chunks = []
+        while not inflater.eof:
+            chunk = f.read(64 * 1024)
+            if not chunk:
+                raise ValueError("Truncated pack entry")
+            chunks.append(inflater.decompress(chunk))
+        data = b"".join(chunks)
+        if kind in (OBJ_OFS_DELTA, OBJ_REF_DELTA):
+            return base[0], apply_delta(base[1], data)
+        return kind, data
+    
+    def commit(self, sha: str) -> Optional[Commit]:
+        """A commit object, or None if it can't be read."""
+        obj = self.read_object(sha)
+        if obj is None or obj[0] != OBJ_COMMIT:
+            return None
+        headers, _, message = obj[1].partition(b"\n\n")
+        fields = {}
+        for line in headers.split(b"\n"):
+            key, _, value = line.partition(b" ")
+            fields.setdefault(key, value)
+        # "Name <email> 1700000000 +0100"
+        author = fields.get(b"author", b"").decode("utf-8", "replace")
+        committer = fields.get(b"committer", b"").decode("utf-8", "replace").rsplit(" ", 2)
+        try:
+            timestamp = int(committer[-2])
+            tz = committer[-1]
+            offset = (-1 if tz.startswith("-") else 1) * (int(tz[1:3]) * 60 + int(tz[3:5]))
+        except (IndexError, ValueError):
+            timestamp, offset = 0, 0
+        return Commit(
+            sha=sha,
+            tree=fields.get(b"tree", b"").decode("ascii", "replace"),
+            author=author.rsplit(" ", 2)[0].split(" <", 1)[0],
+            timestamp=timestamp,
+            offset_minutes=offset,
+            summary=message.split(b"\n", 1)[0].decode("utf-8", "replace"),
+        )
+    
+    def tree_paths(self, sha: str) -> Optional[Dict[str, Tuple[int, bytes]]]:
+        """
+        {path: (mode, sha)} of every blob, symlink and gitlink under a tree.
+        
+        Returns:
+            None if some tree object can't be read.
+        """
+        found: Dict[str, Tuple[int, bytes]] = {}
+        pending = [("", sha)]
+        while pending:
+            prefix, tree_sha = pending.pop()
+            obj = self.read_object(tree_sha)
+            if obj is None or obj[0] != OBJ_TREE:
+                return None
+            data, pos = obj[1], 0
+            while pos < len(data):
+                space = data.index(b" ", pos)
+                nul = data.index(b"\0", space)
+                mode = int(data[pos:space], 8)
+                path = prefix + data[space + 1:nul].decode("utf-8", "surrogateescape")
+                entry_sha = data[nul + 1:nul + 1 + HASH_SIZE]
+                pos = nul + 1 + HASH_SIZE
+                if mode == MODE_TREE:
+                    pending.append((path + "/", entry_sha.hex()))
+                else:
+                    found[path] = (mode, entry_sha)
+        return found
+    
+    # Index and working tree
+    
+    def index_path(self) -> Path:
+        return self.git_dir / "index"
+    
+    def read_index(self) -> Optional[GitIndex]:
+        """
+        Stage-0 entries of the index (empty if there is no index).
+        
+        Returns:
+            None for indexes that can't be read here (other versions,
+            split or sparse indexes, corrupt files).
+        """
+        try:
+            data = self.index_path().read_bytes()
+        except FileNotFoundError:
+            return GitIndex([], False)
+        except OSError:
+            return None
+        try:
+            return _parse_index(data)
+        except (ValueError, IndexError, struct.error, UnicodeDecodeError):
+            return None
+    
+    def worktree_modified(self, entries: List[IndexEntry], index_mtime_ns: int) -> bool:
+        """
+        True if any tracked file in the working tree differs from the index.
+        
+        Files whose mtime and size match the index entry are taken as
+        unchanged unless the match is racy (modified no earlier than the
+        index was written); all others are hashed and compared.
+        """
+        root = str(self.worktree)
+        for entry in entries:
+            if entry.skip_worktree or entry.mode == MODE_GITLINK:
+                continue
+            if entry.intent_to_add:
+                return True
+            path = os.path.join(root, entry.path)
+            try:
+                st = os.lstat(path)
+            except (FileNotFoundError, NotADirectoryError):
+                return True
+            if entry.mode & 0o170000 == MODE_SYMLINK:
+                if not stat.S_ISLNK(st.st_mode):
+                    return True
+            elif not stat.S_ISREG(st.st_mode) or bool(st.st_mode & 0o100) != bool(entry.mode & 0o100):
+                return True
+            if st.st_size != entry.size:
+                return True
+            if st.st_mtime_ns == entry.mtime_ns and st.st_mtime_ns < index_mtime_ns:
+                continue
+            if _blob_sha(path, st) != entry.sha:
+                return True
+        return False
+
+
+def _blob_sha(path: str, st: os.stat_result) -> bytes:
+    if stat.S_ISLNK(st.st_mode):
+        target = os.fsencode(os.readlink(path))
+        return hashlib.sha1(b"blob %d\0" % len(target) + target).digest()
+    digest = hashlib.sha1(b"blob %d\0" % st.st_size)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def _parse_index(data: bytes) -> Optional[GitIndex]:
+    if data[:4] != b"DIRC":
+        raise ValueError("Not a git index")
+    version, count = struct.unpack_from(">II", data, 4)
+    if version not in (2, 3, 4):
+        return None
+    entries: List[IndexEntry] = []
+    conflicted = False
+    pos = 12
+    previous = b""
+    for _ in range(count):
+        start = pos
+        (_, _, mtime_s, mtime_ns, _, _, mode, _, _, size) = struct.unpack_from(">10I", data, pos)
+        sha = data[pos + 40:pos + 40 + HASH_SIZE]
+        flags = struct.unpack_from(">H", data, pos + 60)[0]
+        pos += 62
+        extended = 0
+        if flags & _EXTENDED and version >= 3:
+            extended = struct.unpack_from(">H", data, pos)[0]
+            pos += 2
+        if version == 4:
+            # Path as (bytes to drop from the previous path, NUL-terminated suffix)
+            strip, pos = _read_varint(data, pos)
+            nul = data.index(b"\0", pos)
+            name = previous[:len(previous) - strip] + data[pos:nul]
+            pos = nul + 1
+        else:
+            nul = data.index(b"\0", pos)
+            name = data[pos:nul]
+            # Entries are NUL-padded to a multiple of 8 bytes
+            pos = start + ((nul - start) // 8 + 1) * 8
+        previous = name
+        if mode & 0o170000 == MODE_TREE:
+            # Sparse-index directory entry
+            return None
+        if (flags >> 12) & 3:
+            conflicted = True
+            continue
+        entries.append(IndexEntry(
+            path=name.decode("utf-8", "surrogateescape"),
+            mode=mode,
+            sha=sha,
+            mtime_ns=mtime_s * 10**9 + mtime_ns,
+            size=size,
+            skip_worktree=bool(extended & _SKIP_WORKTREE),
+            intent_to_add=bool(extended & _INTENT_TO_ADD),
+        ))
+    # Extensions follow as (signature, size, data); a split index keeps
+    # its entries in another file
+    end = len(data) - HASH_SIZE
+    while pos + 8 <= end:
+        signature, ext_size = struct.unpack_from(">4sI", data, pos)
+        if signature == b"link":
+            return None
+        pos += 8 + ext_size
+    return GitIndex(entries, conflicted)
@@ -0,0 +1,282 @@
+"""
+Live in-memory index of ContextKeep projects.
+
+The index holds one ProjectRecord per project directory and keeps a
+ready-sorted list next to it, so reading the project list is O(1).
+Writers (the filesystem watcher) update it incrementally. Alternate sort
+orders are built lazily and cached until the next change. A bounded log
+of recent changes lets subscribers catch up with a delta instead of a
+full snapshot.
+"""
+from bisect import bisect_left
+from collections import deque
+from pathlib import Path
+from threading import Lock
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+from modules.projects.records import ProjectRecord
+
+SortKey = Tuple
+
+# Recent per-project changes kept for changes_since()
+CHANGELOG_SIZE = 1024
+
+# project_dir -> (summary before, summary after); None means absent
+Changes = Dict[Path, Tuple[Optional[ProjectRecord], Optional[ProjectRecord]]]
+
+
+def sort_key(project_dir: Path, summary: ProjectRecord) -> SortKey:
+    """Case-insensitive project_name order, tie-broken by directory."""
+    return (summary.name_key, str(project_dir))
+
+
+# Key functions for every supported sort order. Each key ends with the
+# project directory so keys are unique and usable as pagination cursors.
+SORT_KEYS: Dict[str, Callable[[Path, ProjectRecord], SortKey]] = {
+    "project_name": sort_key,
+    "created_at": lambda d, s: (s.created_timestamp(), str(d)),
+    "repo_name": lambda d, s: (s.repo_name.lower(), str(d)),
+}
+
+
+class SortedView(NamedTuple):
+    """Projects in one sort order with their aligned sort keys."""
+    keys: List[SortKey]
+    items: List[ProjectRecord]
+
+
+class ProjectIndex:
+    """
+    Project summaries keyed by project directory, plus presorted views.
+    
+    The entry map and views are rebuilt copy-on-write on every change, so
+    anything returned by snapshot(), view() or entries() is never mutated
+    afterwards and readers need no lock. `version` increases on every effective change.
+    """
+    
+    def __init__(self):
+        self.live = False
+        self.version = 0
+        # Wall-clock time of the last effective change
+        self.changed_at = time.time()
+        self._entries: Dict[Path, ProjectRecord] = {}
+        self._by_name = SortedView([], [])
+        # sort name -> (version, view) for the lazily built orders
+        self._views: Dict[str, Tuple[int, SortedView]] = {}
+        # (version, project_dir, old, new) per change; versions before
+        # _log_floor are no longer fully covered
+        self._changelog: deque = deque(maxlen=CHANGELOG_SIZE)
+        self._log_floor = 0
+        self._lock = Lock()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def _bump(self) -> None:
+        self.version += 1
+        self.changed_at = time.time()
+    
+    def _log(self, changes: List[Tuple[Path, Optional[ProjectRecord], Optional[ProjectRecord]]]) -> None:
+        # Called after _bump(); all changes share the new version
+        if len(changes) > CHANGELOG_SIZE:
+            self._changelog.clear()
+            self._log_floor = self.version
+            return
+        for project_dir, old, new in changes:
+            if len(self._changelog) == CHANGELOG_SIZE:
+                self._log_floor = self._changelog[0][0]
+            self._changelog.append((self.version, project_dir, old, new))
+    
+    def snapshot(self) -> List[ProjectRecord]:
+        """
+        Current projects sorted alphabetically by project_name.
+        
+        The returned list is shared between callers and must not be modified.
+        """
+        return self._by_name.items
+    
+    def view(self, sort: str) -> SortedView:
+        """
+        Current projects in the given SORT_KEYS order (ascending).
+        
+        The project_name view is maintained incrementally; other orders are
+        sorted on first use after a change and then served from cache.
+        
+        Raises:
+            KeyError: If sort is not in SORT_KEYS
+        """
+        if sort == "project_name":
+            return self._by_name
+        key_fn = SORT_KEYS[sort]
+        
+        with self._lock:
+            cached = self._views.get(sort)
+            if cached is not None and cached[0] == self.version:
+                return cached[1]
+            ordered = sorted((key_fn(d, s), s) for d, s in self._entries.items())
+            view = SortedView([k for k, _ in ordered], [s for _, s in ordered])
+            self._views[sort] = (self.version, view)
+            return view
+    
+    def get(self, project_dir: Path) -> Optional[ProjectRecord]:
+        """Summary for project_dir, or None if it is not indexed."""
+        return self._entries.get(project_dir)
+    
+    def entries(self) -> Tuple[int, Dict[Path, ProjectRecord]]:
+        """
+        Current version and {project_dir: summary} mapping.
+        
+        The mapping is replaced, never mutated, on change; don't modify it.
+        """
+        with self._lock:
+            return self.version, self._entries
+    
+    def replace_all(self, entries: Dict[Path, ProjectRecord], presorted: bool = False) -> bool:
+        """
+        Replace the whole index with the result of a full scan.
+        
+        Args:
+            entries: {project_dir: summary}
+            presorted: entries already iterate in sort_key order (e.g. a
+                merge of sorted per-root scans), so no sort is needed
+        
+        Returns:
+            True if the contents changed.
+        """
+        with self._lock:
+            if entries.keys() == self._entries.keys() and all(
+                self._entries[d] is s for d, s in entries.items()
+            ):
+                return False
+            if presorted:
+                ordered = [(sort_key(d, s), s) for d, s in entries.items()]
+            else:
+                ordered = sorted((sort_key(d, s), s) for d, s in entries.items())
+            old_entries = self._entries
+            self._entries = dict(entries)
+            self._by_name = SortedView([k for k, _ in ordered], [s for _, s in ordered])
+            self._bump()
+            self._log([
+                (d, old_entries.get(d), entries.get(d))
+                for d in old_entries.keys() | entries.keys()
+                if old_entries.get(d) is not entries.get(d)
+            ])
+            return True
+    
+    def update(self, project_dir: Path, summary: Optional[ProjectRecord]) -> bool:
+        """
+        Insert, replace or (when summary is None) remove a single project.
+        
+        Returns:
+            True if the contents changed.
+        """
+        with self._lock:
+            old = self._entries.get(project_dir)
+            if old is summary:
+                return False
+            
+            entries = dict(self._entries)
+            keys = list(self._by_name.keys)
+            items = list(self._by_name.items)
+            if old is not None:
+                i = bisect_left(keys, sort_key(project_dir, old))
+                del keys[i]
+                del items[i]
+                del entries[project_dir]
+            if summary is not None:
+                key = sort_key(project_dir, summary)
+                i = bisect_left(keys, key)
+                keys.insert(i, key)
+                items.insert(i, summary)
+                entries[project_dir] = summary
+            
+            self._entries = entries
+            self._by_name = SortedView(keys, items)
+            self._bump()
+            self._log([(project_dir, old, summary)])
+            return True
+    
+    def update_many(self, changes: Dict[Path, Optional[ProjectRecord]]) -> bool:
+        """
+        Apply several update()s as one change (one copy, one version bump).
+        
+        Args:
+            changes: {project_dir: summary or None to remove}
+        
+        Returns:
+            True if the contents changed.
+        """
+        with self._lock:
+            effective = [
+                (d, self._entries.get(d), s)
+                for d, s in changes.items()
+                if self._entries.get(d) is not s
+            ]
+            if not effective:
+                return False
+            
+            entries = dict(self._entries)
+            for project_dir, _, summary in effective:
+                if summary is None:
+                    del entries[project_dir]
+                else:
+                    entries[project_dir] = summary
+            if len(effective) < 16:
+                keys = list(self._by_name.keys)
+                items = list(self._by_name.items)
+                for project_dir, old, summary in effective:
+                    if old is not None:
+                        i = bisect_left(keys, sort_key(project_dir, old))
+                        del keys[i]
+                        del items[i]
+                    if summary is not None:
+                        key = sort_key(project_dir, summary)
+                        i = bisect_left(keys, key)
+                        keys.insert(i, key)
+                        items.insert(i, summary)
+            else:
+                # One sort beats many list inserts for bulk changes
+                ordered = sorted((sort_key(d, s), s) for d, s in entries.items())
+                keys = [k for k, _ in ordered]
+                items = [s for _, s in ordered]
+            
+            self._entries = entries
+            self._by_name = SortedView(keys, items)
+            self._bump()
+            self._log(effective)
+            return True
+    
+    def clear(self) -> None:
+        """Empty the index and mark it as not live."""
+        with self._lock:
+            self.live = False
+            self._entries = {}
+            self._by_name = SortedView([], [])
+            self._views = {}
+            self._bump()
+            self._changelog.clear()
+            self._log_floor = self.version
+    
+    def changes_since(self, version: int) -> Tuple[int, Optional[Changes]]:
+        """
+        Net per-project changes between version and the current version.
+        
+        Several changes to one project are coalesced into (first old, last
+        new); projects that ended up unchanged are left out.
+        
+        Returns:
+            (current version, changes), where changes is None if version is
+            older than the change log reaches (or from the future) and the
+            caller has to fall back to a full snapshot.
+        """
+        with self._lock:
+            if version < self._log_floor or version > self.version:
+                return self.version, None
+            changes: Changes = {}
+            for entry_version, project_dir, old, new in reversed(self._changelog):
+                if entry_version <= version:
+                    break
+                first_old = old
+                last_new = changes[project_dir][1] if project_dir in changes else new
+                changes[project_dir] = (first_old, last_new)
+            return self.version, {d: c for d, c in changes.items() if c[0] is not c[1]}
@@ -3,7 +3,8 @@ Project models for ContextKeep.
 """
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import List
+from enum import Enum
+from typing import List, Optional
 
 
 class ProjectMetadata(BaseModel):
@@ -27,8 +28,94 @@ class ProjectSummary(BaseModel):
     created_at: datetime
 
 
+class ProjectSort(str, Enum):
+    """
+    Sort orders supported by GET /api/projects
+    """
+    project_name = "project_name"
+    created_at = "created_at"
+    repo_name = "repo_name"
+
+
 class ProjectListResponse(BaseModel):
     """
     API response for GET /api/projects
     """
-    projects: List[ProjectSummary] = Field(default_factory=list)
\ No newline at end of file
+    projects: List[ProjectSummary] = Field(default_factory=list)
+    next_cursor: Optional[str] = Field(default=None, description="Cursor for the next page, null on the last page")
+
+
+class ProjectSearchResult(BaseModel):
+    """
+    A single ranked search hit
+    """
+    project: ProjectSummary
+    score: float
+
+
+class ProjectSearchResponse(BaseModel):
+    """
+    API response for GET /api/projects/search
+    """
+    results: List[ProjectSearchResult] = Field(default_factory=list)
+
+
+class ProjectEntry(BaseModel):
+    """
+    A project together with its stable identifier (the directory name)
+    """
+    id: str
+    project: ProjectSummary
+
+
+class ProjectSnapshotEvent(BaseModel):
+    """
+    Stream event with the complete project list, sorted by project_name
+    """
+    projects: List[ProjectEntry] = Field(default_factory=list)
+
+
+class ProjectDeltaEvent(BaseModel):
+    """
+    Stream event with the projects changed since the previous event
+    """
+    added: List[ProjectEntry] = Field(default_factory=list)
+    updated: List[ProjectEntry] = Field(default_factory=list)
+    removed: List[str] = Field(default_factory=list, description="ids of removed projects")
+
+
+class GitCommit(BaseModel):
+    """
+    A commit, as shown in the expanded project view
+    """
+    sha: str
+    summary: str = Field(..., description="First line of the commit message")
+    author: str
+    committed_at: datetime
+
+
+class GitInfo(BaseModel):
+    """
+    Git state of a project's repository
+    """
+    branch: Optional[str] = Field(default=None, description="Checked-out branch, null when HEAD is detached")
+    head: Optional[str] = Field(default=None, description="Commit HEAD points to, null before the first commit")
+    dirty: Optional[bool] = Field(
+        default=None, description="Tracked files differ from HEAD (staged or not), null if unknown"
+    )
+    last_commit: Optional[GitCommit] = None
+
+
+class ProjectGitEntry(BaseModel):
+    """
+    Git state of one project, null if it is not a git repository
+    """
+    id: str
+    git: Optional[GitInfo] = None
+
+
+class ProjectGitResponse(BaseModel):
+    """
+    API response for GET /api/projects/git
+    """
+    projects: List[ProjectGitEntry] = Field(default_factory=list)
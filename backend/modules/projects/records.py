@@ -0,0 +1,99 @@
+"""
+Compact in-memory form of project summaries.
+
+The metadata cache, the project index, the roots and the catalog hold
+one ProjectRecord per project rather than a ProjectSummary model: a
+__slots__ object without per-instance __dict__ or Pydantic bookkeeping,
+with created_at kept as integer microseconds since the epoch (plus a
+shared timezone object), the repo name interned and the lowercased
+project name computed once for sorting. ProjectSummary models are built
+from records only at the API boundary (to_summary()).
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Tuple, Union
+import sys
+from pydantic import BaseModel
+from modules.projects.models import ProjectSummary
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_NAIVE_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+# UTC offset -> timezone shared by every record with that offset
+_zones: Dict[timedelta, timezone] = {timedelta(0): timezone.utc}
+
+
+def _encode_datetime(value: datetime) -> Tuple[int, Optional[timezone]]:
+    """(microseconds since the epoch, timezone or None if naive)."""
+    offset = value.utcoffset()
+    if offset is None:
+        return (value - _NAIVE_EPOCH) // _MICROSECOND, None
+    zone = _zones.get(offset)
+    if zone is None:
+        zone = _zones.setdefault(offset, timezone(offset))
+    return (value - _EPOCH) // _MICROSECOND, zone
+
+
+class ProjectRecord:
+    """
+    One project's summary fields, compactly. Treat as immutable.
+    
+    Exposes the same attributes as ProjectSummary (created_at is rebuilt
+    on access), so code reading summaries works on records unchanged.
+    """
+    
+    __slots__ = ("project_name", "repo_name", "description", "created_us", "created_tz", "name_key")
+    
+    def __init__(self, project_name: str, repo_name: str, description: str, created_at: datetime):
+        self.project_name = project_name
+        self.repo_name = sys.intern(repo_name)
+        self.description = description
+        self.created_us, self.created_tz = _encode_datetime(created_at)
+        # Sort key for the project_name order; shares the name if already lowercase
+        name_key = project_name.lower()
+        self.name_key = project_name if name_key == project_name else name_key
+    
+    @classmethod
+    def from_model(cls, model: BaseModel) -> "ProjectRecord":
+        """Record from a validated ProjectMetadata or ProjectSummary."""
+        return cls(model.project_name, model.repo_name, model.description, model.created_at)
+    
+    @property
+    def created_at(self) -> datetime:
+        if self.created_tz is None:
+            return _NAIVE_EPOCH + timedelta(microseconds=self.created_us)
+        return (_EPOCH + timedelta(microseconds=self.created_us)).astimezone(self.created_tz)
+    
+    def created_timestamp(self) -> float:
+        """created_at.timestamp(), without building the datetime for aware values."""
+        if self.created_tz is None:
+            return self.created_at.timestamp()
+        return self.created_us / 10**6
+    
+    def to_summary(self) -> ProjectSummary:
+        """The API model for this record."""
+        return ProjectSummary(
+            project_name=self.project_name,
+            repo_name=self.repo_name,
+            description=self.description,
+            created_at=self.created_at,
+        )
+    
+    def _fields(self) -> tuple:
+        return (self.project_name, self.repo_name, self.description, self.created_us, self.created_tz)
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ProjectRecord):
+            return NotImplemented
+        return self._fields() == other._fields()
+    
+    def __hash__(self) -> int:
+        return hash(self._fields())
+    
+    def __repr__(self) -> str:
+        return f"ProjectRecord(project_name={self.project_name!r}, repo_name={self.repo_name!r})"
+
+
+def to_summary(project: Union[ProjectRecord, ProjectSummary]) -> ProjectSummary:
+    """ProjectSummary for a record (summaries are passed through)."""
+    return project if isinstance(project, ProjectSummary) else project.to_summary()
@@ -0,0 +1,128 @@
+"""
+Project roots: the directories that contain project directories.
+
+settings.projects_base_dir is the primary root (the catalog and search
+index live there); settings.extra_projects_dirs adds more, e.g. an NFS
+export or an archive volume. Every root has its own metadata cache and
+loader pool and keeps the sorted result of its last scan, so a slow root
+neither evicts nor queues behind another root's work.
+
+With several roots, scans run concurrently on one thread per root and
+are waited for at most settings.root_scan_timeout. A root that doesn't
+answer in time contributes its last known projects; its hung scan is
+joined by later scans rather than started again. The per-root sorted
+lists are combined with a k-way merge of sorted runs, so a listing over
+k roots costs O(n log k) comparisons and roots that didn't change are
+not re-sorted. Project ids are directory names, so where several roots
+hold a project of the same name only the first root's one is listed,
+the one find_project_dir() resolves the id to.
+"""
+from concurrent.futures import Future, ThreadPoolExecutor
+from operator import itemgetter
+from pathlib import Path
+from threading import Lock, Thread
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from modules.projects.cache import MetadataCache
+from modules.projects.index import SortKey, sort_key
+from modules.projects.records import ProjectRecord
+
+# (sort key, project dir, summary), ordered by sort key
+SortedEntries = List[Tuple[SortKey, Path, ProjectRecord]]
+
+_first = itemgetter(0)
+
+
+class ProjectRoot:
+    """
+    One directory of projects, with its own cache and last scan result.
+    
+    Args:
+        path: Directory containing the project directories
+        cache: Metadata cache for the projects under path
+    """
+    
+    def __init__(self, path: Path, cache: MetadataCache):
+        self.path = path
+        self.cache = cache
+        # Result of the last completed scan, and the same sorted by sort_key
+        self.projects: Dict[Path, ProjectRecord] = {}
+        self.ordered: SortedEntries = []
+        # Directory names (project ids) of the last scan's projects
+        self.names: Set[str] = set()
+        self.scans = 0
+        self.timeouts = 0
+        self._pending: Optional[Future] = None
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pool_workers = 0
+        self._lock = Lock()
+    
+    def __repr__(self) -> str:
+        return f"ProjectRoot({str(self.path)!r}, {len(self.projects)} projects)"
+    
+    def pool(self, workers: int) -> ThreadPoolExecutor:
+        """This root's metadata loader pool, resized if settings changed."""
+        with self._lock:
+            if self._pool is None or self._pool_workers != workers:
+                if self._pool is not None:
+                    self._pool.shutdown(wait=False)
+                self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="metadata")
+                self._pool_workers = workers
+            return self._pool
+    
+    def store(self, projects: Dict[Path, ProjectRecord]) -> None:
+        """Record a completed scan; the sorted list is only rebuilt if something changed."""
+        if projects.keys() != self.projects.keys() or any(self.projects[d] is not s for d, s in projects.items()):
+            self.ordered = sorted(((sort_key(d, s), d, s) for d, s in projects.items()), key=_first)
+            self.names = {d.name for d in projects}
+        self.projects = projects
+        self.scans += 1
+    
+    def scan(self, scan: Callable[["ProjectRoot"], Dict[Path, ProjectRecord]]) -> Dict[Path, ProjectRecord]:
+        """Run scan(self) in the calling thread and store the result."""
+        self.store(scan(self))
+        return self.projects
+    
+    def scan_async(self, scan: Callable[["ProjectRoot"], Dict[Path, ProjectRecord]]) -> Future:
+        """
+        Run scan(self) on a daemon thread and store the result.
+        
+        If a scan of this root is still running (e.g. stuck on a hung
+        mount), its future is returned instead of starting another one.
+        """
+        with self._lock:
+            if self._pending is not None and not self._pending.done():
+                return self._pending
+            future = self._pending = Future()
+        
+        def run():
+            try:
+                future.set_result(self.scan(scan))
+            except BaseException as e:
+                future.set_exception(e)
+        
+        # Daemon thread, so a scan stuck in the kernel can't block exit
+        Thread(target=run, name=f"project-root-scan:{self.path.name}", daemon=True).start()
+        return future
+
+
+def merge_roots(roots: Iterable[ProjectRoot]) -> Dict[Path, ProjectRecord]:
+    """
+    Last scan results of all roots as one mapping in sort_key order.
+    
+    Roots are given in configured order; a project whose directory name
+    an earlier root already holds is left out, so every id is listed once.
+    """
+    merged: SortedEntries = []
+    names: Set[str] = set()
+    for root in roots:
+        shadowed = names & root.names
+        if shadowed:
+            merged.extend(entry for entry in root.ordered if entry[1].name not in shadowed)
+        else:
+            merged.extend(root.ordered)
+        names |= root.names
+    # list.sort() finds the k presorted runs and merges them pairwise in
+    # C: the same O(n log k) merge as heapq.merge(), at about half the
+    # cost (see benchmarks/bench_roots.py)
+    merged.sort(key=_first)
+    return {project_dir: summary for _, project_dir, summary in merged}
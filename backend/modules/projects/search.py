@@ -0,0 +1,310 @@
+"""
+Inverted index for project search.
+
+Indexes project_name, repo_name and description. Every query token is
+matched as a prefix (typeahead), results must match all tokens and are
+ranked by field weight, with exact term matches scoring higher than
+prefix matches. The index is kept in sync with a ProjectIndex
+incrementally and can be persisted as a compressed file.
+"""
+from bisect import bisect_left
+from pathlib import Path
+from threading import Lock
+from typing import Dict, List, Mapping, Optional, Set, Tuple
+import gzip
+import heapq
+import json
+import os
+import re
+from modules.projects.records import ProjectRecord
+
+FORMAT_VERSION = 2
+
+# Field weights; a term's weight for a document is its best field
+NAME_WEIGHT = 3
+REPO_WEIGHT = 2
+DESCRIPTION_WEIGHT = 1
+EXACT_BONUS = 2
+
+# Prefixes this short are answered from merged, incrementally maintained
+# layers instead of walking every matching term (the typeahead worst case)
+CACHED_PREFIX_LENGTH = 2
+
+_WORD_RE = re.compile(r"[A-Za-z0-9]+")
+_PART_RE = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+")
+
+# (project_name, repo_name, description) - what a document was built from
+Fingerprint = Tuple[str, str, str]
+
+# score -> docs matching a query token with that score
+Layers = Dict[int, Set[str]]
+
+
+def tokenize(text: str) -> Set[str]:
+    """
+    Lowercased search terms for text.
+    
+    Whole words are kept and camelCase / letter-digit runs are split too,
+    so "WeatherAPI" yields {"weatherapi", "weather", "api"}.
+    """
+    terms = set()
+    for word in _WORD_RE.findall(text):
+        terms.add(word.lower())
+        terms.update(part.lower() for part in _PART_RE.findall(word))
+    return terms
+
+
+def _term_weights(fingerprint: Fingerprint) -> Dict[str, int]:
+    weights: Dict[str, int] = {}
+    for text, weight in zip(fingerprint, (NAME_WEIGHT, REPO_WEIGHT, DESCRIPTION_WEIGHT)):
+        for term in tokenize(text):
+            if weights.get(term, 0) < weight:
+                weights[term] = weight
+    return weights
+
+
+def _add_to_layers(layers: Layers, score: int, doc: str) -> None:
+    docs = layers.get(score)
+    if docs is None:
+        layers[score] = {doc}
+    else:
+        docs.add(doc)
+
+
+class SearchIndex:
+    """Incremental inverted index over project summaries. Thread-safe."""
+    
+    def __init__(self):
+        self._docs: Dict[str, Fingerprint] = {}
+        # term -> weight -> docs; grouping by weight lets queries merge whole
+        # posting sets with C-level set/dict operations
+        self._postings: Dict[str, Layers] = {}
+        self._terms: List[str] = []
+        self._terms_dirty = False
+        # short prefix -> merged layers over all terms with that prefix
+        self._prefixes: Dict[str, Layers] = {}
+        self._synced_version: Optional[int] = None
+        # Bumped on every content change; compared against the saved one
+        self._generation = 0
+        self._saved_generation = 0
+        self._lock = Lock()
+        # Held for a whole save(), so concurrent saves don't interleave
+        self._save_lock = Lock()
+    
+    def __len__(self) -> int:
+        return len(self._docs)
+    
+    @property
+    def dirty(self) -> bool:
+        """True if the index changed since it was last saved or loaded."""
+        return self._generation != self._saved_generation
+    
+    def _add(self, doc: str, fingerprint: Fingerprint) -> None:
+        for term, weight in _term_weights(fingerprint).items():
+            posting = self._postings.get(term)
+            if posting is None:
+                posting = self._postings[term] = {}
+                self._terms_dirty = True
+            _add_to_layers(posting, weight, doc)
+            for n in range(1, min(len(term), CACHED_PREFIX_LENGTH) + 1):
+                bonus = EXACT_BONUS if n == len(term) else 1
+                _add_to_layers(self._prefixes.setdefault(term[:n], {}), weight * bonus, doc)
+        self._docs[doc] = fingerprint
+    
+    def _remove(self, doc: str) -> None:
+        fingerprint = self._docs.pop(doc, None)
+        if fingerprint is None:
+            return
+        # A removed doc loses all its terms, so it leaves every layer of
+        # every short prefix of those terms as well
+        for term in _term_weights(fingerprint):
+            prefixes = [term[:n] for n in range(1, min(len(term), CACHED_PREFIX_LENGTH) + 1)]
+            for layers in [self._postings.get(term)] + [self._prefixes.get(p) for p in prefixes]:
+                if layers is None:
+                    continue
+                for score, docs in list(layers.items()):
+                    docs.discard(doc)
+                    if not docs:
+                        del layers[score]
+            if term in self._postings and not self._postings[term]:
+                del self._postings[term]
+                self._terms_dirty = True
+    
+    def sync(self, version: int, entries: Mapping[Path, ProjectRecord]) -> int:
+        """
+        Bring the index in line with a ProjectIndex snapshot.
+        
+        Only documents whose indexed fields changed are re-tokenized; nothing
+        happens when version matches the last synced version.
+        
+        Args:
+            version: ProjectIndex.version the entries belong to
+            entries: {project_dir: summary} for every current project
+        
+        Returns:
+            Number of documents added, updated or removed.
+        """
+        with self._lock:
+            if version == self._synced_version:
+                return 0
+            current = {
+                str(d): (s.project_name, s.repo_name, s.description)
+                for d, s in entries.items()
+            }
+            changed = 0
+            for doc in self._docs.keys() - current.keys():
+                self._remove(doc)
+                changed += 1
+            for doc, fingerprint in current.items():
+                if self._docs.get(doc) != fingerprint:
+                    self._remove(doc)
+                    self._add(doc, fingerprint)
+                    changed += 1
+            self._synced_version = version
+            if changed:
+                self._generation += 1
+            return changed
+    
+    def _layers(self, token: str) -> Layers:
+        """Documents matching token as a prefix, grouped by score."""
+        if len(token) <= CACHED_PREFIX_LENGTH:
+            return self._prefixes.get(token, {})
+        
+        lo = bisect_left(self._terms, token)
+        hi = bisect_left(self._terms, token + "\uffff", lo)
+        merged: Layers = {}
+        for term in self._terms[lo:hi]:
+            bonus = EXACT_BONUS if term == token else 1
+            for weight, docs in self._postings[term].items():
+                layer = merged.get(weight * bonus)
+                if layer is None:
+                    merged[weight * bonus] = set(docs)
+                else:
+                    layer |= docs
+        return merged
+    
+    def search(self, query: str, limit: int = 20) -> List[Tuple[str, float]]:
+        """
+        Ranked documents matching every token of query as a prefix.
+        
+        A document's score is the sum over query tokens of its best
+        (field weight x exact-match bonus); ties are broken by doc id.
+        
+        Returns:
+            Up to limit (doc, score) pairs, best first.
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        
+        with self._lock:
+            if self._terms_dirty:
+                self._terms = sorted(self._postings)
+                self._terms_dirty = False
+            matched = [self._layers(token) for token in tokens]
+            if not all(matched):
+                return []
+            
+            if len(matched) == 1:
+                layers = matched[0]
+            else:
+                # Most selective token first, so later tokens only look at
+                # the surviving candidates
+                matched.sort(key=lambda token_layers: sum(len(docs) for docs in token_layers.values()))
+                scores: Dict[str, float] = {}
+                for n, token_layers in enumerate(matched):
+                    candidates = set(scores) if n else None
+                    token_scores: Dict[str, float] = {}
+                    # Ascending score order leaves each doc with its best score
+                    for score in sorted(token_layers):
+                        docs = token_layers[score]
+                        if candidates is not None:
+                            docs = docs & candidates
+                        token_scores.update(dict.fromkeys(docs, score))
+                    scores = {doc: scores.get(doc, 0) + s for doc, s in token_scores.items()}
+                    if not scores:
+                        return []
+                layers = {}
+                for doc, score in scores.items():
+                    _add_to_layers(layers, score, doc)
+            
+            # Walk from the best score down; a doc counts only in its best layer
+            results: List[Tuple[str, float]] = []
+            seen: Set[str] = set()
+            for score in sorted(layers, reverse=True):
+                docs = layers[score]
+                for doc in heapq.nsmallest(limit - len(results), docs - seen):
+                    results.append((doc, score))
+                if len(results) >= limit:
+                    break
+                seen |= docs
+            return results
+    
+    def save(self, path: Path) -> None:
+        """Persist the index atomically as gzip-compressed JSON."""
+        with self._save_lock:
+            with self._lock:
+                docs = list(self._docs)
+                doc_ids = {doc: i for i, doc in enumerate(docs)}
+                payload = {
+                    "version": FORMAT_VERSION,
+                    "docs": [[doc, *self._docs[doc]] for doc in docs],
+                    "postings": {
+                        term: {weight: [doc_ids[doc] for doc in members] for weight, members in posting.items()}
+                        for term, posting in self._postings.items()
+                    },
+                }
+                generation = self._generation
+            
+            # Unique per save: other processes may save the same file
+            tmp = path.with_name(f".{path.name}.{os.urandom(4).hex()}.tmp")
+            try:
+                with gzip.open(tmp, "wt", encoding="utf-8", compresslevel=6) as f:
+                    json.dump(payload, f, separators=(",", ":"))
+                os.replace(tmp, path)
+            except BaseException:
+                try:
+                    os.unlink(tmp)
+                except FileNotFoundError:
+                    pass
+                raise
+            self._saved_generation = generation
+    
+    def load(self, path: Path) -> bool:
+        """
+        Replace the index contents with a persisted copy.
+        
+        Returns:
+            False (leaving the index untouched) if the file is missing,
+            unreadable or from another format version.
+        """
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                payload = json.load(f)
+            if payload.get("version") != FORMAT_VERSION:
+                return False
+            docs = [(row[0], tuple(row[1:4])) for row in payload["docs"]]
+            postings = {
+                term: {int(weight): {docs[i][0] for i in ids} for weight, ids in posting.items()}
+                for term, posting in payload["postings"].items()
+            }
+        except (OSError, ValueError, KeyError, IndexError, TypeError):
+            return False
+        
+        # Short-prefix layers are derived data; rebuild them from the postings
+        prefixes: Dict[str, Layers] = {}
+        for term, posting in postings.items():
+            for n in range(1, min(len(term), CACHED_PREFIX_LENGTH) + 1):
+                bonus = EXACT_BONUS if n == len(term) else 1
+                layers = prefixes.setdefault(term[:n], {})
+                for weight, members in posting.items():
+                    layers.setdefault(weight * bonus, set()).update(members)
+        
+        with self._lock:
+            self._docs = dict(docs)
+            self._postings = postings
+            self._prefixes = prefixes
+            self._terms_dirty = True
+            self._synced_version = None
+            self._saved_generation = self._generation
+        return True
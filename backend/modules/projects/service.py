@@ -3,53 +3,988 @@ Project business logic.
 
 This module handles project discovery and metadata management.
 """
+from bisect import bisect_left, bisect_right
+from collections import deque
+from datetime import datetime
+from functools import partial
 from pathlib import Path
-from typing import List
+from queue import Full, Queue
+from threading import Event, Lock, Thread
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Mapping, Optional, Tuple, Union
+import base64
+import hashlib
 import json
-from modules.files.service import list_directories, read_json_file
-from modules.projects.models import ProjectMetadata, ProjectSummary
+import logging
+import os
+import time
+from modules.files.cache import content_cache
+from modules.files.service import WriteBatch, list_directories, read_json_file, file_stamp
+from modules.metrics.service import registry, span
+from modules.projects.cache import MetadataCache, MISS
+from modules.projects.index import ProjectIndex, SortKey, sort_key
+from modules.projects.models import (
+    ProjectDeltaEvent,
+    ProjectEntry,
+    ProjectListResponse,
+    ProjectMetadata,
+    ProjectSearchResult,
+    ProjectSnapshotEvent,
+    ProjectSort,
+)
+from modules.projects.records import ProjectRecord
+from modules.projects.roots import ProjectRoot, merge_roots
+from modules.projects.search import SearchIndex
+from modules.projects.singleflight import SingleFlight
 from config import settings
 
+# The watcher (ctypes, inotify) and the catalog (sqlite3) are imported on
+# first use to keep them off the import path of the API process
+if TYPE_CHECKING:
+    from modules.projects.shared import SharedIndex
+    from modules.projects.watcher import ProjectWatcher
 
-def list_projects() -> List[ProjectSummary]:
+logger = logging.getLogger(__name__)
+
+# Parsed project.json files, re-validated against their file stamps
+metadata_cache = MetadataCache(max_entries=settings.metadata_cache_size)
+
+VALIDATION_FAILURES = registry.counter(
+    "contextkeep_metadata_validation_failures_total", "project.json files that are malformed or fail validation"
+)
+READ_ERRORS = registry.counter(
+    "contextkeep_metadata_read_errors_total", "project.json files that exist but could not be read"
+)
+ROOT_SCAN_TIMEOUTS = registry.counter(
+    "contextkeep_root_scan_timeouts_total", "Project root scans not finished within root_scan_timeout"
+)
+ROOT_SCAN_ERRORS = registry.counter(
+    "contextkeep_root_scan_errors_total", "Project root scans that failed"
+)
+registry.callback(
+    "contextkeep_metadata_cache_hits_total", "Metadata cache hits", lambda: metadata_cache.hits, kind="counter"
+)
+registry.callback(
+    "contextkeep_metadata_cache_misses_total", "Metadata cache misses", lambda: metadata_cache.misses, kind="counter"
+)
+
+# Live index maintained by the background watcher (see start_watching)
+project_index = ProjectIndex()
+
+# Distinguishes index versions of this process from those of earlier runs
+_BOOT_ID = os.urandom(6).hex()
+_watchers: List["ProjectWatcher"] = []
+
+# Concurrent refreshes share one scan; _scanned_at is when the last one finished
+_scan_flight = SingleFlight()
+_scanned_at: Optional[float] = None
+
+# Loaded projects a streaming listing (iter_projects) holds for its reader
+STREAM_BUFFER = 256
+_STREAM_END = object()
+
+# Roots by path (see project_roots); each has its own cache and loader pool
+_roots: Dict[Path, ProjectRoot] = {}
+_roots_lock = Lock()
+
+# Full-text index over the project index, persisted next to the projects
+SEARCH_INDEX_FILE = ".contextkeep-search.idx"
+SEARCH_SAVE_INTERVAL = 30.0
+search_index = SearchIndex()
+_search_saved_at = 0.0
+_search_loaded = False
+_search_load_lock = Lock()
+
+# Persisted snapshot of the index for fast cold starts
+CATALOG_FILE = ".contextkeep-catalog.db"
+_catalog_version: Optional[int] = None
+
+# Index shared between worker processes (see start_shared_index)
+SHARED_INDEX_FILE = ".contextkeep-shared.db"
+_shared: Optional["SharedIndex"] = None
+_shared_thread: Optional[Thread] = None
+_shared_stop = Event()
+registry.callback(
+    "contextkeep_shared_index_scanner", "1 if this worker is the elected project scanner",
+    lambda: int(_shared is not None and _shared.is_scanner),
+)
+registry.callback(
+    "contextkeep_shared_index_version", "Shared index version this worker last published or applied",
+    lambda: (_shared.version or 0) if _shared is not None else 0,
+)
+registry.callback("contextkeep_worker_pid", "Process id of the worker serving this scrape", os.getpid)
+
+
+def metadata_path(project_dir: Path) -> Path:
+    """Location of a project's metadata file."""
+    return project_dir / ".contextkeep" / "project.json"
+
+
+def project_roots() -> List[ProjectRoot]:
+    """
+    The configured project roots, primary (projects_base_dir) first.
+    
+    Roots persist across calls while they stay configured; the primary
+    root uses the module-level metadata_cache.
+    """
+    global _roots
+    paths = settings.project_roots()
+    with _roots_lock:
+        roots = {}
+        for i, path in enumerate(paths):
+            root = _roots.get(path)
+            if root is None or (root.cache is metadata_cache) != (i == 0):
+                root = ProjectRoot(path, metadata_cache if i == 0 else MetadataCache(settings.metadata_cache_size))
+            roots[path] = root
+        _roots = roots
+        return list(roots.values())
+
+
+def find_project_dir(project_id: str) -> Path:
+    """
+    Directory of a project, by its id (the directory name).
+    
+    Project roots are tried in order, so the primary root wins if two
+    roots have a project directory of the same name.
+    
+    Raises:
+        ValueError: For ids that are not a plain directory name
+    """
+    if not project_id or project_id in (".", "..") or "/" in project_id or "\\" in project_id:
+        raise ValueError("Invalid project id")
+    if settings.extra_projects_dirs:
+        for base_dir in settings.project_roots():
+            if (base_dir / project_id).is_dir():
+                return base_dir / project_id
+    return settings.projects_base_dir / project_id
+
+
+def _cache_for(project_dir: Path) -> MetadataCache:
+    """Metadata cache of the root containing project_dir."""
+    for root in project_roots():
+        if root.path == project_dir.parent:
+            return root.cache
+    return metadata_cache
+
+
+def load_project(project_dir: Path, cache: Optional[MetadataCache] = None) -> Optional[ProjectRecord]:
+    """
+    Load the summary for a single project directory.
+    
+    Uses the metadata cache when the project.json stamp is unchanged.
+    
+    Args:
+        project_dir: Project directory under one of the project roots
+        cache: Metadata cache to use (defaults to metadata_cache)
+    
+    Returns:
+        ProjectRecord, or None if the directory has no valid metadata.
+    """
+    if cache is None:
+        cache = metadata_cache
+    metadata_file = metadata_path(project_dir)
+    stamp = file_stamp(metadata_file)
+    if stamp is None:
+        cache.discard(metadata_file)
+    else:
+        cached = cache.get(metadata_file, stamp)
+        if cached is not MISS:
+            return cached
+    
+    try:
+        # Parsed and validated with Pydantic straight from the file bytes
+        metadata = read_json_file(metadata_file, ProjectMetadata)
+        
+        summary = ProjectRecord.from_model(metadata)
+    except FileNotFoundError:
+        # Not a ContextKeep project (or removed while scanning)
+        summary = None
+    except ValueError as e:
+        # Malformed JSON (JSONDecodeError) or failed validation (ValidationError)
+        VALIDATION_FAILURES.inc()
+        logger.debug("Invalid project metadata in %s: %s", metadata_file, e)
+        summary = None
+    except Exception:
+        READ_ERRORS.inc()
+        logger.debug("Could not read project metadata %s", metadata_file, exc_info=True)
+        summary = None
+    
+    if stamp is not None:
+        cache.put(metadata_file, stamp, summary)
+    return summary
+
+
+def _decode_document(data: bytes) -> str:
+    return data.decode("utf-8", errors="replace")
+
+
+def context_documents(project_dir: Path) -> Dict[str, str]:
+    """
+    Text of every context document under a project's .contextkeep/ directory.
+    
+    Documents are read through the shared content cache, so assembling
+    the same context again reads (and decodes) only files that changed,
+    and documents shared between projects are held once. Dotfiles (e.g.
+    in-flight atomic writes) are skipped.
+    
+    Returns:
+        {path relative to .contextkeep/ ('/'-separated): text}, sorted by path.
+    """
+    documents = {}
+    
+    def walk(directory: str, prefix: str) -> None:
+        # Plain scandir over str paths; pathlib costs more than the cached reads
+        try:
+            entries = list(os.scandir(directory))
+        except (FileNotFoundError, NotADirectoryError):
+            return
+        for entry in entries:
+            if entry.name.startswith("."):
+                continue
+            if entry.is_dir():
+                walk(entry.path, f"{prefix}{entry.name}/")
+                continue
+            try:
+                documents[prefix + entry.name] = content_cache.load(entry.path, _decode_document)
+            except FileNotFoundError:
+                # Removed while walking
+                continue
+    
+    with span("context"):
+        walk(os.path.join(project_dir, ".contextkeep"), "")
+    return dict(sorted(documents.items()))
+
+
+def write_projects_metadata(items: Mapping[Path, ProjectMetadata], durable: bool = True) -> Dict[Path, ProjectRecord]:
+    """
+    Write project.json for several projects as one batch.
+    
+    Every file is replaced atomically and the batch costs one directory
+    fsync per directory. The new summaries go straight into the metadata
+    cache (keyed by the written files' stamps) and, for projects under
+    a project root, into the project index, so nothing is re-read.
+    
+    Args:
+        items: {project_dir: metadata}
+        durable: fsync files and directories before returning
+    
+    Returns:
+        {project_dir: summary} for the written projects.
+    """
+    with span("write_metadata"):
+        with WriteBatch(durable=durable) as batch:
+            for project_dir, metadata in items.items():
+                batch.write(metadata_path(project_dir), metadata)
+        
+        summaries = {}
+        for project_dir, metadata in items.items():
+            summary = ProjectRecord.from_model(metadata)
+            cache = _cache_for(project_dir)
+            cache.put(metadata_path(project_dir), batch.stamps[metadata_path(project_dir)], summary)
+            summaries[project_dir] = summary
+        
+        roots = set(settings.project_roots())
+        project_index.update_many({d: _visible(d, s) for d, s in summaries.items() if d.parent in roots})
+        return summaries
+
+
+def write_project_metadata(project_dir: Path, metadata: ProjectMetadata, durable: bool = True) -> ProjectRecord:
+    """Write one project's project.json; see write_projects_metadata()."""
+    return write_projects_metadata({project_dir: metadata}, durable)[project_dir]
+
+
+def _load_all(root: ProjectRoot, project_dirs: List[Path]) -> Iterator[Optional[ProjectRecord]]:
+    """
+    Summaries of project_dirs, in order, loaded on root's pool.
+    
+    At most twice as many loads as there are workers are in flight, so
+    the results waiting to be consumed do not grow with the project count.
+    """
+    workers = settings.metadata_workers
+    load = partial(load_project, cache=root.cache)
+    if workers <= 1 or len(project_dirs) <= 1:
+        yield from map(load, project_dirs)
+        return
+    
+    pool = root.pool(workers)
+    pending = deque()
+    try:
+        for project_dir in project_dirs:
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+            pending.append(pool.submit(load, project_dir))
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def _visible(project_dir: Path, summary: Optional[ProjectRecord]) -> Optional[ProjectRecord]:
+    """
+    Summary to index for project_dir after it changed, one project per id.
+    
+    As in merge_roots(), the first root holding a project of a name wins:
+    the projects of that name under the other roots are removed from (or
+    put back into) project_index here, and summary is only returned if
+    project_dir's root is the first.
+    """
+    roots = project_roots()
+    if len(roots) == 1:
+        return summary
+    found, result = False, None
+    for root in roots:
+        candidate = root.path / project_dir.name
+        record = summary if candidate == project_dir else load_project(candidate, root.cache)
+        visible = None if found else record
+        found = found or record is not None
+        if candidate == project_dir:
+            result = visible
+        else:
+            project_index.update(candidate, visible)
+    return result
+
+
+def _load_watched(project_dir: Path, cache: MetadataCache) -> Optional[ProjectRecord]:
+    """load_project() for a watcher event, see _visible()."""
+    return _visible(project_dir, load_project(project_dir, cache))
+
+
+def _scan_root(
+    root: ProjectRoot, on_load: Optional[Callable[[ProjectRecord], None]] = None
+) -> Dict[Path, ProjectRecord]:
+    project_dirs = list_directories(root.path)
+    projects = {}
+    for project_dir, summary in zip(project_dirs, _load_all(root, project_dirs)):
+        if summary is not None:
+            projects[project_dir] = summary
+            if on_load is not None:
+                on_load(summary)
+    
+    # Drop cache entries for projects that no longer exist
+    root.cache.retain(metadata_path(d) for d in project_dirs)
+    return projects
+
+
+def scan_projects(on_load: Optional[Callable[[ProjectRecord], None]] = None) -> Dict[Path, ProjectRecord]:
+    """
+    Scan every project root for valid projects.
+    
+    Metadata files are loaded concurrently on a pool of
+    settings.metadata_workers threads per root (1 = sequential), which
+    hides per-file latency on network storage. Unchanged metadata files
+    are served from the root's metadata cache; entries for removed
+    projects are evicted.
+    
+    With several roots, each is scanned on its own thread and waited for
+    at most settings.root_scan_timeout; a root that times out or fails
+    contributes the projects of its last completed scan. The sorted
+    per-root results are combined with a k-way merge.
+    
+    Args:
+        on_load: With a single root, called with each valid summary as
+            soon as it is loaded, in discovery order
+    
+    Returns:
+        Dict mapping project directory to ProjectRecord, in sort_key
+        order (pass presorted=True to ProjectIndex.replace_all).
+        Projects without valid metadata are silently skipped.
+    """
+    roots = project_roots()
+    
+    with span("scan"):
+        if len(roots) == 1:
+            roots[0].scan(partial(_scan_root, on_load=on_load))
+        else:
+            started = time.monotonic()
+            pending = [(root, root.scan_async(_scan_root)) for root in roots]
+            for root, future in pending:
+                remaining = settings.root_scan_timeout - (time.monotonic() - started)
+                try:
+                    future.result(timeout=max(remaining, 0))
+                except TimeoutError:
+                    root.timeouts += 1
+                    ROOT_SCAN_TIMEOUTS.inc()
+                    logger.warning("Scan of %s timed out, serving its last known projects", root.path)
+                except Exception:
+                    ROOT_SCAN_ERRORS.inc()
+                    logger.warning("Scan of %s failed, serving its last known projects", root.path, exc_info=True)
+        return merge_roots(roots)
+
+
+def _rescan(on_load: Optional[Callable[[ProjectRecord], None]] = None) -> Dict[Path, ProjectRecord]:
+    """
+    Scan all roots into project_index; returns the scan result.
+    
+    Every full scan runs through here under the single-flight key "scan",
+    so request-driven scans and watcher rescans can join each other.
+    on_load is passed on to scan_projects().
+    """
+    global _scanned_at
+    projects = scan_projects(on_load)
+    project_index.replace_all(projects, presorted=True)
+    _scanned_at = time.monotonic()
+    return projects
+
+
+def _log_scan_error(error: BaseException) -> None:
+    logger.warning("Background project scan failed", exc_info=error)
+
+
+def refresh_projects() -> ProjectIndex:
+    """
+    Bring project_index up to date and return it.
+    
+    A no-op while the watcher keeps the index live; otherwise runs a scan
+    (cheap for unchanged projects thanks to the metadata cache).
+    Concurrent callers share a single in-flight scan. Within
+    settings.scan_stale_seconds of the last scan the index is returned
+    as is; once it is older than settings.scan_fresh_seconds, a background
+    scan revalidates it (at most one at a time).
+    """
+    if project_index.live:
+        return project_index
+    
+    stale_for = settings.scan_stale_seconds
+    age = None if _scanned_at is None else time.monotonic() - _scanned_at
+    if stale_for > 0 and age is not None and age < stale_for:
+        if age >= settings.scan_fresh_seconds:
+            _scan_flight.start("scan", _rescan, name="project-revalidate", on_error=_log_scan_error)
+        return project_index
+    
+    _scan_flight.do("scan", _rescan)
+    return project_index
+
+
+def list_projects() -> List[ProjectRecord]:
     """
     List all valid ContextKeep projects.
     
-    Scans the projects_base_dir for directories containing valid
-    .contextkeep/project.json files.
+    Served straight from the live project index while the watcher is
+    running; otherwise scans the project roots for directories
+    containing valid .contextkeep/project.json files first.
     
     Returns:
-        List of ProjectSummary objects, sorted alphabetically by project_name.
+        List of ProjectRecord objects, sorted alphabetically by project_name
+        (case-insensitive). The list is shared and must not be modified.
         Projects without valid metadata are silently skipped.
     """
-    projects_dir = settings.projects_base_dir
+    return refresh_projects().snapshot()
+
+
+def iter_projects() -> Iterator[ProjectRecord]:
+    """
+    Generator version of list_projects().
     
-    # Get all project directories
-    project_dirs = list_directories(projects_dir)
+    Served from the live index (in project_name order) while the watcher
+    is running. Otherwise the scan runs through the single-flight path on
+    a background thread and each project is yielded as soon as its
+    metadata is loaded, in discovery order; at most STREAM_BUFFER loaded
+    projects wait for the reader. project_index is updated when the scan
+    completes. With several project roots, or when a scan is already
+    running, that scan completes first and projects are yielded in
+    project_name order.
     
-    projects = []
-    for project_dir in project_dirs:
+    Yields:
+        ProjectRecord for every valid project.
+    """
+    if project_index.live:
+        yield from project_index.snapshot()
+        return
+    
+    if len(project_roots()) > 1:
+        yield from _scan_flight.do("scan", _rescan).values()
+        return
+    
+    loaded: Queue = Queue(maxsize=STREAM_BUFFER)
+    abandoned = Event()
+    failure: List[BaseException] = []
+    
+    def put(item: object) -> None:
+        # Stop feeding a reader that went away, the scan itself still completes
+        while not abandoned.is_set():
+            try:
+                loaded.put(item, timeout=0.1)
+                return
+            except Full:
+                pass
+    
+    def scan() -> Dict[Path, ProjectRecord]:
         try:
-            # Look for .contextkeep/project.json
-            metadata_file = project_dir / ".contextkeep" / "project.json"
-            metadata_dict = read_json_file(metadata_file)
-            
-            # Parse and validate with Pydantic
-            metadata = ProjectMetadata(**metadata_dict)
-            
-            # Add to results
-            projects.append(ProjectSummary(
-                project_name=metadata.project_name,
-                repo_name=metadata.repo_name,
-                description=metadata.description,
-                created_at=metadata.created_at
-            ))
-            
-        except (FileNotFoundError, json.JSONDecodeError, Exception):
-            # Skip invalid projects silently
+            return _rescan(on_load=put)
+        except BaseException as e:
+            failure.append(e)
+            raise
+        finally:
+            put(_STREAM_END)
+    
+    if not _scan_flight.start("scan", scan, name="project-stream", on_error=_log_scan_error):
+        yield from _scan_flight.do("scan", _rescan).values()
+        return
+    
+    try:
+        while (item := loaded.get()) is not _STREAM_END:
+            yield item
+    finally:
+        abandoned.set()
+    if failure:
+        raise failure[0]
+
+
+def projects_etag() -> Tuple[str, float]:
+    """
+    Cheap version token for the current project list.
+    
+    While the index is live this is O(1) (boot id + index version, or
+    with the shared index the published version, so every worker gives
+    the same tag for the same projects). Otherwise it hashes the stamps
+    of every project.json under every project root, which costs one stat
+    per project but no reads or validation.
+    
+    Returns:
+        (etag, last_modified) where etag is a quoted entity tag and
+        last_modified a Unix timestamp.
+    """
+    if project_index.live:
+        return f'"{_version_tag(project_index.version)}"', project_index.changed_at
+    
+    with span("etag"):
+        digest = hashlib.blake2b(digest_size=12)
+        last_modified = 0.0
+        for projects_dir in settings.project_roots():
+            digest.update(f"{projects_dir}\0".encode("utf-8"))
+            base_stamp = file_stamp(projects_dir)
+            if base_stamp is not None:
+                last_modified = max(last_modified, base_stamp[0] / 1e9)
+            for project_dir in sorted(list_directories(projects_dir)):
+                stamp = file_stamp(metadata_path(project_dir))
+                digest.update(f"{project_dir.name}\0{stamp}\n".encode("utf-8"))
+                if stamp is not None:
+                    last_modified = max(last_modified, stamp[0] / 1e9)
+    return f'"{digest.hexdigest()}"', last_modified
+
+
+def _version_tag(version: int) -> str:
+    """
+    "<id>-<version>" for an index version: the shared database's epoch
+    and published version if the index holds one, else the boot id and
+    the local version.
+    """
+    shared = _shared
+    if shared is not None:
+        published = shared.shared_version(version)
+        if published is not None:
+            return f"{shared.epoch:012x}-{published}"
+    return f"{_BOOT_ID}-{version}"
+
+
+def event_id(version: int) -> str:
+    """Server-sent event id for an index version."""
+    return _version_tag(version)
+
+
+def parse_event_id(value: Optional[str]) -> Optional[int]:
+    """
+    Index version from a Last-Event-ID header.
+    
+    Ids naming a published version of the shared index are accepted from
+    any worker that still knows which of its index versions matches it.
+    
+    Returns:
+        The version, or None if value is missing, malformed or was issued
+        by an earlier run of the server (or, for shared versions, one this
+        worker can't map).
+    """
+    if not value:
+        return None
+    tag, _, version = value.strip().rpartition("-")
+    if not version.isdigit():
+        return None
+    if tag == _BOOT_ID:
+        return int(version)
+    shared = _shared
+    if shared is not None and shared.epoch is not None and tag == f"{shared.epoch:012x}":
+        return shared.local_version(int(version))
+    return None
+
+
+def project_event(since: Optional[int]) -> Tuple[int, Union[ProjectSnapshotEvent, ProjectDeltaEvent, None]]:
+    """
+    Next event for a change-stream subscriber that has seen version since.
+    
+    Projects are identified by their directory name. Subscribers only keep
+    the last version they saw; changes in between are coalesced from the
+    index change log, so a slow subscriber costs no buffering.
+    
+    Args:
+        since: Index version the subscriber is at, or None for a new one
+    
+    Returns:
+        (version, event): a ProjectSnapshotEvent if since is None or too old
+        for the change log, a ProjectDeltaEvent if projects changed, or None
+        if nothing changed.
+    """
+    index = refresh_projects()
+    if since is not None:
+        version, changes = index.changes_since(since)
+        if changes is not None:
+            if not changes:
+                return version, None
+            delta = ProjectDeltaEvent()
+            for project_dir, (old, new) in sorted(changes.items()):
+                if new is None:
+                    delta.removed.append(project_dir.name)
+                else:
+                    entries = delta.added if old is None else delta.updated
+                    entries.append(ProjectEntry(id=project_dir.name, project=new.to_summary()))
+            return version, delta
+    
+    version, entries = index.entries()
+    ordered = sorted(entries.items(), key=lambda item: sort_key(*item))
+    return version, ProjectSnapshotEvent(
+        projects=[ProjectEntry(id=d.name, project=s.to_summary()) for d, s in ordered]
+    )
+
+
+def _encode_cursor(sort: ProjectSort, descending: bool, key: SortKey) -> str:
+    raw = json.dumps([sort.value, descending, list(key)]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str, sort: ProjectSort, descending: bool) -> SortKey:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort, cursor_descending, key = json.loads(raw)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if cursor_sort != sort.value or cursor_descending != descending:
+        raise ValueError("Cursor does not match the requested sort order")
+    return tuple(key)
+
+
+def query_projects(
+    q: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    sort: ProjectSort = ProjectSort.project_name,
+    descending: bool = False,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> ProjectListResponse:
+    """
+    Filtered, sorted and paginated project listing.
+    
+    Pages are read from the index's presorted views: the cursor is the sort
+    key of the last returned project, located by binary search, so an
+    unfiltered page costs O(log n + limit).
+    
+    Args:
+        q: Case-insensitive substring of project_name or description
+        created_after: Only projects created strictly after this time
+        created_before: Only projects created strictly before this time
+        sort: Sort order
+        descending: Reverse the sort order
+        cursor: next_cursor from the previous page
+        limit: Page size (None = everything after the cursor)
+    
+    Returns:
+        ProjectListResponse with the page and the next_cursor (None on the last page)
+    
+    Raises:
+        ValueError: If the cursor is malformed or belongs to another sort
+            order, or limit is below 1
+    """
+    if limit is not None and limit < 1:
+        raise ValueError("limit must be at least 1")
+    keys, items = refresh_projects().view(sort.value)
+    
+    # Index range [lo, hi) still eligible; narrowed by the cursor and, for
+    # the created_at order, directly by the date bounds
+    lo, hi = 0, len(keys)
+    if sort == ProjectSort.created_at:
+        if created_after is not None:
+            lo = bisect_right(keys, (created_after.timestamp(), chr(0x10FFFF)))
+        if created_before is not None:
+            hi = bisect_left(keys, (created_before.timestamp(),))
+    if cursor:
+        key = _decode_cursor(cursor, sort, descending)
+        if descending:
+            hi = min(hi, bisect_left(keys, key))
+        else:
+            lo = max(lo, bisect_right(keys, key))
+    
+    needle = q.lower() if q else None
+    after = created_after.timestamp() if created_after else None
+    before = created_before.timestamp() if created_before else None
+    
+    def matches(summary: ProjectRecord) -> bool:
+        if needle and needle not in summary.name_key and needle not in summary.description.lower():
+            return False
+        if after is not None or before is not None:
+            created = summary.created_timestamp()
+            if (after is not None and created <= after) or (before is not None and created >= before):
+                return False
+        return True
+    
+    positions = range(hi - 1, lo - 1, -1) if descending else range(lo, hi)
+    page: List[ProjectRecord] = []
+    next_cursor = None
+    for i in positions:
+        if not matches(items[i]):
             continue
+        if limit is not None and len(page) == limit:
+            # Another match exists, so there is a next page
+            next_cursor = _encode_cursor(sort, descending, keys[last])
+            break
+        page.append(items[i])
+        last = i
     
-    # Sort alphabetically by project_name (case-insensitive)
-    projects.sort(key=lambda p: p.project_name.lower())
+    return ProjectListResponse(projects=[p.to_summary() for p in page], next_cursor=next_cursor)
+
+
+def search_index_path() -> Path:
+    """Location of the persisted search index."""
+    return settings.projects_base_dir / SEARCH_INDEX_FILE
+
+
+def load_search_index() -> bool:
+    """Load the persisted search index, if there is a usable one."""
+    return search_index.load(search_index_path())
+
+
+def ensure_search_index() -> None:
+    """
+    Load the persisted search index once, before the first search.
     
-    return projects
\ No newline at end of file
+    Startup calls this on a background thread so a large index file does
+    not delay serving; a search arriving earlier waits for the load.
+    """
+    global _search_loaded
+    if _search_loaded:
+        return
+    with _search_load_lock:
+        if not _search_loaded:
+            load_search_index()
+            _search_loaded = True
+
+
+def save_search_index() -> None:
+    """Persist the search index if it changed since the last save."""
+    global _search_saved_at
+    if not search_index.dirty:
+        return
+    try:
+        search_index.save(search_index_path())
+        _search_saved_at = time.monotonic()
+    except OSError:
+        logger.warning("Could not save search index to %s", search_index_path(), exc_info=True)
+
+
+def search_projects(q: str, limit: int = 20) -> List[ProjectSearchResult]:
+    """
+    Search projects by name, repo name and description.
+    
+    Each query token matches as a prefix; projects must match all tokens.
+    The search index is updated incrementally from the project index and
+    saved at most every SEARCH_SAVE_INTERVAL seconds.
+    
+    Args:
+        q: Free-text query
+        limit: Maximum number of results
+    
+    Returns:
+        ProjectSearchResult list, best match first.
+    """
+    ensure_search_index()
+    version, entries = refresh_projects().entries()
+    search_index.sync(version, entries)
+    
+    results = []
+    for doc, score in search_index.search(q, limit):
+        summary = entries.get(Path(doc))
+        if summary is not None:
+            results.append(ProjectSearchResult(project=summary.to_summary(), score=score))
+    
+    if search_index.dirty and time.monotonic() - _search_saved_at >= SEARCH_SAVE_INTERVAL:
+        save_search_index()
+    return results
+
+
+def catalog_path() -> Path:
+    """Location of the persisted project catalog."""
+    return settings.projects_base_dir / CATALOG_FILE
+
+
+def load_catalog() -> int:
+    """
+    Seed the metadata cache and project index from the persisted catalog.
+    
+    The index is served as live straight away; call start_watching() or
+    reconcile_in_background() afterwards to catch up with the filesystem.
+    
+    Returns:
+        Number of projects loaded (0 if there is no usable catalog).
+    """
+    from modules.projects.catalog import ProjectCatalog
+    global _catalog_version
+    rows = ProjectCatalog(catalog_path()).load()
+    # Projects of roots that are no longer configured are left out
+    roots = {root.path: root for root in project_roots()}
+    rows = [row for row in rows if row[0].parent in roots]
+    if not rows:
+        return 0
+    for project_dir, stamp, summary in rows:
+        roots[project_dir.parent].cache.put(metadata_path(project_dir), stamp, summary)
+    project_index.replace_all({project_dir: summary for project_dir, _, summary in rows})
+    project_index.live = True
+    _catalog_version = project_index.version
+    return len(rows)
+
+
+def save_catalog() -> None:
+    """Persist the project index (with file stamps) if it changed since the last save."""
+    global _catalog_version
+    version, entries = project_index.entries()
+    if version == 0 or version == _catalog_version:
+        return
+    
+    # Only rows whose stamp is known to match the indexed summary
+    stamps = {
+        path: stamp
+        for root in project_roots()
+        for path, stamp, summary in root.cache.items()
+        if summary is not None
+    }
+    rows = []
+    for project_dir, summary in entries.items():
+        stamp = stamps.get(metadata_path(project_dir))
+        if stamp is not None:
+            rows.append((project_dir, stamp, summary))
+    from modules.projects.catalog import ProjectCatalog
+    try:
+        ProjectCatalog(catalog_path()).save(rows)
+        _catalog_version = version
+    except Exception:
+        logger.warning("Could not save project catalog to %s", catalog_path(), exc_info=True)
+
+
+def reconcile_in_background() -> Thread:
+    """
+    Rescan the project roots on a background thread, then save the catalog.
+    
+    For use without the watcher: the catalog-seeded index is served until
+    the scan finishes, after which list_projects() scans on demand again.
+    """
+    def reconcile():
+        try:
+            project_index.replace_all(scan_projects(), presorted=True)
+            save_catalog()
+        finally:
+            if not _watchers:
+                project_index.live = False
+    
+    thread = Thread(target=reconcile, name="catalog-reconcile", daemon=True)
+    thread.start()
+    return thread
+
+
+def start_watching() -> List["ProjectWatcher"]:
+    """
+    Start a background watcher on every project root.
+    
+    Full rescans (at startup and whenever a watcher loses track) scan all
+    roots and are shared between watchers running them at the same time.
+    Until the initial scan completes, list_projects() keeps scanning (or
+    serves the catalog, if load_catalog() ran). The catalog is saved after
+    every full rescan when settings.persist_catalog is on.
+    """
+    from modules.projects.watcher import ProjectWatcher
+    if _watchers:
+        stop_watching()
+    for root in project_roots():
+        watcher = ProjectWatcher(
+            root.path,
+            project_index,
+            scan=lambda: _scan_flight.do("scan", _rescan),
+            load=partial(_load_watched, cache=root.cache),
+            poll_interval=settings.watch_poll_interval,
+            on_rescan=save_catalog if settings.persist_catalog else None,
+        )
+        watcher.start()
+        _watchers.append(watcher)
+    return list(_watchers)
+
+
+def stop_watching() -> None:
+    """Stop the background watchers, if running, and drop the live index."""
+    while _watchers:
+        _watchers.pop().stop()
+    project_index.clear()
+
+
+def shared_index_path() -> Path:
+    """Location of the index shared between worker processes."""
+    return settings.shared_index_path or settings.projects_base_dir / SHARED_INDEX_FILE
+
+
+def owns_projects() -> bool:
+    """False for a worker that follows the shared index instead of scanning."""
+    return _shared is None or _shared.is_scanner
+
+
+def start_shared_index() -> Optional[Thread]:
+    """
+    Keep project_index in sync with the other worker processes.
+    
+    Every settings.shared_index_interval seconds this worker tries to
+    become the scanner. The scanner starts the watchers and publishes
+    every index change; all other workers apply what it published and
+    serve their index as live, so they never scan the project roots.
+    Until a reader's first sync, list_projects() behaves as without the
+    shared index (serving the catalog, if loaded, or scanning).
+    Where flock() is unavailable this just starts the watchers.
+    
+    Returns:
+        The background thread, or None if the watchers were started instead.
+    """
+    from modules.projects.shared import SUPPORTED, SharedIndex
+    global _shared, _shared_thread, _shared_stop
+    stop_shared_index()
+    if not SUPPORTED:
+        logger.warning("Shared project index unsupported on this platform, scanning in every worker")
+        start_watching()
+        return None
+    shared = _shared = SharedIndex(shared_index_path())
+    stop = _shared_stop = Event()
+    
+    def run():
+        try:
+            while True:
+                try:
+                    if not shared.is_scanner and shared.try_acquire():
+                        logger.info("Elected project scanner (pid %d)", os.getpid())
+                        start_watching()
+                    if shared.is_scanner:
+                        # Not before the first scan (or catalog load) filled the index
+                        if project_index.live:
+                            shared.publish(project_index)
+                    else:
+                        shared.sync(project_index)
+                except Exception:
+                    logger.warning("Shared project index update failed", exc_info=True)
+                if stop.wait(settings.shared_index_interval):
+                    break
+        finally:
+            shared.close()
+    
+    thread = _shared_thread = Thread(target=run, name="shared-index", daemon=True)
+    thread.start()
+    return thread
+
+
+def stop_shared_index() -> None:
+    """Leave the shared index, handing the scanner role to another worker."""
+    global _shared, _shared_thread
+    _shared_stop.set()
+    if _shared_thread is not None:
+        _shared_thread.join()
+    _shared = _shared_thread = None
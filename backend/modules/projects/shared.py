@@ -0,0 +1,266 @@
+"""
+Project index shared by the worker processes of one deployment.
+
+Run with several workers (uvicorn --workers, gunicorn -w), every process
+would otherwise scan and watch the project roots on its own. With
+settings.shared_index on, the workers elect one scanner through an
+exclusive flock() on a lock file next to a SQLite database in WAL mode.
+The scanner runs the watchers as usual and publishes each change of its
+index to the database; the other workers never scan and instead apply
+the rows published since their last sync to their own index, reading
+while the scanner writes. The kernel drops the lock when the scanner
+exits, and whichever worker tries it next takes over.
+
+Every worker also remembers which of its own index versions match which
+published version, so ETags and event ids can name the published version
+and mean the same thing in every worker.
+"""
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+import os
+import sqlite3
+from modules.projects.index import CHANGELOG_SIZE, ProjectIndex
+from modules.projects.records import ProjectRecord
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+SCHEMA_VERSION = 2
+
+# Without flock() no scanner can be elected; every worker scans on its own
+SUPPORTED = fcntl is not None
+
+_COLUMNS = "project_dir, removed, project_name, repo_name, description, created_at"
+
+
+def _row(project_dir: Path, version: int, summary: Optional[ProjectRecord]) -> tuple:
+    if summary is None:
+        return (str(project_dir), version, 1, None, None, None, None)
+    return (
+        str(project_dir), version, 0,
+        summary.project_name, summary.repo_name,
+        summary.description, summary.created_at.isoformat(),
+    )
+
+
+class SharedIndex:
+    """
+    One worker's handle on the shared project index.
+    
+    The worker holding the lock (try_acquire()) is the scanner and calls
+    publish(); every other worker calls sync() and keeps retrying the
+    lock to take over from a scanner that went away. Use from one thread.
+    
+    Args:
+        path: SQLite database file; the lock file is path + ".lock"
+    """
+    
+    def __init__(self, path: Path):
+        self.path = path
+        self.lock_path = path.with_name(path.name + ".lock")
+        # Shared version last published (scanner) or applied (reader)
+        self.version: Optional[int] = None
+        # Random id of the database, so versions of a recreated one differ
+        self.epoch: Optional[int] = None
+        # Local ProjectIndex version <-> shared version, recent ones only
+        self._shared_by_local: "OrderedDict[int, int]" = OrderedDict()
+        self._local_by_shared: "OrderedDict[int, int]" = OrderedDict()
+        # ProjectIndex.version published last; None forces a full rewrite
+        self._published: Optional[int] = None
+        self._lock_fd: Optional[int] = None
+        self._conn: Optional[sqlite3.Connection] = None
+    
+    @property
+    def is_scanner(self) -> bool:
+        """True while this worker holds the scanner lock."""
+        return self._lock_fd is not None
+    
+    def try_acquire(self) -> bool:
+        """
+        Become the scanner if no other worker is.
+        
+        Returns:
+            True if this worker holds the scanner lock.
+        """
+        if self._lock_fd is not None:
+            return True
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        self._lock_fd = fd
+        self._published = None
+        return True
+    
+    def close(self) -> None:
+        """Release the scanner lock (if held) and the database connection."""
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+    
+    def shared_version(self, local: int) -> Optional[int]:
+        """Shared version whose projects a local index version holds, if known."""
+        return self._shared_by_local.get(local)
+    
+    def local_version(self, shared: int) -> Optional[int]:
+        """Local index version holding the projects of a shared version, if known."""
+        return self._local_by_shared.get(shared)
+    
+    def _remember(self, epoch: int, shared: int, local: int) -> None:
+        if epoch != self.epoch:
+            self._shared_by_local.clear()
+            self._local_by_shared.clear()
+            self.epoch = epoch
+        for mapping, key, value in ((self._shared_by_local, local, shared), (self._local_by_shared, shared, local)):
+            mapping[key] = value
+            mapping.move_to_end(key)
+            if len(mapping) > CHANGELOG_SIZE:
+                mapping.popitem(last=False)
+    
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            # Autocommit mode: transactions are begun explicitly below
+            self._conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        return self._conn
+    
+    def _create_schema(self, conn: sqlite3.Connection) -> None:
+        # Scanner only, with the lock held, so nobody else writes the schema
+        conn.execute("PRAGMA journal_mode=WAL")
+        if conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION:
+            return
+        conn.executescript(f"""
+            BEGIN IMMEDIATE;
+            DROP TABLE IF EXISTS projects;
+            DROP TABLE IF EXISTS meta;
+            CREATE TABLE projects (
+                project_dir TEXT PRIMARY KEY,
+                version INTEGER NOT NULL,
+                removed INTEGER NOT NULL,
+                project_name TEXT,
+                repo_name TEXT,
+                description TEXT,
+                created_at TEXT
+            );
+            CREATE INDEX projects_by_version ON projects (version);
+            CREATE TABLE meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+            INSERT INTO meta VALUES ('version', 0), ('floor', 0), ('epoch', {int.from_bytes(os.urandom(6), "big")});
+            PRAGMA user_version = {SCHEMA_VERSION};
+            COMMIT;
+        """)
+    
+    def publish(self, index: ProjectIndex) -> int:
+        """
+        Write the changes of index since the last publish (scanner only).
+        
+        Each publish is one transaction under a new shared version; removed
+        projects are kept as tombstone rows so readers see the removal.
+        The first publish after acquiring the lock, and any the index's
+        change log no longer covers, rewrites every row and raises the
+        floor, telling readers to reload instead of applying a delta.
+        
+        Returns:
+            Number of rows written.
+        """
+        conn = self._connect()
+        if self._published is None:
+            self._create_schema(conn)
+            changes = None
+        else:
+            local, changes = index.changes_since(self._published)
+            if changes is not None and not changes:
+                self._published = local
+                return 0
+        if changes is None:
+            local, entries = index.entries()
+            rows: Dict[Path, Optional[ProjectRecord]] = entries
+        else:
+            rows = {project_dir: new for project_dir, (_, new) in changes.items()}
+        
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            meta = dict(conn.execute("SELECT key, value FROM meta"))
+            version = meta["version"] + 1
+            if changes is None:
+                conn.execute("DELETE FROM projects")
+                conn.execute("UPDATE meta SET value = ? WHERE key = 'floor'", (version,))
+            conn.executemany(
+                "INSERT OR REPLACE INTO projects (project_dir, version, removed, project_name,"
+                " repo_name, description, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (_row(project_dir, version, summary) for project_dir, summary in rows.items()),
+            )
+            conn.execute("UPDATE meta SET value = ? WHERE key = 'version'", (version,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        self._remember(meta["epoch"], version, local)
+        self.version = version
+        self._published = local
+        return len(rows)
+    
+    def sync(self, index: ProjectIndex) -> int:
+        """
+        Apply what the scanner published since the last sync (readers).
+        
+        Rows newer than the last applied version go into index as one
+        update_many(); after a full rewrite (or a schema reset) the whole
+        index is replaced. Records equal to the indexed ones keep the
+        indexed objects, so republished but unchanged projects don't bump
+        index.version. The index is marked live once it reflects a
+        published version.
+        
+        Returns:
+            Number of rows applied.
+        """
+        if not self.path.exists():
+            return 0
+        conn = self._connect()
+        # One read transaction, so meta and rows come from the same snapshot
+        conn.execute("BEGIN")
+        try:
+            try:
+                meta = dict(conn.execute("SELECT key, value FROM meta"))
+            except sqlite3.OperationalError:
+                # Nothing published yet
+                return 0
+            version = meta["version"]
+            if not version or (version == self.version and meta["epoch"] == self.epoch):
+                return 0
+            full = (
+                self.version is None or meta["epoch"] != self.epoch
+                or self.version < meta["floor"] or self.version > version
+            )
+            if full:
+                cursor = conn.execute(f"SELECT {_COLUMNS} FROM projects WHERE removed = 0")
+            else:
+                cursor = conn.execute(f"SELECT {_COLUMNS} FROM projects WHERE version > ?", (self.version,))
+            rows = cursor.fetchall()
+        finally:
+            conn.execute("COMMIT")
+        
+        changes: Dict[Path, Optional[ProjectRecord]] = {}
+        for project_dir, removed, name, repo, description, created_at in rows:
+            project_dir = Path(project_dir)
+            if removed:
+                changes[project_dir] = None
+                continue
+            record = ProjectRecord(name, repo, description, datetime.fromisoformat(created_at))
+            current = index.get(project_dir)
+            changes[project_dir] = current if current == record else record
+        if full:
+            index.replace_all(changes)
+        else:
+            index.update_many(changes)
+        index.live = True
+        self._remember(meta["epoch"], version, index.version)
+        self.version = version
+        return len(rows)
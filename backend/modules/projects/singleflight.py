@@ -0,0 +1,110 @@
+"""
+Duplicate call suppression for expensive, idempotent work.
+
+Concurrent callers asking for the same key share one in-flight execution
+and all receive its result (or its exception). Nothing is cached: a call
+that starts after the previous one finished runs again.
+"""
+from threading import Event, Lock, Thread
+from typing import Any, Callable, Dict, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+    
+    def __init__(self):
+        self.done = Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Coalesces concurrent calls per key. Thread-safe."""
+    
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = Lock()
+        # Number of executions, and of callers that joined one instead
+        self.runs = 0
+        self.shared = 0
+    
+    def in_flight(self, key: Hashable) -> bool:
+        """True if a call for key is currently executing."""
+        return key in self._calls
+    
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """
+        Run fn, or wait for the execution already running for key.
+        
+        Returns:
+            fn's result, shared by every caller that joined the execution.
+        
+        Raises:
+            Whatever fn raised, in every caller that joined the execution.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.runs += 1
+            else:
+                self.shared += 1
+        
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        return self._run(key, call, fn)
+    
+    def start(
+        self,
+        key: Hashable,
+        fn: Callable[[], Any],
+        name: str = "single-flight",
+        on_error: Optional[Callable[[BaseException], None]] = None,
+    ) -> bool:
+        """
+        Run fn on a new daemon thread unless a call for key is executing.
+        
+        The call is registered before the thread starts, so concurrent
+        start() and do() callers join it instead of running fn again.
+        
+        Args:
+            on_error: Called with fn's exception on the background thread
+                (callers that joined still get the exception raised)
+        
+        Returns:
+            True if this call started fn.
+        """
+        with self._lock:
+            if key in self._calls:
+                return False
+            call = self._calls[key] = _Call()
+            self.runs += 1
+        
+        def run():
+            try:
+                self._run(key, call, fn)
+            except Exception as e:
+                if on_error is None:
+                    raise
+                on_error(e)
+        
+        Thread(target=run, name=name, daemon=True).start()
+        return True
+    
+    def _run(self, key: Hashable, call: _Call, fn: Callable[[], T]) -> T:
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
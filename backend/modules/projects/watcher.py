@@ -0,0 +1,305 @@
+"""
+Background watcher that keeps the project index in sync with the filesystem.
+
+Uses inotify on Linux (base dir, each project dir and each .contextkeep/
+dir are watched, nothing deeper) and falls back to periodic scandir
+diffing where inotify is unavailable or runs out of watches. Only projects
+touched by an event are reloaded; a full rescan happens at startup and
+after an event-queue overflow.
+"""
+from pathlib import Path
+from threading import Event, Thread
+from typing import Callable, Dict, List, Optional, Set
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import sys
+from modules.files.service import file_stamp
+from modules.projects.index import ProjectIndex
+from modules.projects.records import ProjectRecord
+
+logger = logging.getLogger(__name__)
+
+METADATA_DIR = ".contextkeep"
+METADATA_FILE = "project.json"
+
+# inotify(7) constants
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+
+_DIR_MASK = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+_METADATA_MASK = _DIR_MASK | IN_CLOSE_WRITE | IN_MODIFY
+_EVENT_HEADER = struct.Struct("iIII")
+
+# Changed project directory names, or None when a full rescan is required
+Changes = Optional[Set[str]]
+
+
+class InotifyBackend:
+    """Event source backed by Linux inotify."""
+    
+    name = "inotify"
+    
+    def __init__(self, base_dir: Path):
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._rm_watch = libc.inotify_rm_watch
+        self._rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        
+        self.base_dir = base_dir
+        # wd -> (project name or "" for the base dir, kind)
+        self._watches: Dict[int, tuple] = {}
+        self._project_wds: Dict[str, List[int]] = {}
+        try:
+            self._watch(base_dir, "", "base", _DIR_MASK)
+            with os.scandir(base_dir) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        self._watch_project(entry.name)
+        except OSError:
+            self.close()
+            raise
+    
+    def _watch(self, path: Path, project: str, kind: str, mask: int) -> int:
+        wd = self._add_watch(self._fd, os.fsencode(path), mask)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {path}")
+        self._watches[wd] = (project, kind)
+        if project:
+            self._project_wds.setdefault(project, []).append(wd)
+        return wd
+    
+    def _watch_project(self, project: str) -> None:
+        project_dir = self.base_dir / project
+        try:
+            self._watch(project_dir, project, "project", _DIR_MASK)
+            self._watch(project_dir / METADATA_DIR, project, "metadata", _METADATA_MASK)
+        except (FileNotFoundError, NotADirectoryError):
+            # Project dir without .contextkeep/ (yet) or already removed again
+            pass
+    
+    def _unwatch_project(self, project: str) -> None:
+        for wd in self._project_wds.pop(project, []):
+            self._watches.pop(wd, None)
+            self._rm_watch(self._fd, wd)
+    
+    def wait_for_changes(self, stop: Event, timeout: float = 0.5) -> Changes:
+        """Block until events arrive (or stop is set) and translate them to changed projects."""
+        while not stop.is_set():
+            ready, _, _ = select.select([self._fd], [], [], timeout)
+            if ready:
+                break
+        else:
+            return set()
+        
+        # Let a burst of related events (e.g. git checkout) settle into one batch
+        stop.wait(0.05)
+        changed: Set[str] = set()
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            if self._handle(data, changed) is None:
+                return None
+    
+    def _handle(self, data: bytes, changed: Set[str]) -> Changes:
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+            offset += length
+            
+            if mask & IN_Q_OVERFLOW:
+                return None
+            watch = self._watches.get(wd)
+            if watch is None:
+                continue
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+            project, kind = watch
+            
+            if kind == "base":
+                if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                    return None
+                if not name:
+                    continue
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    self._unwatch_project(name)
+                    self._watch_project(name)
+                elif mask & (IN_DELETE | IN_MOVED_FROM):
+                    self._unwatch_project(name)
+                changed.add(name)
+            elif kind == "project":
+                if name == METADATA_DIR:
+                    if mask & (IN_CREATE | IN_MOVED_TO):
+                        self._unwatch_project(project)
+                        self._watch_project(project)
+                    changed.add(project)
+            elif name == METADATA_FILE or mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                changed.add(project)
+        return changed
+    
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class PollingBackend:
+    """Portable event source that diffs scandir snapshots at a fixed interval."""
+    
+    name = "polling"
+    
+    def __init__(self, base_dir: Path, interval: float = 2.0):
+        self.base_dir = base_dir
+        self.interval = interval
+        self._snapshot = self._take_snapshot()
+    
+    def _take_snapshot(self) -> Optional[Dict[str, tuple]]:
+        try:
+            with os.scandir(self.base_dir) as entries:
+                return {
+                    entry.name: file_stamp(Path(entry.path) / METADATA_DIR / METADATA_FILE)
+                    for entry in entries
+                    if entry.is_dir()
+                }
+        except OSError:
+            return None
+    
+    def wait_for_changes(self, stop: Event) -> Changes:
+        if stop.wait(self.interval):
+            return set()
+        old, new = self._snapshot, self._take_snapshot()
+        self._snapshot = new
+        if old is None or new is None:
+            # Base dir appeared or disappeared
+            return None if old is not new else set()
+        return {
+            name for name in old.keys() | new.keys()
+            if old.get(name) != new.get(name)
+        }
+    
+    def close(self) -> None:
+        pass
+
+
+class ProjectWatcher:
+    """
+    Keeps a ProjectIndex live for one projects base directory.
+    
+    Args:
+        base_dir: Directory containing the project directories
+        index: Index to keep up to date
+        scan: Full scan, returns {project_dir: summary} for valid projects
+        load: Loads one project dir, returns None if it is not a valid project
+        poll_interval: Seconds between scans for the polling fallback
+        use_inotify: Set False to force the polling backend
+        on_rescan: Called after every full rescan (e.g. to persist the index)
+    """
+    
+    def __init__(
+        self,
+        base_dir: Path,
+        index: ProjectIndex,
+        scan: Callable[[], Dict[Path, ProjectRecord]],
+        load: Callable[[Path], Optional[ProjectRecord]],
+        poll_interval: float = 2.0,
+        use_inotify: bool = True,
+        on_rescan: Optional[Callable[[], None]] = None,
+    ):
+        self.base_dir = base_dir
+        self.index = index
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.backend_name: Optional[str] = None
+        self._scan = scan
+        self._load = load
+        self._on_rescan = on_rescan
+        self._stop = Event()
+        self._thread: Optional[Thread] = None
+    
+    def start(self) -> None:
+        """Start the watcher thread; the index goes live after the initial scan."""
+        self._stop.clear()
+        self._thread = Thread(target=self._run, name="project-watcher", daemon=True)
+        self._thread.start()
+    
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the watcher thread and mark the index as not live."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.index.live = False
+    
+    def _open_backend(self):
+        if self.use_inotify:
+            try:
+                return InotifyBackend(self.base_dir)
+            except (OSError, AttributeError) as e:
+                logger.info("inotify unavailable for %s (%s), polling instead", self.base_dir, e)
+        return PollingBackend(self.base_dir, self.poll_interval)
+    
+    def _rescan(self):
+        # Watches are set up before scanning so no change can slip in between
+        backend = self._open_backend()
+        self.backend_name = backend.name
+        try:
+            self.index.replace_all(self._scan())
+        except BaseException:
+            backend.close()
+            raise
+        self.index.live = True
+        if self._on_rescan is not None:
+            self._on_rescan()
+        return backend
+    
+    def _run(self) -> None:
+        # None until a full rescan succeeded; failed rescans (including the
+        # initial one) are retried every poll_interval
+        backend = None
+        try:
+            while not self._stop.is_set():
+                try:
+                    if backend is None:
+                        backend = self._rescan()
+                    changed = backend.wait_for_changes(self._stop)
+                    if changed is None:
+                        backend.close()
+                        backend = None
+                        continue
+                    for name in changed:
+                        project_dir = self.base_dir / name
+                        self.index.update(project_dir, self._load(project_dir))
+                except Exception:
+                    logger.exception("Project watcher error, rescanning")
+                    if backend is not None:
+                        backend.close()
+                        backend = None
+                    self._stop.wait(self.poll_interval)
+        finally:
+            if backend is not None:
+                backend.close()
+            self.index.live = False
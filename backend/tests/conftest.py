@@ -1,6 +1,7 @@
 """
 Shared test fixtures.
 """
+import json
 import pytest
 from pathlib import Path
 from fastapi.testclient import TestClient
@@ -27,4 +28,25 @@ def test_projects_fixture_path(fixtures_dir):
     Integration tests use this to point settings.projects_base_dir
     to real fixture files instead of the user's actual projects directory.
     """
-    return fixtures_dir / "projects"
\ No newline at end of file
+    return fixtures_dir / "projects"
+
+
+@pytest.fixture
+def write_project():
+    """
+    Helper writing <base>/<repo>/.contextkeep/project.json for a test project.
+    
+    Returns the metadata file; an existing project's metadata is replaced.
+    """
+    def write(base: Path, repo: str, name: str) -> Path:
+        metadata_dir = base / repo / ".contextkeep"
+        metadata_dir.mkdir(parents=True, exist_ok=True)
+        metadata_file = metadata_dir / "project.json"
+        metadata_file.write_text(json.dumps({
+            "project_name": name,
+            "repo_name": repo,
+            "description": "Test project",
+            "created_at": "2025-11-15T10:30:00Z"
+        }))
+        return metadata_file
+    return write
@@ -0,0 +1,122 @@
+"""
+Unit tests for the content-addressed document cache.
+"""
+import json
+import os
+import pytest
+from modules.files.cache import ContentCache
+
+
+def test_unchanged_stamp_skips_the_read(tmp_path, monkeypatch):
+    """
+    TC-CC1: A file with an unchanged stamp is served without opening it
+    
+    Given: A cached document
+    When: It is read again, then rewritten with new content
+    Then: The second read does not open the file
+    And: The rewrite is picked up
+    """
+    path = tmp_path / "card.md"
+    path.write_text("v1")
+    cache = ContentCache()
+    assert cache.read(path) == b"v1"
+    
+    opened = []
+    real_open = open
+    monkeypatch.setattr("builtins.open", lambda *a, **kw: opened.append(a[0]) or real_open(*a, **kw))
+    assert cache.read(path) == b"v1"
+    assert opened == []
+    
+    path.write_text("v2 longer")
+    assert cache.read(path) == b"v2 longer"
+    assert cache.stats()["stamp_hits"] == 1
+
+
+def test_identical_content_is_stored_and_parsed_once(tmp_path):
+    """
+    TC-CC2: Documents with the same bytes share one entry and one parse
+    
+    Given: The same JSON document in three projects
+    When: Each is loaded with a JSON parser
+    Then: The parser runs once and all loads return the same object
+    And: The cache holds one content for three paths
+    """
+    calls = []
+    
+    def parse(data):
+        calls.append(data)
+        return json.loads(data)
+    
+    paths = []
+    for name in ["a", "b", "c"]:
+        (tmp_path / name).mkdir()
+        paths.append(tmp_path / name / "order.json")
+        paths[-1].write_text('{"step": 1}')
+    cache = ContentCache()
+    
+    values = [cache.load(p, parse) for p in paths]
+    
+    assert values[0] == {"step": 1}
+    assert values[0] is values[1] is values[2]
+    assert len(calls) == 1
+    assert cache.stats()["contents"] == 1 and cache.stats()["paths"] == 3
+    assert cache.stats()["content_hits"] == 2
+
+
+def test_touch_without_change_does_not_reparse(tmp_path):
+    """
+    TC-CC3: A new mtime with the same bytes is a content hit, not a re-parse
+    """
+    path = tmp_path / "state.json"
+    path.write_text("[1, 2]")
+    cache = ContentCache()
+    first = cache.load(path, json.loads)
+    
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    
+    assert cache.load(path, json.loads) is first
+    assert cache.stats()["content_hits"] == 1
+
+
+def test_bounded_by_bytes(tmp_path):
+    """
+    TC-CC4: Least recently used contents are evicted beyond max_bytes
+    
+    Given: A cache bounded to 25 bytes
+    When: Three 10-byte documents are read (the first one read again in between)
+    Then: The least recently used one is evicted
+    And: Oversized documents are returned but not cached
+    """
+    cache = ContentCache(max_bytes=25)
+    for name in "abc":
+        (tmp_path / name).write_bytes(name.encode() * 10)
+    (tmp_path / "big").write_bytes(b"x" * 100)
+    
+    cache.read(tmp_path / "a")
+    cache.read(tmp_path / "b")
+    cache.read(tmp_path / "a")
+    cache.read(tmp_path / "c")
+    
+    assert cache.size == 20
+    assert cache.read(tmp_path / "big") == b"x" * 100
+    assert cache.size == 20
+    hits = cache.stamp_hits
+    cache.read(tmp_path / "a")
+    assert cache.stamp_hits == hits + 1
+    cache.read(tmp_path / "b")
+    assert cache.stamp_hits == hits + 1
+
+
+def test_missing_file_and_parser_errors(tmp_path):
+    """
+    TC-CC5: Missing files raise FileNotFoundError; failed parses are not cached
+    """
+    cache = ContentCache()
+    with pytest.raises(FileNotFoundError):
+        cache.read(tmp_path / "missing")
+    
+    (tmp_path / "bad.json").write_text("{ nope")
+    with pytest.raises(ValueError):
+        cache.load(tmp_path / "bad.json", json.loads)
+    assert cache.load(tmp_path / "bad.json", lambda data: data.decode()) == "{ nope"
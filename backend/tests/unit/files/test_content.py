@@ -0,0 +1,184 @@
+"""
+Unit tests for ranged file content reads.
+"""
+import codecs
+import os
+from threading import Thread
+import pytest
+from modules.files import content as content_module
+from modules.files.content import LineIndexCache, detect_encoding, read_lines, read_range
+
+
+class TestDetectEncoding:
+    """Tests for binary / encoding detection"""
+    
+    @pytest.mark.parametrize("sample, complete, expected", [
+        (b"plain ascii\n", True, (False, "utf-8")),
+        ("grüße\n".encode("utf-8"), True, (False, "utf-8")),
+        (codecs.BOM_UTF8 + b"x", True, (False, "utf-8-sig")),
+        ("hi".encode("utf-16"), True, (False, "utf-16")),
+        ("hi".encode("utf-32"), True, (False, "utf-32")),
+        (b"\x89PNG\r\n\x1a\n\0\0\0\rIHDR", True, (True, None)),
+        ("café".encode("latin-1"), True, (False, "latin-1")),
+        ("café".encode("utf-8")[:-1], False, (False, "utf-8")),
+        (bytes(range(1, 32)) * 4, True, (True, None)),
+    ])
+    def test_detect(self, sample, complete, expected):
+        """
+        TC-C1: BOMs, NUL bytes, UTF-8, latin-1 fallback and cut-off samples
+        """
+        assert detect_encoding(sample, complete) == expected
+
+
+class TestReadLines:
+    """Tests for read_lines() and read_range()"""
+    
+    def test_windows_across_index_strides(self, tmp_path, monkeypatch):
+        """
+        TC-C2: Line windows anywhere in the file match splitlines()
+        
+        Given: A file of 1000 lines with CRLF and LF endings, a small
+               index stride and chunk size so several strides and chunks exist
+        When: Windows at the start, across a stride boundary and at the end are read
+        Then: Each window matches the corresponding lines of the file
+        And: total_lines counts a last line without newline
+        """
+        monkeypatch.setattr(content_module, "LINE_INDEX_STRIDE", 7)
+        monkeypatch.setattr(content_module, "LINE_INDEX_CHUNK", 64)
+        monkeypatch.setattr(content_module, "line_index_cache", LineIndexCache())
+        lines = [f"line {i} " + "x" * (i % 13) for i in range(1000)]
+        path = tmp_path / "big.log"
+        path.write_bytes(("\r\n".join(lines[:500]) + "\r\n" + "\n".join(lines[500:])).encode("utf-8"))
+        
+        for start, count in [(1, 5), (6, 10), (499, 4), (990, 50)]:
+            window = read_lines(path, start, count)
+            assert window.lines == lines[start - 1:start - 1 + count]
+            assert window.total_lines == 1000
+        assert read_lines(path, 2000, 5).lines == []
+    
+    def test_binary_empty_and_long_lines(self, tmp_path, monkeypatch):
+        """
+        TC-C3: Binary files have no lines, empty files none either, long lines are cut off
+        """
+        monkeypatch.setattr(content_module, "MAX_LINE_BYTES", 10)
+        (tmp_path / "blob.bin").write_bytes(b"\0\1\2" * 100)
+        (tmp_path / "empty.txt").write_bytes(b"")
+        (tmp_path / "long.txt").write_text("short\n" + "y" * 50 + "\nend")
+        
+        blob = read_lines(tmp_path / "blob.bin")
+        assert blob.binary and blob.lines == [] and blob.total_lines is None
+        assert read_lines(tmp_path / "empty.txt").total_lines == 0
+        long = read_lines(tmp_path / "long.txt")
+        assert long.lines == ["short", "y" * 10, "end"]
+        assert long.truncated_lines == [2]
+    
+    def test_read_range(self, tmp_path):
+        """
+        TC-C4: read_range() returns the clamped byte range; bad input raises
+        """
+        path = tmp_path / "data.bin"
+        path.write_bytes(bytes(range(256)))
+        
+        assert read_range(path, 10, 5) == bytes(range(10, 15))
+        assert read_range(path, 250, 100) == bytes(range(250, 256))
+        assert read_range(path, 300) == b""
+        with pytest.raises(ValueError):
+            read_range(path, -1)
+        with pytest.raises(IsADirectoryError):
+            read_range(tmp_path)
+    
+    @pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="no FIFOs")
+    def test_fifo_is_rejected_without_blocking(self, tmp_path):
+        """
+        TC-C8: A FIFO is rejected like a directory instead of blocking the reader
+        
+        Given: A FIFO without a writer
+        When: read_lines() is called on it
+        Then: It raises IsADirectoryError right away
+        """
+        fifo = tmp_path / "pipe"
+        os.mkfifo(fifo)
+        errors = []
+        
+        def read():
+            try:
+                read_lines(fifo)
+            except IsADirectoryError as e:
+                errors.append(e)
+        
+        reader = Thread(target=read, daemon=True)
+        reader.start()
+        reader.join(timeout=5)
+        
+        assert not reader.is_alive()
+        assert len(errors) == 1
+    
+    def test_index_rebuilt_after_change(self, tmp_path, monkeypatch):
+        """
+        TC-C5: The cached line index follows file changes
+        """
+        monkeypatch.setattr(content_module, "line_index_cache", LineIndexCache())
+        path = tmp_path / "grow.log"
+        path.write_text("a\nb\n")
+        assert read_lines(path).total_lines == 2
+        
+        path.write_text("a\nb\nc\nd\n")
+        assert read_lines(path, 3).lines == ["c", "d"]
+    
+    def test_file_truncated_while_read(self, tmp_path, monkeypatch):
+        """
+        TC-C7: A file truncated after it was opened ends early instead of failing
+        
+        Given: A file of 100 lines that is cut to 10 lines right after being opened
+        When: A line window past the cut and a byte range across it are read
+        Then: The window holds the lines up to the cut; the range ends at the cut
+        """
+        monkeypatch.setattr(content_module, "line_index_cache", LineIndexCache())
+        path = tmp_path / "rotated.log"
+        full = "".join(f"line {i}\n" for i in range(100))
+        short = "".join(f"line {i}\n" for i in range(10))
+        open_file = content_module._open
+        
+        def open_then_truncate(target):
+            opened = open_file(target)
+            path.write_text(short)
+            return opened
+        
+        monkeypatch.setattr(content_module, "_open", open_then_truncate)
+        
+        path.write_text(full)
+        assert read_lines(path, 5, 50).lines == [f"line {i}" for i in range(4, 10)]
+        path.write_text(full)
+        assert read_range(path, 60, 100) == short.encode()[60:]
+
+
+def test_content_endpoints(tmp_path, monkeypatch, test_client):
+    """
+    TC-C6: GET /api/files/content and /api/files/raw
+    
+    Given: A project with a text file
+    When: A line window, a byte range and invalid paths are requested
+    Then: The window is returned as FileContent JSON
+    And: Range requests get 206 with Content-Range; bad paths and project ids 400,
+         missing files 404
+    """
+    monkeypatch.setattr("config.settings.projects_base_dir", tmp_path)
+    (tmp_path / "proj").mkdir()
+    (tmp_path / "proj" / "notes.txt").write_text("one\ntwo\nthree\n")
+    params = {"project": "proj", "path": "notes.txt"}
+    
+    response = test_client.get("/api/files/content", params={**params, "start_line": 2, "line_count": 1})
+    assert response.status_code == 200
+    assert response.json()["lines"] == ["two"]
+    assert response.json()["total_lines"] == 3
+    
+    response = test_client.get("/api/files/raw", params=params, headers={"Range": "bytes=4-6"})
+    assert response.status_code == 206
+    assert response.content == b"two"
+    assert response.headers["content-range"] == "bytes 4-6/14"
+    assert response.headers["content-type"] == "text/plain; charset=utf-8"
+    assert test_client.get("/api/files/raw", params=params, headers={"Range": "bytes=100-"}).status_code == 416
+    
+    assert test_client.get("/api/files/raw", params={"project": "proj", "path": "../x"}).status_code == 400
+    assert test_client.get("/api/files/raw", params={"project": "..", "path": "notes.txt"}).status_code == 400
+    assert test_client.get("/api/files/content", params={"project": "proj", "path": "nope.txt"}).status_code == 404
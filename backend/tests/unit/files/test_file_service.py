@@ -2,9 +2,22 @@
 Unit tests for file service operations.
 """
 import pytest
+import asyncio
 import json
 from pathlib import Path
-from modules.files.service import list_directories, read_json_file
+from pydantic import BaseModel, ValidationError
+from modules.files import service as file_service
+from modules.files.service import (
+    iter_directories,
+    json_backend,
+    list_directories,
+    list_directories_async,
+    read_json_file,
+    read_json_file_async,
+    file_stamp,
+    write_file_atomic,
+    WriteBatch,
+)
 
 
 class TestListDirectories:
@@ -71,6 +84,52 @@ class TestListDirectories:
         assert len(result) == 2
         dir_names = {p.name for p in result}
         assert dir_names == {"dir1", "dir2"}
+    
+    def test_list_directories_missing_or_file(self, tmp_path):
+        """
+        TC-F7: List directories - base path missing or not a directory
+        
+        Given: A non-existent path and a regular file
+        When: list_directories() is called on each
+        Then: Returns empty list for both
+        """
+        (tmp_path / "file.txt").write_text("content")
+        
+        assert list_directories(tmp_path / "missing") == []
+        assert list_directories(tmp_path / "file.txt") == []
+
+
+class TestIterDirectories:
+    """Tests for iter_directories generator"""
+    
+    def test_iter_directories_streams(self, tmp_path):
+        """
+        TC-F8: iter_directories() is lazy and yields subdirectories
+        """
+        (tmp_path / "dir1").mkdir()
+        (tmp_path / "file.txt").write_text("content")
+        
+        result = iter_directories(tmp_path)
+        
+        assert not isinstance(result, list)
+        assert [p.name for p in result] == ["dir1"]
+    
+    def test_iter_directories_require_file(self, tmp_path):
+        """
+        TC-F9: iter_directories() pre-filters on a required file
+        
+        Given: Three subdirectories, only one with .contextkeep/project.json
+        When: iter_directories() is called with require_file
+        Then: Only the directory containing the file is yielded
+        """
+        (tmp_path / "valid" / ".contextkeep").mkdir(parents=True)
+        (tmp_path / "valid" / ".contextkeep" / "project.json").write_text("{}")
+        (tmp_path / "empty-metadata" / ".contextkeep").mkdir(parents=True)
+        (tmp_path / "plain").mkdir()
+        
+        result = list(iter_directories(tmp_path, require_file=".contextkeep/project.json"))
+        
+        assert [p.name for p in result] == ["valid"]
 
 
 class TestReadJsonFile:
@@ -124,4 +183,160 @@ class TestReadJsonFile:
         invalid_json.write_text("{ this is not valid JSON }")
         
         with pytest.raises(json.JSONDecodeError):
-            read_json_file(invalid_json)
\ No newline at end of file
+            read_json_file(invalid_json)
+    
+    
+    def test_read_json_file_into_model(self, tmp_path):
+        """
+        TC-F12: Read JSON file straight into a Pydantic model
+        
+        Given: A JSON file and a model describing it
+        When: read_json_file() is called with the model
+        Then: Returns a validated model instance
+        And: Invalid content raises ValidationError
+        """
+        class Item(BaseModel):
+            name: str
+            value: int
+        
+        (tmp_path / "ok.json").write_text('{"name": "x", "value": "42", "extra": true}')
+        (tmp_path / "bad.json").write_text('{"name": "x"}')
+        (tmp_path / "broken.json").write_text("{ nope")
+        
+        assert read_json_file(tmp_path / "ok.json", Item) == Item(name="x", value=42)
+        for name in ("bad.json", "broken.json"):
+            with pytest.raises(ValidationError):
+                read_json_file(tmp_path / name, Item)
+    
+    @pytest.mark.parametrize("backend", ["json", "orjson", "msgspec"])
+    def test_json_backends(self, tmp_path, monkeypatch, backend):
+        """
+        TC-F13: Every JSON backend decodes the same and raises JSONDecodeError
+        """
+        pytest.importorskip(backend)
+        monkeypatch.setattr(file_service, "_json_backend", None)
+        assert json_backend(backend)[0] == backend
+        
+        (tmp_path / "ok.json").write_text('{"name": "caf\u00e9", "nested": [1, 2.5, null]}')
+        (tmp_path / "bad.json").write_text("{ nope")
+        
+        assert read_json_file(tmp_path / "ok.json") == {"name": "caf\u00e9", "nested": [1, 2.5, None]}
+        with pytest.raises(json.JSONDecodeError):
+            read_json_file(tmp_path / "bad.json")
+    
+    def test_json_backend_unknown(self, monkeypatch):
+        """
+        TC-F14: Unknown backend names are rejected; auto picks an installed one
+        """
+        monkeypatch.setattr(file_service, "_json_backend", None)
+        with pytest.raises(ValueError):
+            json_backend("simdjson")
+        assert json_backend("auto")[0] in file_service.JSON_BACKENDS
+
+
+class TestAtomicWrites:
+    """Tests for write_file_atomic() and WriteBatch"""
+    
+    def test_write_file_atomic(self, tmp_path):
+        """
+        TC-F15: Atomic write creates parents, keeps the mode and leaves no temp files
+        """
+        target = tmp_path / "a" / "b" / "project.json"
+        
+        stamp = write_file_atomic(target, {"project_name": "KJBot"})
+        
+        assert read_json_file(target) == {"project_name": "KJBot"}
+        assert target.read_text().endswith("\n")
+        assert stamp == file_stamp(target)
+        
+        target.chmod(0o600)
+        write_file_atomic(target, "replaced")
+        assert target.read_text() == "replaced"
+        assert target.stat().st_mode & 0o777 == 0o600
+        assert [p.name for p in target.parent.iterdir()] == ["project.json"]
+    
+    def test_write_batch_commit(self, tmp_path):
+        """
+        TC-F16: A batch is invisible until commit, then every file is in place
+        """
+        class Model(BaseModel):
+            name: str
+        
+        batch = WriteBatch(durable=False)
+        batch.write(tmp_path / "one.json", Model(name="one"))
+        batch.write(tmp_path / "sub" / "two.bin", b"\x00\x01")
+        assert not (tmp_path / "one.json").exists()
+        
+        stamps = batch.commit()
+        
+        assert read_json_file(tmp_path / "one.json", Model) == Model(name="one")
+        assert (tmp_path / "sub" / "two.bin").read_bytes() == b"\x00\x01"
+        assert stamps == {
+            tmp_path / "one.json": file_stamp(tmp_path / "one.json"),
+            tmp_path / "sub" / "two.bin": file_stamp(tmp_path / "sub" / "two.bin"),
+        }
+    
+    def test_write_batch_abort_on_error(self, tmp_path):
+        """
+        TC-F17: An exception inside the batch leaves existing files untouched
+        """
+        (tmp_path / "keep.txt").write_text("old")
+        
+        with pytest.raises(RuntimeError):
+            with WriteBatch() as batch:
+                batch.write(tmp_path / "keep.txt", "new")
+                raise RuntimeError("boom")
+        
+        assert (tmp_path / "keep.txt").read_text() == "old"
+        assert [p.name for p in tmp_path.iterdir()] == ["keep.txt"]
+    
+    def test_write_batch_failed_rename(self, tmp_path):
+        """
+        TC-F18: A rename failing during commit leaves no temp files behind
+        
+        Given: A batch of three files, the second targeting a non-empty directory
+        When: The batch is committed
+        Then: The error propagates, the first file is in place, the third is
+              not written and no temp files are left
+        """
+        (tmp_path / "dir").mkdir()
+        (tmp_path / "dir" / "inside.txt").write_text("x")
+        batch = WriteBatch(durable=False)
+        batch.write(tmp_path / "a.txt", "a")
+        batch.write(tmp_path / "dir", "not a directory")
+        batch.write(tmp_path / "c.txt", "c")
+        
+        with pytest.raises(OSError):
+            batch.commit()
+        
+        assert (tmp_path / "a.txt").read_text() == "a"
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["a.txt", "dir"]
+        assert batch.stamps == {tmp_path / "a.txt": file_stamp(tmp_path / "a.txt")}
+
+
+class TestAsyncVariants:
+    """Tests for the executor-backed async file functions"""
+    
+    def test_list_directories_async(self, tmp_path):
+        """
+        TC-F10: list_directories_async() matches list_directories()
+        """
+        (tmp_path / "dir1").mkdir()
+        (tmp_path / "file.txt").write_text("content")
+        
+        result = asyncio.run(list_directories_async(tmp_path))
+        
+        assert result == list_directories(tmp_path)
+    
+    def test_read_json_file_async(self, tmp_path):
+        """
+        TC-F11: read_json_file_async() parses JSON and propagates errors
+        """
+        (tmp_path / "ok.json").write_text('{"a": 1}')
+        (tmp_path / "bad.json").write_text("{ nope")
+        
+        assert asyncio.run(read_json_file_async(tmp_path / "ok.json")) == {"a": 1}
+        with pytest.raises(json.JSONDecodeError):
+            asyncio.run(read_json_file_async(tmp_path / "bad.json"))
+        with pytest.raises(FileNotFoundError):
+            asyncio.run(read_json_file_async(tmp_path / "missing.json"))
\ No newline at end of file
@@ -0,0 +1,205 @@
+"""
+Unit tests for lazy file tree listings.
+"""
+import os
+import pytest
+from modules.files.tree import TreeCache, is_ignored, list_tree_page, parse_gitignore
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """A small project tree with a .gitignore"""
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".gitignore").write_text("# build output\n/build/\n*.log\n!keep.log\nnode_modules/\n")
+    (tmp_path / "src" / "pkg").mkdir(parents=True)
+    (tmp_path / "src" / "main.py").write_text("print('hi')\n")
+    (tmp_path / "src" / "debug.log").write_text("x")
+    (tmp_path / "src" / "keep.log").write_text("x")
+    (tmp_path / "build").mkdir()
+    (tmp_path / "build" / "out.bin").write_bytes(b"\0" * 10)
+    (tmp_path / "web" / "node_modules" / "left-pad").mkdir(parents=True)
+    (tmp_path / "README.md").write_text("# Readme\n")
+    (tmp_path / "Zeta.txt").write_text("z")
+    return tmp_path
+
+
+class TestGitignore:
+    """Tests for .gitignore parsing and matching"""
+    
+    def test_patterns(self):
+        """
+        TC-T1: Anchored, unanchored, directory-only, negated and ** patterns
+        """
+        rules = parse_gitignore("/build/\n*.log\n!keep.log\ndocs/**/*.tmp\n\\#notes\n[ab].txt\n")
+        
+        assert is_ignored(rules, "build", True)
+        assert not is_ignored(rules, "build", False)
+        assert not is_ignored(rules, "src/build", True)
+        assert is_ignored(rules, "src/deep/debug.log", False)
+        assert not is_ignored(rules, "src/keep.log", False)
+        assert is_ignored(rules, "docs/a/b/x.tmp", False)
+        assert is_ignored(rules, "docs/x.tmp", False)
+        assert is_ignored(rules, "#notes", False)
+        assert is_ignored(rules, "a.txt", False) and not is_ignored(rules, "c.txt", False)
+        assert is_ignored(rules, ".git", True)
+    
+    def test_nested_file_is_relative_to_its_directory(self):
+        """
+        TC-T2: Rules from a nested .gitignore apply below its directory only
+        """
+        rules = parse_gitignore("*.log\n") + parse_gitignore("/gen\n!important.log\n", base="src")
+        
+        assert is_ignored(rules, "src/gen", True)
+        assert not is_ignored(rules, "gen", True)
+        assert not is_ignored(rules, "src/important.log", False)
+        assert is_ignored(rules, "important.log", False)
+
+
+class TestListTreePage:
+    """Tests for list_tree_page()"""
+    
+    def test_root_listing(self, repo):
+        """
+        TC-T3: Directories first, case-insensitive order, ignored entries hidden
+        
+        Given: A project with a .gitignore and a .git directory
+        When: The root is listed
+        Then: Ignored entries are left out
+        And: Entries carry type, size and mtime
+        """
+        page = list_tree_page(repo, cache=TreeCache())
+        
+        assert [e.name for e in page.entries] == ["src", "web", ".gitignore", "README.md", "Zeta.txt"]
+        readme = page.entries[3]
+        assert (readme.type, readme.size, readme.path) == ("file", 9, "README.md")
+        assert readme.mtime == os.stat(repo / "README.md").st_mtime
+        assert page.entries[0].type == "dir" and page.entries[0].size is None
+        assert page.next_cursor is None
+    
+    def test_show_ignored_and_nested(self, repo):
+        """
+        TC-T4: show_ignored marks excluded entries; children of ignored dirs are ignored
+        """
+        cache = TreeCache()
+        
+        root = list_tree_page(repo, show_ignored=True, cache=cache)
+        src = list_tree_page(repo, "src", cache=cache)
+        node_modules = list_tree_page(repo, "web/node_modules", show_ignored=True, cache=cache)
+        
+        assert {e.name: e.ignored for e in root.entries if e.type == "dir"} == {
+            ".git": True, "build": True, "src": False, "web": False,
+        }
+        assert [e.path for e in src.entries] == ["src/pkg", "src/keep.log", "src/main.py"]
+        assert [(e.name, e.ignored) for e in node_modules.entries] == [("left-pad", True)]
+    
+    def test_pagination(self, tmp_path):
+        """
+        TC-T5: Following next_cursor visits every entry exactly once
+        """
+        for i in range(25):
+            (tmp_path / f"file{i:02d}.txt").write_text("x")
+        (tmp_path / "skip.log").write_text("x")
+        (tmp_path / ".gitignore").write_text("*.log\n")
+        
+        names, cursor = [], None
+        while True:
+            page = list_tree_page(tmp_path, cursor=cursor, limit=10, cache=TreeCache())
+            names += [e.name for e in page.entries]
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+        
+        assert names == [".gitignore"] + [f"file{i:02d}.txt" for i in range(25)]
+        with pytest.raises(ValueError):
+            list_tree_page(tmp_path, cursor="!!!", cache=TreeCache())
+    
+    def test_cache_invalidation(self, repo):
+        """
+        TC-T6: Cached listings are reused until the directory or a .gitignore changes
+        """
+        cache = TreeCache()
+        first = list_tree_page(repo, "src", cache=cache)
+        assert list_tree_page(repo, "src", cache=cache).entries[0] is first.entries[0]
+        
+        (repo / "src" / "new.py").write_text("")
+        assert "new.py" in [e.name for e in list_tree_page(repo, "src", cache=cache).entries]
+        
+        (repo / ".gitignore").write_text("*.py\n")
+        names = [e.name for e in list_tree_page(repo, "src", cache=cache).entries]
+        assert "main.py" not in names and "debug.log" in names
+    
+    def test_rejects_paths_outside_root(self, repo, tmp_path_factory):
+        """
+        TC-T7: '..', absolute paths and symlinks out of the project are rejected
+        """
+        outside = tmp_path_factory.mktemp("outside")
+        (repo / "escape").symlink_to(outside)
+        
+        for path in ["../x", "/etc", "escape"]:
+            with pytest.raises(ValueError):
+                list_tree_page(repo, path, cache=TreeCache())
+        with pytest.raises(FileNotFoundError):
+            list_tree_page(repo, "missing", cache=TreeCache())
+        with pytest.raises(NotADirectoryError):
+            list_tree_page(repo, "README.md", cache=TreeCache())
+    
+    def test_page_stops_after_next_visible_entry(self, tmp_path):
+        """
+        TC-T9: A page looks at most one visible entry past its end
+        
+        Given: A directory of 3 files followed by 500 ignored ones
+        When: Pages of 2 entries are listed
+        Then: The first page stops at the third file instead of scanning the tail
+        And: The last page has no next_cursor even though ignored entries follow
+        """
+        for name in ["a.txt", "b.txt", "c.txt"]:
+            (tmp_path / name).write_text("x")
+        for i in range(500):
+            (tmp_path / f"z{i:03d}.log").write_text("x")
+        (tmp_path / ".gitignore").write_text("*.log\n")
+        listing = TreeCache().listing(tmp_path, "")
+        seen = []
+        
+        class Entries(list):
+            def __getitem__(self, i):
+                seen.append(i)
+                return super().__getitem__(i)
+        
+        class Cache:
+            def listing(self, root, rel_dir):
+                return listing._replace(entries=Entries(listing.entries))
+        
+        first = list_tree_page(tmp_path, limit=2, cache=Cache())
+        assert [e.name for e in first.entries] == [".gitignore", "a.txt"]
+        assert max(seen) <= 3
+        
+        last = list_tree_page(tmp_path, cursor=first.next_cursor, limit=2, cache=Cache())
+        assert [e.name for e in last.entries] == ["b.txt", "c.txt"]
+        assert last.next_cursor is None
+
+
+def test_tree_endpoint(repo, monkeypatch, test_client):
+    """
+    TC-T8: GET /api/files/tree lists one directory of a project
+    
+    Given: A project directory under projects_base_dir
+    When: The tree endpoint is called for the root, a subdirectory and bad input
+    Then: Pages are returned as TreePage JSON
+    And: Invalid ids/paths get 400, missing directories 404
+    """
+    from modules.files.tree import tree_cache
+    monkeypatch.setattr("config.settings.projects_base_dir", repo.parent)
+    tree_cache.clear()
+    
+    response = test_client.get("/api/files/tree", params={"project": repo.name, "limit": 2})
+    body = response.json()
+    assert response.status_code == 200
+    assert [e["name"] for e in body["entries"]] == ["src", "web"]
+    assert body["path"] == "" and body["next_cursor"]
+    
+    response = test_client.get("/api/files/tree", params={"project": repo.name, "path": "src/pkg"})
+    assert response.json() == {"path": "src/pkg", "entries": [], "next_cursor": None}
+    
+    assert test_client.get("/api/files/tree", params={"project": ".."}).status_code == 400
+    assert test_client.get("/api/files/tree", params={"project": repo.name, "path": "../x"}).status_code == 400
+    assert test_client.get("/api/files/tree", params={"project": repo.name, "path": "nope"}).status_code == 404
@@ -0,0 +1,107 @@
+"""
+Unit tests for metrics, spans and the timing middleware.
+"""
+import json
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from modules.files.service import run_io
+from modules.metrics.middleware import TimingMiddleware
+from modules.metrics.service import Registry, server_timing_header, span
+from modules.projects import service
+
+
+def test_registry_renders_prometheus_text():
+    """
+    TC-M1: Counters and histograms render in the Prometheus text format
+    """
+    registry = Registry()
+    reads = registry.counter("reads_total", "Reads", ["kind"])
+    latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    registry.callback("cache_size", "Entries", lambda: 3)
+    
+    reads.inc(kind='a"b')
+    reads.inc(2, kind='a"b')
+    latency.observe(0.05)
+    latency.observe(0.5)
+    latency.observe(5)
+    
+    lines = registry.render().splitlines()
+    
+    assert "# TYPE reads_total counter" in lines
+    assert 'reads_total{kind="a\\"b"} 3' in lines
+    assert 'latency_seconds_bucket{le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{le="1"} 2' in lines
+    assert 'latency_seconds_bucket{le="+Inf"} 3' in lines
+    assert "latency_seconds_sum 5.55" in lines
+    assert "latency_seconds_count 3" in lines
+    assert "cache_size 3" in lines
+    assert registry.counter("reads_total", "Reads", ["kind"]) is reads
+
+
+def test_server_timing_header():
+    """
+    TC-M2: Server-Timing aggregates spans by name
+    """
+    header = server_timing_header({"scan": [0.012, 1], "read": [0.003, 4]}, total=0.02)
+    
+    assert header == 'scan;dur=12.00, read;dur=3.00;desc="4x", total;dur=20.00'
+
+
+def test_middleware_server_timing_follows_run_io():
+    """
+    TC-M3: Spans recorded on the I/O executor reach the request's Server-Timing header
+    
+    Given: An app with TimingMiddleware(server_timing=True)
+    And: An endpoint whose work runs in a span on the I/O executor
+    When: The endpoint is called
+    Then: The Server-Timing header lists that span and the total
+    """
+    app = FastAPI()
+    app.add_middleware(TimingMiddleware, server_timing=True)
+    
+    def work():
+        with span("work"):
+            return 42
+    
+    @app.get("/work")
+    async def get_work():
+        return {"value": await run_io(work)}
+    
+    response = TestClient(app).get("/work")
+    
+    assert response.json() == {"value": 42}
+    assert response.headers["server-timing"].startswith("work;dur=")
+    assert ", total;dur=" in response.headers["server-timing"]
+
+
+def test_metrics_endpoint_counts_scan(tmp_path, monkeypatch, test_client):
+    """
+    TC-M4: /metrics exposes route latency and scan counters
+    
+    Given: A projects directory with one valid and one malformed project
+    When: GET /api/projects is called, then GET /metrics
+    Then: The route histogram, read counters and validation failures are reported
+    """
+    monkeypatch.setattr(service.settings, "projects_base_dir", tmp_path)
+    for repo, content in (("kjbot", json.dumps({
+        "project_name": "KJBot",
+        "repo_name": "kjbot",
+        "description": "Karaoke DJ system",
+        "created_at": "2025-11-15T10:30:00Z"
+    })), ("broken", "{ not json")):
+        (tmp_path / repo / ".contextkeep").mkdir(parents=True)
+        (tmp_path / repo / ".contextkeep" / "project.json").write_text(content)
+    failures = service.VALIDATION_FAILURES.value()
+    
+    assert test_client.get("/api/projects?limit=10").status_code == 200
+    response = test_client.get("/metrics")
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert service.VALIDATION_FAILURES.value() == failures + 1
+    text = response.text
+    assert 'contextkeep_http_request_duration_seconds_count{method="GET",handler="get_projects",status="200"}' in text
+    assert 'contextkeep_span_duration_seconds_count{span="scan"}' in text
+    assert "contextkeep_files_read_total" in text
+    assert "contextkeep_bytes_read_total" in text
+    assert "contextkeep_metadata_cache_hits_total" in text
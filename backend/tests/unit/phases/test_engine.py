@@ -0,0 +1,89 @@
+"""
+Unit tests for the incremental dependency graph.
+"""
+import pytest
+from modules.phases.engine import DependencyGraph
+
+
+def _sum_graph():
+    graph = DependencyGraph()
+    for key in ["a", "b", "c"]:
+        graph.set(key, 1)
+    graph.define("ab", ["a", "b"], lambda a, b: a + b)
+    graph.define("c2", ["c"], lambda c: c * 2)
+    graph.define("total", ["ab", "c2"], lambda ab, c2: ab + c2)
+    return graph
+
+
+def test_only_downstream_nodes_are_recomputed():
+    """
+    TC-G1: Changing a source recomputes only the nodes that depend on it
+    
+    Given: total = (a + b) + 2c
+    When: c changes
+    Then: Only c2 and total are recomputed
+    And: Every value is up to date
+    """
+    graph = _sum_graph()
+    assert graph.get("total") == 4
+    graph.recomputations = 0
+    
+    changed = graph.set("c", 5)
+    
+    assert changed == {"c", "c2", "total"}
+    assert graph.recomputations == 2
+    assert graph.get("ab") == 2 and graph.get("total") == 12
+
+
+def test_unchanged_values_stop_propagation():
+    """
+    TC-G2: A recomputed value equal to the previous one is not propagated
+    
+    Given: big = (a + b) > 1 and out = f(big)
+    When: a changes so that big stays True
+    Then: ab, total and big are recomputed but out is not
+    And: Setting a source to its current value recomputes nothing
+    """
+    graph = _sum_graph()
+    graph.define("big", ["ab"], lambda ab: ab > 1)
+    graph.define("out", ["big"], lambda big: "big" if big else "small")
+    graph.recomputations = 0
+    
+    assert graph.set("a", 5) == {"a", "ab", "total"}
+    assert graph.recomputations == 3
+    assert graph.get("out") == "big"
+    assert graph.set("a", 5) == set()
+    assert graph.recomputations == 3
+
+
+def test_redefine_and_cycles():
+    """
+    TC-G3: Redefining a node recomputes it and its dependents; cycles are rejected
+    """
+    graph = _sum_graph()
+    graph.define("ab", ["a", "b", "new"], lambda a, b, new: a + b + (new or 0))
+    assert graph.get("new") is None and graph.get("total") == 4
+    assert graph.set("new", 10) == {"new", "ab", "total"}
+    assert graph.get("total") == 14
+    
+    with pytest.raises(ValueError):
+        graph.define("a", ["total"], lambda total: total)
+    with pytest.raises(ValueError):
+        graph.set("total", 1)
+
+
+def test_discard():
+    """
+    TC-G4: Discarded nodes disappear, or become None while still used as input
+    """
+    graph = _sum_graph()
+    graph.define("c2", ["c"], lambda c: (c or 0) * 2)
+    graph.discard("c")
+    assert "c" in graph and graph.get("c") is None
+    assert graph.get("total") == 2
+    
+    graph.define("total", ["ab"], lambda ab: ab)
+    graph.discard("c2")
+    graph.discard("c")
+    assert "c" not in graph and "c2" not in graph
+    assert graph.get("total") == 2
@@ -0,0 +1,139 @@
+"""
+Unit tests for the phases service.
+"""
+import json
+import pytest
+from modules.phases.models import Phase
+from modules.phases.service import PhaseEngine, handler_state_path
+
+
+def _write_state(project, service, handler, phase):
+    path = handler_state_path(project, service, handler)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"phase": phase}))
+
+
+@pytest.fixture
+def project(tmp_path):
+    project = tmp_path / "shop"
+    _write_state(project, "billing", "create_invoice", "VERIFIED")
+    _write_state(project, "billing", "refund", "IMPLEMENTING")
+    _write_state(project, "orders", "place_order", "SPEC_DRAFTED")
+    _write_state(project, "users", "login", "IMPLEMENTED")
+    return project
+
+
+def test_refresh_derives_service_phases(project):
+    """
+    TC-PH1: Service phases are derived from their handler state files
+    
+    Given: A project with three services and four handler state files
+    When: The engine refreshes the project
+    Then: Each service's phase is its least advanced handler phase
+    And: Invalid state files count as null handlers
+    """
+    (handler_state_path(project, "users", "logout")).write_text("{ nope")
+    engine = PhaseEngine()
+    
+    assert engine.refresh("shop", project) == 5
+    
+    services = {s.name: s for s in engine.services("shop")}
+    assert list(services) == ["billing", "orders", "users"]
+    assert services["billing"].phase == Phase.IMPLEMENTING
+    assert services["billing"].counts == {Phase.VERIFIED: 1, Phase.IMPLEMENTING: 1}
+    assert services["orders"].phase == Phase.SPEC_DRAFTED
+    assert services["users"].phase == Phase.IMPLEMENTED
+    assert services["users"].handlers == {"login": Phase.IMPLEMENTED, "logout": None}
+
+
+def test_refresh_recomputes_only_changed_services(project):
+    """
+    TC-PH2: A changed state file recomputes only its service and the project
+    
+    Given: A refreshed project
+    When: One handler file changes, then nothing changes
+    Then: The first refresh recomputes two nodes, the second none
+    And: Unchanged services keep the same status objects
+    """
+    engine = PhaseEngine()
+    engine.refresh("shop", project)
+    before = {s.name: s for s in engine.services("shop")}
+    engine.graph.recomputations = 0
+    
+    _write_state(project, "billing", "refund", "IMPLEMENTED")
+    assert engine.refresh("shop", project) == 1
+    assert engine.graph.recomputations == 2
+    
+    after = {s.name: s for s in engine.services("shop")}
+    assert after["billing"].phase == Phase.IMPLEMENTED
+    assert after["orders"] is before["orders"]
+    
+    engine.graph.recomputations = 0
+    assert engine.refresh("shop", project) == 0
+    assert engine.graph.recomputations == 0
+
+
+def test_refresh_follows_added_and_removed_files(project):
+    """
+    TC-PH3: Added and removed handlers and services are picked up
+    """
+    engine = PhaseEngine()
+    engine.refresh("shop", project)
+    
+    _write_state(project, "search", "query", "SPEC_ADDABLE")
+    handler_state_path(project, "users", "login").unlink()
+    handler_state_path(project, "billing", "refund").unlink()
+    assert engine.refresh("shop", project) == 3
+    
+    services = {s.name: s for s in engine.services("shop")}
+    assert list(services) == ["billing", "orders", "search"]
+    assert services["billing"].phase == Phase.VERIFIED
+    assert services["search"].phase == Phase.SPEC_ADDABLE
+    assert ("handler", "shop", "users", "login") not in engine.graph
+
+
+def test_set_handler_phase_writes_and_applies(project):
+    """
+    TC-PH4: Setting a phase writes the state file and updates the status at once
+    """
+    engine = PhaseEngine()
+    engine.refresh("shop", project)
+    
+    status = engine.set_handler_phase("shop", project, "orders", "cancel_order", Phase.SPEC_ACCEPTED)
+    
+    assert status.handlers == {"cancel_order": Phase.SPEC_ACCEPTED, "place_order": Phase.SPEC_DRAFTED}
+    saved = json.loads(handler_state_path(project, "orders", "cancel_order").read_text())
+    assert saved["phase"] == "SPEC_ACCEPTED"
+    assert engine.refresh("shop", project) == 0
+
+
+def test_services_endpoint(project, monkeypatch, test_client):
+    """
+    TC-PH5: The services endpoints read and update phases of a project
+    
+    Given: A project under projects_base_dir
+    When: Its services are listed and a handler phase is set
+    Then: Statuses are returned as JSON
+    And: Invalid ids get 400, missing projects 404
+    """
+    monkeypatch.setattr("modules.phases.service.settings.projects_base_dir", project.parent)
+    monkeypatch.setattr("modules.phases.service.settings.phase_refresh_seconds", 0.0)
+    
+    response = test_client.get("/api/projects/shop/services")
+    body = response.json()
+    assert response.status_code == 200
+    assert body["project"] == "shop"
+    assert [(s["name"], s["phase"]) for s in body["services"]] == [
+        ("billing", "IMPLEMENTING"), ("orders", "SPEC_DRAFTED"), ("users", "IMPLEMENTED"),
+    ]
+    
+    response = test_client.put(
+        "/api/projects/shop/services/users/handlers/login", json={"phase": "VERIFIED"}
+    )
+    assert response.status_code == 200 and response.json()["phase"] == "VERIFIED"
+    
+    assert test_client.get("/api/projects/missing/services").status_code == 404
+    assert test_client.get("/api/projects/../services").status_code in (400, 404)
+    assert test_client.put(
+        "/api/projects/shop/services/.x/handlers/login", json={"phase": "VERIFIED"}
+    ).status_code == 400
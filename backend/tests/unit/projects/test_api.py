@@ -2,6 +2,7 @@
 Unit tests for projects API endpoints.
 """
 from unittest.mock import patch
+import json
 from datetime import datetime
 from modules.projects.models import ProjectSummary
 
@@ -42,4 +43,36 @@ def test_get_projects_endpoint_unit(mock_list_projects, test_client):
     
     data = response.json()
     assert len(data["projects"]) == 2
-    assert data["projects"][0]["project_name"] == "KJBot"
\ No newline at end of file
+    assert data["projects"][0]["project_name"] == "KJBot"
+
+
+@patch('modules.projects.api.iter_projects')
+def test_get_projects_ndjson_stream(mock_iter_projects, test_client):
+    """
+    TC-P8: GET /api/projects streams NDJSON when asked to
+    
+    Given: Service layer is mocked to yield two projects
+    When: GET /api/projects is called with Accept: application/x-ndjson
+    Then: Returns one JSON object per line
+    """
+    mock_iter_projects.return_value = iter([
+        ProjectSummary(
+            project_name="KJBot",
+            repo_name="kjbot",
+            description="Test project",
+            created_at=datetime(2025, 11, 15, 10, 30)
+        ),
+        ProjectSummary(
+            project_name="TaskFlow",
+            repo_name="taskflow",
+            description="Another test",
+            created_at=datetime(2025, 11, 14, 15, 22)
+        )
+    ])
+    
+    response = test_client.get("/api/projects", headers={"Accept": "application/x-ndjson"})
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = response.text.splitlines()
+    assert [json.loads(line)["project_name"] for line in lines] == ["KJBot", "TaskFlow"]
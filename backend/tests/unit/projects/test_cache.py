@@ -0,0 +1,112 @@
+"""
+Unit tests for the project metadata cache.
+"""
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+from modules.files.service import read_json_file
+from modules.projects import service
+from modules.projects.cache import MetadataCache, MISS
+from modules.projects.records import ProjectRecord
+
+
+def _summary(name: str) -> ProjectRecord:
+    return ProjectRecord(name, name.lower(), "Test project", datetime(2025, 11, 15, 10, 30))
+
+
+class TestMetadataCache:
+    """Tests for MetadataCache"""
+    
+    def test_get_matching_stamp_hits(self):
+        """
+        TC-C1: Cached entry is returned while the stamp is unchanged
+        """
+        cache = MetadataCache()
+        summary = _summary("KJBot")
+        cache.put(Path("/p/project.json"), (1, 2, 3), summary)
+        
+        assert cache.get(Path("/p/project.json"), (1, 2, 3)) is summary
+        assert cache.get(Path("/p/project.json"), (9, 2, 3)) is MISS
+        assert cache.get(Path("/other.json"), (1, 2, 3)) is MISS
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 2
+    
+    def test_invalid_metadata_is_cached_as_none(self):
+        """
+        TC-C2: A None result is a hit, not a miss
+        """
+        cache = MetadataCache()
+        cache.put(Path("/p/project.json"), (1, 2, 3), None)
+        
+        assert cache.get(Path("/p/project.json"), (1, 2, 3)) is None
+    
+    def test_size_bound_evicts_least_recently_used(self):
+        """
+        TC-C3: Cache never grows beyond max_entries
+        """
+        cache = MetadataCache(max_entries=2)
+        cache.put(Path("/a"), (1, 1, 1), _summary("A"))
+        cache.put(Path("/b"), (1, 1, 1), _summary("B"))
+        cache.get(Path("/a"), (1, 1, 1))
+        cache.put(Path("/c"), (1, 1, 1), _summary("C"))
+        
+        assert len(cache) == 2
+        assert cache.get(Path("/b"), (1, 1, 1)) is MISS
+        assert cache.get(Path("/a"), (1, 1, 1)) is not MISS
+    
+    def test_retain_evicts_missing_paths(self):
+        """
+        TC-C4: retain() drops entries not in the given set
+        """
+        cache = MetadataCache()
+        cache.put(Path("/a"), (1, 1, 1), _summary("A"))
+        cache.put(Path("/b"), (1, 1, 1), _summary("B"))
+        
+        assert cache.retain([Path("/a")]) == 1
+        assert len(cache) == 1
+
+
+class TestListProjectsCaching:
+    """Tests for list_projects() cache behaviour with real files"""
+    
+    def test_only_changed_files_are_reparsed(self, tmp_path, monkeypatch, write_project):
+        """
+        TC-C5: Second scan re-reads only the modified project.json
+        
+        Given: Two valid projects that have been listed once
+        When: One project.json is rewritten and list_projects() is called again
+        Then: Only that file is read again
+        And: The listing reflects the new content
+        """
+        monkeypatch.setattr(service.settings, "projects_base_dir", tmp_path)
+        write_project(tmp_path, "kjbot", "KJBot")
+        taskflow = write_project(tmp_path, "taskflow", "TaskFlow")
+        
+        with patch("modules.projects.service.read_json_file", wraps=read_json_file) as mock_read:
+            assert [p.project_name for p in service.list_projects()] == ["KJBot", "TaskFlow"]
+            assert mock_read.call_count == 2
+            
+            service.list_projects()
+            assert mock_read.call_count == 2
+            
+            write_project(tmp_path, "taskflow", "TaskFlow Renamed")
+            result = service.list_projects()
+            assert mock_read.call_count == 3
+            assert mock_read.call_args[0][0] == taskflow
+            assert [p.project_name for p in result] == ["KJBot", "TaskFlow Renamed"]
+    
+    def test_deleted_projects_are_evicted(self, tmp_path, monkeypatch, write_project):
+        """
+        TC-C6: Removing a project directory evicts its cache entry
+        """
+        monkeypatch.setattr(service.settings, "projects_base_dir", tmp_path)
+        write_project(tmp_path, "kjbot", "KJBot")
+        removed = write_project(tmp_path, "old", "Old")
+        service.list_projects()
+        
+        removed.unlink()
+        removed.parent.rmdir()
+        removed.parent.parent.rmdir()
+        
+        assert [p.project_name for p in service.list_projects()] == ["KJBot"]
+        assert service.metadata_cache.get(removed, (0, 0, 0)) is MISS
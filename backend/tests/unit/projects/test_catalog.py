@@ -0,0 +1,77 @@
+"""
+Unit tests for the persistent project catalog.
+"""
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import patch
+import pytest
+from modules.projects import service
+from modules.projects.catalog import ProjectCatalog
+from modules.projects.records import ProjectRecord
+
+
+@pytest.fixture
+def projects_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(service.settings, "projects_base_dir", tmp_path)
+    monkeypatch.setattr(service, "_catalog_version", None)
+    yield tmp_path
+    service.stop_watching()
+
+
+def test_catalog_round_trip(tmp_path):
+    """
+    TC-K1: Rows saved to the catalog load back unchanged
+    """
+    catalog = ProjectCatalog(tmp_path / "catalog.db")
+    summary = ProjectRecord("KJBot", "kjbot", "Karaoke", datetime(2025, 11, 15, 10, 30, tzinfo=timezone.utc))
+    catalog.save([(Path("/p/kjbot"), (1, 2, 3), summary)])
+    
+    rows = catalog.load()
+    
+    assert rows == [(Path("/p/kjbot"), (1, 2, 3), summary)]
+
+
+def test_catalog_missing_or_corrupt(tmp_path):
+    """
+    TC-K2: A missing or corrupt catalog loads as empty
+    """
+    assert ProjectCatalog(tmp_path / "missing.db").load() == []
+    
+    (tmp_path / "corrupt.db").write_text("not a database")
+    assert ProjectCatalog(tmp_path / "corrupt.db").load() == []
+
+
+def test_boot_serves_catalog_then_reconciles(projects_dir, monkeypatch, write_project):
+    """
+    TC-K3: Cold start serves the catalog, background scan reconciles
+    
+    Given: A catalog saved from two projects
+    And: A fresh process state (empty cache and index)
+    When: load_catalog() runs
+    Then: list_projects() answers from the catalog without reading any file
+    When: One project changed on disk and reconcile_in_background() finishes
+    Then: The listing reflects the change and only that file was parsed
+    """
+    write_project(projects_dir, "kjbot", "KJBot")
+    write_project(projects_dir, "taskflow", "TaskFlow")
+    service.list_projects()
+    service.save_catalog()
+    assert (projects_dir / service.CATALOG_FILE).exists()
+    
+    # Simulate a restart
+    service.project_index.clear()
+    service.metadata_cache.clear()
+    
+    assert service.load_catalog() == 2
+    with patch.object(service, "list_directories", side_effect=AssertionError("scanned")):
+        assert [p.project_name for p in service.list_projects()] == ["KJBot", "TaskFlow"]
+    
+    write_project(projects_dir, "taskflow", "TaskFlow Renamed")
+    reads = []
+    real_read = service.read_json_file
+    monkeypatch.setattr(service, "read_json_file", lambda path, *args: reads.append(path) or real_read(path, *args))
+    service.reconcile_in_background().join(5)
+    
+    assert service.project_index.live is False
+    assert [p.project_name for p in service.list_projects()] == ["KJBot", "TaskFlow Renamed"]
+    assert reads == [projects_dir / "taskflow" / ".contextkeep" / "project.json"]
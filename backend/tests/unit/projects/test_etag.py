@@ -0,0 +1,93 @@
+"""
+Unit tests for conditional GET /api/projects (ETag / If-None-Match).
+"""
+from unittest.mock import patch
+import pytest
+from modules.projects import service
+from modules.projects.api import _etag_matches
+
+
+@pytest.fixture
+def projects_dir(tmp_path, monkeypatch, write_project):
+    monkeypatch.setattr(service.settings, "projects_base_dir", tmp_path)
+    write_project(tmp_path, "kjbot", "KJBot")
+    return tmp_path
+
+
+def test_etag_matches():
+    """
+    TC-E1: If-None-Match parsing handles lists, weak tags and *
+    """
+    assert _etag_matches('"abc"', '"abc"')
+    assert _etag_matches('"x", W/"abc"', '"abc"')
+    assert _etag_matches("*", '"abc"')
+    assert not _etag_matches('"abcd"', '"abc"')
+    assert not _etag_matches(None, '"abc"')
+
+
+def test_not_modified_skips_listing(projects_dir, test_client):
+    """
+    TC-E2: A current client gets 304 without any listing work
+    
+    Given: A first GET returned an ETag
+    When: The client repeats the request with If-None-Match
+    Then: Response is 304 with no body
+    And: list_projects() is not called
+    """
+    first = test_client.get("/api/projects")
+    assert first.status_code == 200
+    assert first.json()["projects"][0]["project_name"] == "KJBot"
+    assert "last-modified" in first.headers
+    etag = first.headers["etag"]
+    
+    with patch("modules.projects.api.list_projects") as mock_list:
+        second = test_client.get("/api/projects", headers={"If-None-Match": etag})
+        assert mock_list.call_count == 0
+    
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["etag"] == etag
+
+
+def test_repeat_hit_reuses_serialized_body(projects_dir, test_client):
+    """
+    TC-E3: Unchanged listings are served from the cached body
+    """
+    first = test_client.get("/api/projects")
+    
+    with patch("modules.projects.api.list_projects") as mock_list:
+        second = test_client.get("/api/projects")
+        assert mock_list.call_count == 0
+    
+    assert second.content == first.content
+
+
+def test_change_invalidates_etag(projects_dir, test_client, write_project):
+    """
+    TC-E4: Editing metadata yields a new ETag and a full response
+    """
+    etag = test_client.get("/api/projects").headers["etag"]
+    
+    write_project(projects_dir, "taskflow", "TaskFlow")
+    response = test_client.get("/api/projects", headers={"If-None-Match": etag})
+    
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert [p["project_name"] for p in response.json()["projects"]] == ["KJBot", "TaskFlow"]
+
+
+def test_live_index_etag_is_constant_time(projects_dir, write_project):
+    """
+    TC-E5: With a live index the ETag comes from the index version
+    """
+    service.project_index.replace_all(service.scan_projects())
+    service.project_index.live = True
+    try:
+        with patch.object(service, "list_directories", side_effect=AssertionError("scanned")):
+            etag, _ = service.projects_etag()
+            assert service.projects_etag()[0] == etag
+        write_project(projects_dir, "taskflow", "TaskFlow")
+        service.project_index.update(projects_dir / "taskflow", service.load_project(projects_dir / "taskflow"))
+        assert service.projects_etag()[0] != etag
+    finally:
+        service.project_index.clear()
@@ -0,0 +1,211 @@
+"""
+Unit tests for reading the git state of projects.
+
+Repositories are created with the git command line (tests are skipped
+without it) and read back by modules.projects.gitrepo, which never runs git.
+"""
+import json
+import shutil
+import subprocess
+from pathlib import Path
+from unittest.mock import patch
+import pytest
+from modules.projects import gitinfo, service
+from modules.projects.gitrepo import Repository
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+
+
+def _git(repo: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", "-c", "user.name=Test", "-c", "user.email=test@example.com", *args],
+        cwd=repo, check=True, capture_output=True, text=True,
+    ).stdout.strip()
+
+
+def _make_repo(base: Path, repo: str, name: str) -> Path:
+    project_dir = base / repo
+    (project_dir / ".contextkeep").mkdir(parents=True)
+    (project_dir / ".contextkeep" / "project.json").write_text(json.dumps({
+        "project_name": name,
+        "repo_name": repo,
+        "description": "Test project",
+        "created_at": "2025-11-15T10:30:00Z"
+    }))
+    (project_dir / "README.md").write_text("# " + name + "\n")
+    _git(project_dir, "init", "-q", "-b", "main")
+    _git(project_dir, "add", ".")
+    _git(project_dir, "commit", "-q", "-m", "Initial commit\n\nWith a body")
+    return project_dir
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(gitinfo.settings, "git_status_seconds", 0.0)
+    gitinfo.git_cache.clear()
+    yield
+    gitinfo.git_cache.clear()
+
+
+def test_reads_branch_head_and_last_commit(tmp_path):
+    """
+    TC-GI1: Branch, HEAD and last commit come straight from .git
+    
+    Given: A repository with one commit on main and a directory without git
+    When: git_info() is called for both
+    Then: The repository reports main, its HEAD sha, the commit summary
+          and author and a clean tree; the other directory reports None
+    """
+    repo = _make_repo(tmp_path, "kjbot", "KJBot")
+    (tmp_path / "plain").mkdir()
+    
+    result = gitinfo.git_info([repo, tmp_path / "plain"])
+    
+    info = result[repo]
+    assert info.branch == "main"
+    assert info.head == _git(repo, "rev-parse", "HEAD")
+    assert info.dirty is False
+    assert info.last_commit.summary == "Initial commit"
+    assert info.last_commit.author == "Test"
+    assert info.last_commit.committed_at.timestamp() == int(_git(repo, "log", "-1", "--format=%ct"))
+    assert result[tmp_path / "plain"] is None
+
+
+def test_dirty_state(tmp_path):
+    """
+    TC-GI2: Unstaged, staged and reverted changes are reflected
+    
+    Given: A clean repository
+    When: A tracked file is edited, reverted, staged with a change and deleted
+    Then: dirty follows what `git status --untracked-files=no` reports
+    """
+    repo = _make_repo(tmp_path, "kjbot", "KJBot")
+    readme = repo / "README.md"
+    
+    def dirty():
+        expected = _git(repo, "status", "--porcelain", "--untracked-files=no") != ""
+        assert gitinfo.git_cache.get(repo).dirty is expected
+        return expected
+    
+    assert not dirty()
+    readme.write_text("# Changed\n")
+    assert dirty()
+    readme.write_text("# KJBot\n")
+    assert not dirty()
+    (repo / "untracked.txt").write_text("ignored by the dirty check")
+    assert not dirty()
+    readme.write_text("# Staged\n")
+    _git(repo, "add", "README.md")
+    assert dirty()
+    _git(repo, "commit", "-q", "-m", "Second")
+    assert not dirty()
+    readme.unlink()
+    assert dirty()
+
+
+def test_packed_objects_and_detached_head(tmp_path):
+    """
+    TC-GI3: Packed (delta-compressed) objects and a detached HEAD are read
+    
+    Given: A repository with several commits, repacked aggressively, with
+           HEAD detached at an older commit
+    When: git_info() is called
+    Then: branch is None and HEAD, the last commit and the clean state
+          match git's
+    """
+    repo = _make_repo(tmp_path, "kjbot", "KJBot")
+    for n in range(5):
+        (repo / "README.md").write_text("# KJBot\n" + "line\n" * 50 + f"revision {n}\n")
+        _git(repo, "commit", "-q", "-am", f"Revision {n}")
+    _git(repo, "gc", "-q", "--aggressive")
+    _git(repo, "checkout", "-q", "HEAD~2")
+    assert not list((repo / ".git" / "objects").glob("??/*"))
+    
+    info = gitinfo.git_info([repo])[repo]
+    
+    assert info.branch is None
+    assert info.head == _git(repo, "rev-parse", "HEAD")
+    assert info.last_commit.summary == "Revision 2"
+    assert info.dirty is False
+
+
+def test_cached_until_head_index_or_ref_changes(tmp_path, monkeypatch):
+    """
+    TC-GI4: Repositories are only re-read when HEAD, the index or the branch ref change
+    
+    Given: A repository whose state has been read
+    When: It is looked up again unchanged, then after a new commit
+    Then: The unchanged lookup reads no objects; after the commit the new
+          HEAD is reported
+    """
+    monkeypatch.setattr(gitinfo.settings, "git_status_seconds", 60.0)
+    repo = _make_repo(tmp_path, "kjbot", "KJBot")
+    gitinfo.git_cache.get(repo)
+    
+    with patch.object(Repository, "commit", side_effect=AssertionError("re-read")):
+        assert gitinfo.git_cache.get(repo).dirty is False
+    
+    _git(repo, "commit", "-q", "--allow-empty", "-m", "Empty")
+    
+    info = gitinfo.git_cache.get(repo)
+    assert info.head == _git(repo, "rev-parse", "HEAD")
+    assert info.last_commit.summary == "Empty"
+
+
+def test_projects_git_endpoint(tmp_path, monkeypatch, test_client):
+    """
+    TC-GI5: GET /api/projects/git reports listed projects by id
+    
+    Given: Two projects, one of them a git repository
+    When: GET /api/projects/git is called without ids, then with ids
+    Then: Every project is reported in listing order; requested ids are
+          reported in request order, unknown ids with git null
+    """
+    monkeypatch.setattr(service.settings, "projects_base_dir", tmp_path)
+    service.project_index.clear()
+    _make_repo(tmp_path, "kjbot", "KJBot")
+    (tmp_path / "atlas" / ".contextkeep").mkdir(parents=True)
+    (tmp_path / "atlas" / ".contextkeep" / "project.json").write_text(json.dumps({
+        "project_name": "Atlas",
+        "repo_name": "atlas",
+        "description": "Test project",
+        "created_at": "2025-11-15T10:30:00Z"
+    }))
+    
+    response = test_client.get("/api/projects/git")
+    
+    assert response.status_code == 200
+    projects = response.json()["projects"]
+    assert [p["id"] for p in projects] == ["atlas", "kjbot"]
+    assert projects[0]["git"] is None
+    assert projects[1]["git"]["branch"] == "main"
+    
+    response = test_client.get("/api/projects/git", params=[("ids", "kjbot"), ("ids", "missing")])
+    
+    assert [(p["id"], p["git"] is not None) for p in response.json()["projects"]] == [
+        ("kjbot", True), ("missing", False)
+    ]
+
+
+def test_ids_resolve_to_first_root(tmp_path, monkeypatch, test_client):
+    """
+    TC-GI6: An id held by two roots reports the project of the first root
+    
+    Given: A git repository "kjbot" in the primary root and a plain
+           "kjbot" project in an extra root that sorts before it
+    When: GET /api/projects/git?ids=kjbot is called
+    Then: The primary root's repository is reported
+    """
+    primary, extra = tmp_path / "b-primary", tmp_path / "a-extra"
+    monkeypatch.setattr(service.settings, "projects_base_dir", primary)
+    monkeypatch.setattr(service.settings, "extra_projects_dirs", [extra])
+    service.project_index.clear()
+    _make_repo(primary, "kjbot", "KJBot")
+    (extra / "kjbot" / ".contextkeep").mkdir(parents=True)
+    (extra / "kjbot" / ".contextkeep" / "project.json").write_text(
+        (primary / "kjbot" / ".contextkeep" / "project.json").read_text()
+    )
+    
+    response = test_client.get("/api/projects/git", params={"ids": "kjbot"})
+    
+    assert response.json()["projects"][0]["git"]["branch"] == "main"
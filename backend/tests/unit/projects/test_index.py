@@ -0,0 +1,101 @@
+"""
+Unit tests for the live project index.
+"""
+from datetime import datetime
+from pathlib import Path
+from modules.projects.index import ProjectIndex
+from modules.projects.records import ProjectRecord
+
+
+def _summary(name: str) -> ProjectRecord:
+    return ProjectRecord(name, name.lower(), "Test project", datetime(2025, 11, 15, 10, 30))
+
+
+def test_replace_all_sorts_case_insensitive():
+    """
+    TC-X1: Full replacement produces a case-insensitively sorted snapshot
+    """
+    index = ProjectIndex()
+    index.replace_all({
+        Path("/p/weather"): _summary("WeatherAPI"),
+        Path("/p/kjbot"): _summary("kjbot"),
+        Path("/p/taskflow"): _summary("TaskFlow"),
+    })
+    
+    assert [p.project_name for p in index.snapshot()] == ["kjbot", "TaskFlow", "WeatherAPI"]
+    assert index.version == 1
+
+
+def test_replace_all_unchanged_keeps_version():
+    """
+    TC-X2: Replacing with identical summaries is not a change
+    """
+    index = ProjectIndex()
+    entries = {Path("/p/kjbot"): _summary("KJBot")}
+    index.replace_all(entries)
+    
+    assert index.replace_all(dict(entries)) is False
+    assert index.version == 1
+
+
+def test_update_insert_replace_remove():
+    """
+    TC-X3: Incremental updates keep the snapshot sorted
+    
+    Given: An index with two projects
+    When: A project is added, one renamed and one removed
+    Then: Each snapshot reflects the change in sorted order
+    And: Previously returned snapshots are not modified
+    """
+    index = ProjectIndex()
+    index.replace_all({
+        Path("/p/kjbot"): _summary("KJBot"),
+        Path("/p/weather"): _summary("WeatherAPI"),
+    })
+    before = index.snapshot()
+    
+    index.update(Path("/p/taskflow"), _summary("TaskFlow"))
+    assert [p.project_name for p in index.snapshot()] == ["KJBot", "TaskFlow", "WeatherAPI"]
+    
+    index.update(Path("/p/kjbot"), _summary("Zeta"))
+    assert [p.project_name for p in index.snapshot()] == ["TaskFlow", "WeatherAPI", "Zeta"]
+    
+    index.update(Path("/p/weather"), None)
+    assert [p.project_name for p in index.snapshot()] == ["TaskFlow", "Zeta"]
+    
+    assert [p.project_name for p in before] == ["KJBot", "WeatherAPI"]
+    assert index.update(Path("/p/missing"), None) is False
+
+
+def test_update_many_is_one_change():
+    """
+    TC-X4: update_many() applies a batch under a single version
+    
+    Given: An index with two projects
+    When: update_many() adds one, renames one and removes one, then
+          a batch of 20 projects is added (bulk sort path)
+    Then: The snapshot is sorted after each batch
+    And: Each batch bumps the version once and shows up in changes_since()
+    """
+    index = ProjectIndex()
+    index.replace_all({
+        Path("/p/kjbot"): _summary("KJBot"),
+        Path("/p/weather"): _summary("WeatherAPI"),
+    })
+    
+    assert index.update_many({
+        Path("/p/taskflow"): _summary("TaskFlow"),
+        Path("/p/kjbot"): _summary("Zeta"),
+        Path("/p/weather"): None,
+    })
+    assert [p.project_name for p in index.snapshot()] == ["TaskFlow", "Zeta"]
+    assert index.version == 2
+    _, changes = index.changes_since(1)
+    assert set(changes) == {Path("/p/taskflow"), Path("/p/kjbot"), Path("/p/weather")}
+    
+    index.update_many({Path(f"/p/bulk{i:02d}"): _summary(f"bulk{i:02d}") for i in reversed(range(20))})
+    names = [p.project_name for p in index.snapshot()]
+    assert names == sorted(names, key=str.lower) and len(names) == 22
+    assert index.version == 3
+    assert not index.update_many({Path("/p/weather"): None})
+
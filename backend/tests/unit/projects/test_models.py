@@ -60,4 +60,4 @@ def test_project_list_response_with_projects():
     ]
     
     response = ProjectListResponse(projects=projects)
-    assert len(response.projects) == 2
\ No newline at end of file
+    assert len(response.projects) == 2
@@ -0,0 +1,140 @@
+"""
+Unit tests for filtered / sorted / paginated project queries.
+"""
+import json
+from datetime import datetime, timezone
+import pytest
+from modules.projects import service
+from modules.projects.models import ProjectSort
+
+
+PROJECTS = [
+    # repo, project_name, description, created_at
+    ("kjbot", "KJBot", "Karaoke DJ system", "2025-11-15T10:30:00Z"),
+    ("weather-api", "WeatherAPI", "Weather data aggregation", "2025-11-13T09:15:00Z"),
+    ("taskflow", "TaskFlow", "Workflow automation", "2025-11-14T15:22:00Z"),
+    ("atlas", "atlas", "Map tiles", "2025-11-16T08:00:00Z"),
+    ("zephyr", "Zephyr", "Weather alerts", "2025-11-12T12:00:00Z"),
+]
+
+
+@pytest.fixture
+def projects_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(service.settings, "projects_base_dir", tmp_path)
+    for repo, name, description, created_at in PROJECTS:
+        (tmp_path / repo / ".contextkeep").mkdir(parents=True)
+        (tmp_path / repo / ".contextkeep" / "project.json").write_text(json.dumps({
+            "project_name": name,
+            "repo_name": repo,
+            "description": description,
+            "created_at": created_at
+        }))
+    return tmp_path
+
+
+def _names(response):
+    return [p.project_name for p in response.projects]
+
+
+def test_query_defaults_match_list_projects(projects_dir):
+    """
+    TC-Q1: An unfiltered query returns everything in name order
+    """
+    response = service.query_projects()
+    
+    assert _names(response) == [p.project_name for p in service.list_projects()]
+    assert _names(response) == ["atlas", "KJBot", "TaskFlow", "WeatherAPI", "Zephyr"]
+    assert response.next_cursor is None
+
+
+@pytest.mark.parametrize("sort, descending, expected", [
+    (ProjectSort.created_at, False, ["Zephyr", "WeatherAPI", "TaskFlow", "KJBot", "atlas"]),
+    (ProjectSort.created_at, True, ["atlas", "KJBot", "TaskFlow", "WeatherAPI", "Zephyr"]),
+    (ProjectSort.repo_name, False, ["atlas", "KJBot", "TaskFlow", "WeatherAPI", "Zephyr"]),
+    (ProjectSort.project_name, True, ["Zephyr", "WeatherAPI", "TaskFlow", "KJBot", "atlas"]),
+])
+def test_query_sort_orders(projects_dir, sort, descending, expected):
+    """
+    TC-Q2: Alternate sort keys and descending order
+    """
+    assert _names(service.query_projects(sort=sort, descending=descending)) == expected
+
+
+@pytest.mark.parametrize("sort", list(ProjectSort))
+@pytest.mark.parametrize("descending", [False, True])
+def test_query_cursor_pages_cover_everything(projects_dir, sort, descending):
+    """
+    TC-Q3: Following next_cursor visits every project exactly once
+    """
+    full = _names(service.query_projects(sort=sort, descending=descending))
+    
+    seen, cursor = [], None
+    while True:
+        page = service.query_projects(sort=sort, descending=descending, cursor=cursor, limit=2)
+        assert len(page.projects) <= 2
+        seen.extend(_names(page))
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    
+    assert seen == full
+
+
+def test_query_filters(projects_dir):
+    """
+    TC-Q4: Substring and created_at range filters
+    """
+    assert _names(service.query_projects(q="weather")) == ["WeatherAPI", "Zephyr"]
+    assert _names(service.query_projects(q="ZEPH")) == ["Zephyr"]
+    
+    after = datetime(2025, 11, 13, 9, 15, tzinfo=timezone.utc)
+    before = datetime(2025, 11, 16, tzinfo=timezone.utc)
+    for sort in ProjectSort:
+        result = service.query_projects(created_after=after, created_before=before, sort=sort)
+        assert set(_names(result)) == {"KJBot", "TaskFlow"}
+
+
+def test_query_filtered_pagination(projects_dir):
+    """
+    TC-Q5: Pagination with a filter only counts matching projects
+    """
+    first = service.query_projects(q="map", limit=1)
+    assert _names(first) == ["atlas"]
+    assert first.next_cursor is None
+    
+    first = service.query_projects(q="weather", limit=1)
+    second = service.query_projects(q="weather", limit=1, cursor=first.next_cursor)
+    
+    assert _names(first) == ["WeatherAPI"]
+    assert _names(second) == ["Zephyr"]
+    assert second.next_cursor is None
+
+
+def test_query_rejects_foreign_cursor(projects_dir):
+    """
+    TC-Q6: A cursor from a different sort order or garbage is rejected
+    """
+    cursor = service.query_projects(limit=1).next_cursor
+    
+    with pytest.raises(ValueError):
+        service.query_projects(cursor=cursor, sort=ProjectSort.created_at)
+    with pytest.raises(ValueError):
+        service.query_projects(cursor="not-a-cursor")
+
+
+def test_get_projects_paginated_endpoint(projects_dir, test_client):
+    """
+    TC-Q7: GET /api/projects with query parameters
+    """
+    response = test_client.get("/api/projects", params={"sort": "created_at", "order": "desc", "limit": 2})
+    assert response.status_code == 200
+    data = response.json()
+    assert [p["project_name"] for p in data["projects"]] == ["atlas", "KJBot"]
+    
+    response = test_client.get("/api/projects", params={
+        "sort": "created_at", "order": "desc", "limit": 2, "cursor": data["next_cursor"]
+    })
+    assert [p["project_name"] for p in response.json()["projects"]] == ["TaskFlow", "WeatherAPI"]
+    
+    assert test_client.get("/api/projects", params={"cursor": "bogus"}).status_code == 400
+    assert test_client.get("/api/projects", params={"sort": "size"}).status_code == 422
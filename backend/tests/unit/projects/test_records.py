@@ -0,0 +1,82 @@
+"""
+Unit tests for compact project records.
+"""
+import json
+import sys
+from datetime import datetime
+import pytest
+from modules.projects import service
+from modules.projects.models import ProjectMetadata, ProjectSummary
+from modules.projects.records import ProjectRecord, to_summary
+
+
+@pytest.mark.parametrize("created_at", [
+    "2025-11-15T10:30:00Z",
+    "2025-11-15T10:30:00.123456+05:30",
+    "1969-07-20T20:17:40-04:00",
+    "2025-11-15T10:30:00",
+])
+def test_record_round_trips_to_summary(created_at):
+    """
+    TC-RC1: A record gives back exactly the summary it was built from
+    
+    Given: Metadata with UTC, offset, pre-epoch and naive timestamps
+    When: A record is built from it and turned back into a ProjectSummary
+    Then: The summary serializes identically to one built from the metadata
+    And: created_timestamp() matches created_at.timestamp()
+    """
+    document = json.dumps({
+        "project_name": "KJBot",
+        "repo_name": "kjbot",
+        "description": "Karaoke DJ system",
+        "created_at": created_at,
+    })
+    
+    record = ProjectRecord.from_model(ProjectMetadata.model_validate_json(document))
+    
+    expected = ProjectSummary.model_validate_json(document)
+    assert record.to_summary().model_dump_json() == expected.model_dump_json()
+    assert record.created_timestamp() == expected.created_at.timestamp()
+    assert record == ProjectRecord.from_model(expected)
+
+
+def test_record_is_compact():
+    """
+    TC-RC2: Records have no __dict__, share repo names and precompute the sort key
+    """
+    created = datetime(2025, 11, 15, 10, 30)
+    first = ProjectRecord("KJBot", "".join(["kj", "bot"]), "a", created)
+    second = ProjectRecord("kjbot", "".join(["kjb", "ot"]), "b", created)
+    
+    assert not hasattr(first, "__dict__")
+    assert first.repo_name is second.repo_name is sys.intern("kjbot")
+    assert first.name_key == "kjbot"
+    assert second.name_key is second.project_name
+    assert type(first.created_us) is int
+
+
+def test_summaries_only_at_the_api_boundary(tmp_path, monkeypatch, test_client):
+    """
+    TC-RC3: The service keeps records; the API returns ProjectSummary JSON
+    
+    Given: One project on disk
+    When: It is listed through the service and the API
+    Then: The service returns ProjectRecords
+    And: The API response has the same fields as before
+    """
+    monkeypatch.setattr(service.settings, "projects_base_dir", tmp_path)
+    monkeypatch.setattr(service.settings, "watch_projects", False)
+    metadata = {
+        "project_name": "KJBot",
+        "repo_name": "kjbot",
+        "description": "Karaoke DJ system",
+        "created_at": "2025-11-15T10:30:00Z",
+    }
+    (tmp_path / "kjbot" / ".contextkeep").mkdir(parents=True)
+    (tmp_path / "kjbot" / ".contextkeep" / "project.json").write_text(json.dumps(metadata))
+    service.project_index.clear()
+    
+    assert all(type(p) is ProjectRecord for p in service.list_projects())
+    assert test_client.get("/api/projects").json() == {"projects": [metadata], "next_cursor": None}
+    assert to_summary(service.list_projects()[0]) == ProjectSummary(**metadata)
+    service.project_index.clear()
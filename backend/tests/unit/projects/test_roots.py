@@ -0,0 +1,160 @@
+"""
+Unit tests for listing projects from several project roots.
+"""
+import time
+from datetime import datetime
+from pathlib import Path
+from threading import Event
+import pytest
+from modules.projects import service
+from modules.projects.cache import MetadataCache
+from modules.projects.index import sort_key
+from modules.projects.models import ProjectMetadata
+from modules.projects.records import ProjectRecord
+from modules.projects.roots import ProjectRoot, merge_roots
+
+
+@pytest.fixture
+def roots(tmp_path, monkeypatch, write_project):
+    local, nfs, archive = (tmp_path / name for name in ["local", "nfs", "archive"])
+    write_project(local, "kjbot", "KJBot")
+    write_project(local, "zeta", "Zeta")
+    write_project(nfs, "atlas", "Atlas")
+    write_project(nfs, "mercury", "Mercury")
+    write_project(archive, "legacy", "legacy")
+    monkeypatch.setattr(service.settings, "projects_base_dir", local)
+    monkeypatch.setattr(service.settings, "extra_projects_dirs", [nfs, archive])
+    monkeypatch.setattr(service.settings, "root_scan_timeout", 0.5)
+    service.project_index.clear()
+    yield local, nfs, archive
+    service.project_index.clear()
+
+
+def test_merge_roots_matches_sorting():
+    """
+    TC-RT1: The k-way merge of sorted roots equals a full sort
+    """
+    roots = []
+    for r in range(3):
+        root = ProjectRoot(Path(f"/root{r}"), MetadataCache())
+        root.store({
+            Path(f"/root{r}/r{r}p{i}"): ProjectRecord(
+                f"Name {(i * 7 + r) % 10}", f"r{r}p{i}", "Test project", datetime(2025, 11, 15, 10, 30)
+            )
+            for i in range(10)
+        })
+        roots.append(root)
+    
+    merged = merge_roots(roots)
+    
+    every = {d: s for root in roots for d, s in root.projects.items()}
+    assert list(merged) == sorted(every, key=lambda d: sort_key(d, every[d]))
+
+
+def test_list_projects_merges_all_roots(roots):
+    """
+    TC-RT2: list_projects() lists the projects of every root in one order
+    
+    Given: Three roots with two, two and one projects
+    When: list_projects() is called
+    Then: All five projects are returned sorted by project_name
+    And: Each root caches its own metadata
+    """
+    local, nfs, archive = roots
+    
+    names = [p.project_name for p in service.list_projects()]
+    
+    assert names == ["Atlas", "KJBot", "legacy", "Mercury", "Zeta"]
+    caches = [root.cache for root in service.project_roots()]
+    assert caches[0] is service.metadata_cache
+    assert [len(c) for c in caches] == [2, 2, 1]
+
+
+def test_hung_root_does_not_stall_listing(roots, monkeypatch, write_project):
+    """
+    TC-RT3: A root that doesn't answer in time is served from its last scan
+    
+    Given: Three scanned roots
+    When: Listing the NFS root blocks and a project is added to the local root
+    Then: list_projects() returns within the timeout with the new project
+    And: The NFS projects come from its previous scan
+    And: The blocked scan is joined, not started again, until it returns
+    """
+    local, nfs, archive = roots
+    service.list_projects()
+    
+    release = Event()
+    calls = []
+    real_list = service.list_directories
+    
+    def list_directories(path):
+        calls.append(path)
+        if path == nfs:
+            release.wait(5)
+        return real_list(path)
+    
+    monkeypatch.setattr(service, "list_directories", list_directories)
+    write_project(local, "beta", "Beta")
+    
+    started = time.monotonic()
+    names = [p.project_name for p in service.list_projects()]
+    assert time.monotonic() - started < 2
+    assert names == ["Atlas", "Beta", "KJBot", "legacy", "Mercury", "Zeta"]
+    
+    service.list_projects()
+    assert calls.count(nfs) == 1
+    nfs_root = service.project_roots()[1]
+    assert nfs_root.timeouts == 2
+    
+    release.set()
+    deadline = time.monotonic() + 5
+    while nfs_root.scans < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    service.list_projects()
+    assert calls.count(nfs) == 2
+
+
+def test_write_metadata_updates_index_for_extra_roots(roots):
+    """
+    TC-RT4: Metadata written into an extra root lands in that root's cache and the index
+    """
+    local, nfs, archive = roots
+    service.list_projects()
+    metadata = ProjectMetadata(
+        project_name="Atlas 2", repo_name="atlas", description="Renamed", created_at="2025-11-15T10:30:00Z"
+    )
+    
+    service.write_project_metadata(nfs / "atlas", metadata, durable=False)
+    
+    nfs_cache = service.project_roots()[1].cache
+    assert len(nfs_cache) == 2 and len(service.metadata_cache) == 2
+    assert service.project_index.get(nfs / "atlas").project_name == "Atlas 2"
+
+
+def test_shared_name_listed_from_first_root(roots, write_project, test_client):
+    """
+    TC-RT5: A project id held by two roots is listed once, from the first root
+    
+    Given: Projects named "kjbot" in the primary root and in an extra root
+    When: The projects are listed, then the primary's project is removed
+          and re-added through watcher events
+    Then: Only the primary's project is listed (and /api/projects carries
+          it once); while it is gone the extra root's project takes its place
+    """
+    local, nfs, archive = roots
+    write_project(nfs, "kjbot", "KJBot Mirror")
+    
+    assert [p.project_name for p in service.list_projects()] == ["Atlas", "KJBot", "legacy", "Mercury", "Zeta"]
+    names = [p["project_name"] for p in test_client.get("/api/projects").json()["projects"]]
+    assert names.count("KJBot") == 1 and "KJBot Mirror" not in names
+    assert service.find_project_dir("kjbot") == local / "kjbot"
+    
+    metadata = service.metadata_path(local / "kjbot").read_text()
+    service.metadata_path(local / "kjbot").unlink()
+    service.project_index.update(local / "kjbot", service._load_watched(local / "kjbot", service.metadata_cache))
+    assert service.project_index.get(nfs / "kjbot").project_name == "KJBot Mirror"
+    
+    service.metadata_path(local / "kjbot").write_text(metadata)
+    service.project_index.update(local / "kjbot", service._load_watched(local / "kjbot", service.metadata_cache))
+    assert service.project_index.get(local / "kjbot").project_name == "KJBot"
+    assert service.project_index.get(nfs / "kjbot") is None
@@ -0,0 +1,159 @@
+"""
+Unit tests for the project search index.
+"""
+import json
+from datetime import datetime
+from pathlib import Path
+from threading import Thread
+from modules.projects import service
+from modules.projects.models import ProjectSummary
+from modules.projects.search import SearchIndex, tokenize
+
+
+def _summary(name: str, repo: str, description: str) -> ProjectSummary:
+    return ProjectSummary(
+        project_name=name,
+        repo_name=repo,
+        description=description,
+        created_at=datetime(2025, 11, 15, 10, 30)
+    )
+
+
+ENTRIES = {
+    Path("/p/kjbot"): _summary("KJBot", "kjbot", "Karaoke DJ system with queue management"),
+    Path("/p/weather-api"): _summary("WeatherAPI", "weather-api", "Real-time weather data aggregation"),
+    Path("/p/taskflow"): _summary("TaskFlow", "taskflow", "Workflow automation service"),
+}
+
+
+def _docs(results):
+    return [Path(doc).name for doc, _ in results]
+
+
+def test_tokenize_splits_words_and_camel_case():
+    """
+    TC-S1: Tokenizer lowercases and splits camelCase and punctuation
+    """
+    assert tokenize("WeatherAPI real-time") == {"weatherapi", "weather", "api", "real", "time"}
+    assert tokenize("  ") == set()
+
+
+def test_prefix_search_ranks_name_over_description():
+    """
+    TC-S2: Prefix matches across fields, ranked by field weight
+    
+    Given: An index with three projects
+    When: Searching "a" (a name term of one, a description term of another)
+    Then: Both match and the name match ranks first
+    """
+    index = SearchIndex()
+    index.sync(1, ENTRIES)
+    
+    assert _docs(index.search("wea")) == ["weather-api"]
+    assert _docs(index.search("work")) == ["taskflow"]
+    assert _docs(index.search("a")) == ["weather-api", "taskflow"]
+    assert _docs(index.search("dj kar")) == ["kjbot"]
+    assert index.search("dj weather") == []
+    assert index.search("") == []
+
+
+def test_exact_term_beats_prefix():
+    """
+    TC-S3: An exact term match outranks a longer term with the same prefix
+    """
+    index = SearchIndex()
+    index.sync(1, {
+        Path("/p/a"): _summary("Flow", "a", ""),
+        Path("/p/b"): _summary("Flowchart", "b", ""),
+    })
+    
+    assert _docs(index.search("flow")) == ["a", "b"]
+
+
+def test_sync_is_incremental():
+    """
+    TC-S4: sync() only touches added, changed and removed documents
+    """
+    index = SearchIndex()
+    assert index.sync(1, ENTRIES) == 3
+    assert index.sync(1, ENTRIES) == 0
+    
+    changed = dict(ENTRIES)
+    changed[Path("/p/kjbot")] = _summary("Karaoke Bot", "kjbot", "Renamed")
+    del changed[Path("/p/taskflow")]
+    
+    assert index.sync(2, changed) == 2
+    assert _docs(index.search("karaoke")) == ["kjbot"]
+    assert _docs(index.search("ka")) == ["kjbot"]
+    assert index.search("taskflow") == []
+    assert index.search("ta") == []
+
+
+def test_save_and_load_round_trip(tmp_path):
+    """
+    TC-S5: A persisted index answers queries identically after loading
+    """
+    index = SearchIndex()
+    index.sync(1, ENTRIES)
+    assert index.dirty
+    index.save(tmp_path / "search.idx")
+    assert not index.dirty
+    
+    loaded = SearchIndex()
+    assert loaded.load(tmp_path / "search.idx")
+    
+    for query in ["wea", "a", "queue mana", "taskflow"]:
+        assert loaded.search(query) == index.search(query)
+    assert loaded.sync(1, ENTRIES) == 0
+    assert SearchIndex().load(tmp_path / "missing.idx") is False
+
+
+def test_search_endpoint(tmp_path, monkeypatch, test_client):
+    """
+    TC-S6: GET /api/projects/search returns ranked projects
+    """
+    monkeypatch.setattr(service.settings, "projects_base_dir", tmp_path)
+    for path, summary in ENTRIES.items():
+        (tmp_path / path.name / ".contextkeep").mkdir(parents=True)
+        (tmp_path / path.name / ".contextkeep" / "project.json").write_text(json.dumps({
+            **summary.model_dump(mode="json")
+        }))
+    
+    response = test_client.get("/api/projects/search", params={"q": "wea"})
+    
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["project"]["project_name"] for r in results] == ["WeatherAPI"]
+    assert results[0]["score"] > 0
+    assert test_client.get("/api/projects/search", params={"q": ""}).status_code == 422
+
+
+def test_concurrent_saves(tmp_path):
+    """
+    TC-S7: Saves running at the same time each complete and leave one loadable file
+    
+    Given: An index with unsaved changes
+    When: Eight threads save it to the same path at once
+    Then: No save fails, the file loads and no temp files are left
+    """
+    index = SearchIndex()
+    index.sync(1, ENTRIES)
+    errors = []
+    
+    def save():
+        try:
+            index.save(tmp_path / "search.idx")
+        except Exception as e:
+            errors.append(e)
+    
+    threads = [Thread(target=save) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert errors == []
+    assert not index.dirty
+    assert SearchIndex().load(tmp_path / "search.idx")
+    assert [p.name for p in tmp_path.iterdir()] == ["search.idx"]
+
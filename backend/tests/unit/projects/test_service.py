@@ -7,7 +7,7 @@ from unittest.mock import patch, MagicMock
 from datetime import datetime
 import json
 from modules.projects.service import list_projects
-from modules.projects.models import ProjectSummary
+from modules.projects.models import ProjectMetadata, ProjectSummary
 
 
 @patch('modules.projects.service.read_json_file')
@@ -51,27 +51,27 @@ def test_list_projects_three_valid(mock_list_dirs, mock_read_json):
     
     # Mock JSON file reads (return in the order they're requested)
     mock_read_json.side_effect = [
-        {
+        ProjectMetadata.model_validate({
             "project_name": "KJBot",
             "repo_name": "kjbot",
             "description": "Karaoke DJ system",
             "created_at": "2025-11-15T10:30:00Z",
             "contextkeep_version": "0.1.0"
-        },
-        {
+        }),
+        ProjectMetadata.model_validate({
             "project_name": "WeatherAPI",
             "repo_name": "weather-api",
             "description": "Weather data",
             "created_at": "2025-11-13T09:15:00Z",
             "contextkeep_version": "0.1.0"
-        },
-        {
+        }),
+        ProjectMetadata.model_validate({
             "project_name": "TaskFlow",
             "repo_name": "taskflow",
             "description": "Workflow automation",
             "created_at": "2025-11-14T15:22:00Z",
             "contextkeep_version": "0.1.0"
-        }
+        })
     ]
     
     result = list_projects()
@@ -107,13 +107,13 @@ def test_list_projects_skip_invalid(mock_list_dirs, mock_read_json):
     
     # First call succeeds, second raises FileNotFoundError
     mock_read_json.side_effect = [
-        {
+        ProjectMetadata.model_validate({
             "project_name": "KJBot",
             "repo_name": "kjbot",
             "description": "Karaoke DJ system",
             "created_at": "2025-11-15T10:30:00Z",
             "contextkeep_version": "0.1.0"
-        },
+        }),
         FileNotFoundError()
     ]
     
@@ -142,17 +142,186 @@ def test_list_projects_skip_malformed_json(mock_list_dirs, mock_read_json):
     ]
     
     mock_read_json.side_effect = [
-        {
+        ProjectMetadata.model_validate({
             "project_name": "KJBot",
             "repo_name": "kjbot",
             "description": "Karaoke DJ system",
             "created_at": "2025-11-15T10:30:00Z",
             "contextkeep_version": "0.1.0"
-        },
+        }),
         json.JSONDecodeError("Invalid JSON", "", 0)
     ]
     
     result = list_projects()
     
     assert len(result) == 1
-    assert result[0].project_name == "KJBot"
\ No newline at end of file
+    assert result[0].project_name == "KJBot"
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_list_projects_parallel_load(tmp_path, monkeypatch, workers):
+    """
+    TC-P6: List projects - sequential and pooled loading agree
+    
+    Given: Valid, malformed and metadata-less project directories
+    When: list_projects() is called with metadata_workers = 1 and 4
+    Then: Invalid projects are skipped
+    And: Valid projects are sorted alphabetically (case-insensitive)
+    """
+    from modules.projects import service
+    monkeypatch.setattr(service.settings, "projects_base_dir", tmp_path)
+    monkeypatch.setattr(service.settings, "metadata_workers", workers)
+    
+    names = ["weather", "Alpha", "kjbot", "TaskFlow", "beta"]
+    for name in names:
+        (tmp_path / name / ".contextkeep").mkdir(parents=True)
+        (tmp_path / name / ".contextkeep" / "project.json").write_text(json.dumps({
+            "project_name": name,
+            "repo_name": name.lower(),
+            "description": "Test project",
+            "created_at": "2025-11-15T10:30:00Z"
+        }))
+    (tmp_path / "bad-json" / ".contextkeep").mkdir(parents=True)
+    (tmp_path / "bad-json" / ".contextkeep" / "project.json").write_text("{ nope")
+    (tmp_path / "no-metadata").mkdir()
+    
+    result = list_projects()
+    
+    assert [p.project_name for p in result] == ["Alpha", "beta", "kjbot", "TaskFlow", "weather"]
+
+
+def test_iter_projects_streams_and_updates_index(tmp_path, monkeypatch):
+    """
+    TC-P7: iter_projects() yields projects one by one
+    
+    Given: Two valid projects and one malformed one
+    When: iter_projects() is consumed lazily
+    Then: The first project is available before the scan finishes
+    And: After full consumption the index holds the valid projects
+    And: The scan went through the single-flight path and was recorded
+    """
+    import threading
+    from modules.projects import service
+    monkeypatch.setattr(service.settings, "projects_base_dir", tmp_path)
+    monkeypatch.setattr(service.settings, "metadata_workers", 1)
+    for name in ["kjbot", "taskflow"]:
+        (tmp_path / name / ".contextkeep").mkdir(parents=True)
+        (tmp_path / name / ".contextkeep" / "project.json").write_text(json.dumps({
+            "project_name": name,
+            "repo_name": name,
+            "description": "Test project",
+            "created_at": "2025-11-15T10:30:00Z"
+        }))
+    (tmp_path / "bad-json" / ".contextkeep").mkdir(parents=True)
+    (tmp_path / "bad-json" / ".contextkeep" / "project.json").write_text("{ nope")
+    service.project_index.clear()
+    release = threading.Event()
+    load_project = service.load_project
+    
+    def slow_load(project_dir, cache=None):
+        if project_dir.name == "taskflow":
+            release.wait(5)
+        return load_project(project_dir, cache)
+    
+    monkeypatch.setattr(service, "load_project", slow_load)
+    runs = service._scan_flight.runs
+    
+    projects = service.iter_projects()
+    first = next(projects)
+    assert first.project_name == "kjbot"
+    assert len(service.project_index) == 0
+    release.set()
+    rest = list(projects)
+    
+    assert [p.project_name for p in [first] + rest] == ["kjbot", "taskflow"]
+    assert [p.project_name for p in service.project_index.snapshot()] == ["kjbot", "taskflow"]
+    assert service._scan_flight.runs == runs + 1
+    assert service._scanned_at is not None
+    service.project_index.clear()
+
+
+def test_load_all_bounds_in_flight_loads(tmp_path, monkeypatch):
+    """
+    TC-P11: _load_all() keeps a bounded window of loads in flight
+    
+    Given: 20 project directories and 2 metadata workers
+    When: Only the first summary is consumed
+    Then: At most 4 loads have been submitted
+    And: Consuming the rest yields every summary in order
+    """
+    import time
+    from modules.projects import service
+    from modules.projects.cache import MetadataCache
+    from modules.projects.roots import ProjectRoot
+    monkeypatch.setattr(service.settings, "metadata_workers", 2)
+    started = []
+    
+    def fake_load(project_dir, cache=None):
+        started.append(project_dir)
+        return project_dir.name
+    
+    monkeypatch.setattr(service, "load_project", fake_load)
+    root = ProjectRoot(tmp_path, MetadataCache())
+    project_dirs = [tmp_path / f"p{i:02}" for i in range(20)]
+    
+    loads = service._load_all(root, project_dirs)
+    assert next(loads) == "p00"
+    time.sleep(0.1)
+    assert len(started) <= 4
+    
+    assert list(loads) == [d.name for d in project_dirs[1:]]
+
+
+def test_write_projects_metadata_updates_cache_and_index(tmp_path, monkeypatch):
+    """
+    TC-P9: Written metadata is served without re-reading the files
+    
+    Given: An empty projects_base_dir
+    When: Two projects are written with write_projects_metadata()
+    Then: Both project.json files exist and validate
+    And: The index holds both summaries and a scan reuses them from the cache
+    """
+    from modules.projects import service
+    from modules.projects.models import ProjectMetadata
+    monkeypatch.setattr(service.settings, "projects_base_dir", tmp_path)
+    service.project_index.clear()
+    service.metadata_cache.clear()
+    items = {
+        tmp_path / name: ProjectMetadata(
+            project_name=name,
+            repo_name=name.lower(),
+            description="Test project",
+            created_at=datetime(2025, 11, 15, 10, 30),
+        )
+        for name in ["TaskFlow", "KJBot"]
+    }
+    
+    summaries = service.write_projects_metadata(items, durable=False)
+    
+    for project_dir in items:
+        assert service.metadata_path(project_dir).exists()
+    assert service.project_index.snapshot() == [summaries[tmp_path / "KJBot"], summaries[tmp_path / "TaskFlow"]]
+    with patch("modules.projects.service.read_json_file") as read:
+        result = list_projects()
+    read.assert_not_called()
+    assert [p.project_name for p in result] == ["KJBot", "TaskFlow"]
+
+
+def test_context_documents(tmp_path, monkeypatch):
+    """
+    TC-P10: context_documents() returns every .contextkeep document through the cache
+    """
+    from modules.files.cache import ContentCache
+    from modules.projects import service
+    monkeypatch.setattr(service, "content_cache", ContentCache())
+    context = tmp_path / ".contextkeep"
+    (context / "cards").mkdir(parents=True)
+    (context / "project.json").write_text("{}")
+    (context / "cards" / "api.md").write_text("# API card")
+    (context / ".project.json.1234.tmp").write_text("partial")
+    
+    documents = service.context_documents(tmp_path)
+    service.context_documents(tmp_path)
+    
+    assert documents == {"cards/api.md": "# API card", "project.json": "{}"}
+    assert service.content_cache.stats()["stamp_hits"] == 2
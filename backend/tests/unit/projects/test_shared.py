@@ -0,0 +1,214 @@
+"""
+Unit tests for the project index shared between worker processes.
+
+Each SharedIndex stands in for one worker: flock() locks belong to an
+open file, so two handles in one process contend like two processes.
+"""
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+import pytest
+from modules.projects import service
+from modules.projects.index import ProjectIndex
+from modules.projects.records import ProjectRecord
+from modules.projects.shared import SUPPORTED, SharedIndex
+
+pytestmark = pytest.mark.skipif(not SUPPORTED, reason="flock() unavailable")
+
+
+def _record(name: str) -> ProjectRecord:
+    return ProjectRecord(name, name.lower(), "Test project", datetime(2025, 11, 15, 10, 30, tzinfo=timezone.utc))
+
+
+@pytest.fixture
+def workers(tmp_path):
+    handles = []
+    
+    def worker() -> SharedIndex:
+        handle = SharedIndex(tmp_path / "shared.db")
+        handles.append(handle)
+        return handle
+    
+    yield worker
+    for handle in handles:
+        handle.close()
+
+
+def test_reader_follows_scanner(workers):
+    """
+    TC-SH1: Readers apply only what the scanner published since their last sync
+    
+    Given: A scanner that published two projects and a reader that synced them
+    When: The scanner's index removes one project, updates the other and
+          adds a third
+    Then: The next publish writes just those three rows, and the reader's
+          index ends up equal to the scanner's
+    """
+    scanner, reader = workers(), workers()
+    assert scanner.try_acquire()
+    source, replica = ProjectIndex(), ProjectIndex()
+    source.replace_all({Path("/p/atlas"): _record("Atlas"), Path("/p/kjbot"): _record("KJBot")})
+    
+    assert reader.sync(replica) == 0
+    assert not replica.live
+    assert scanner.publish(source) == 2
+    assert reader.sync(replica) == 2
+    assert replica.live
+    assert replica.entries()[1] == source.entries()[1]
+    
+    source.update_many({Path("/p/atlas"): None, Path("/p/kjbot"): _record("KJBot 2")})
+    source.update(Path("/p/zeta"), _record("Zeta"))
+    
+    assert scanner.publish(source) == 3
+    assert scanner.publish(source) == 0
+    assert reader.sync(replica) == 3
+    assert reader.sync(replica) == 0
+    assert replica.entries()[1] == source.entries()[1]
+    assert [p.project_name for p in replica.snapshot()] == ["KJBot 2", "Zeta"]
+
+
+def test_unchanged_projects_keep_reader_version(workers):
+    """
+    TC-SH2: A full republish of unchanged projects doesn't change readers
+    
+    Given: A reader in sync with a scanner
+    When: A new scanner takes over and republishes everything
+    Then: The reader reloads, but its index version stays the same
+    """
+    scanner, reader = workers(), workers()
+    scanner.try_acquire()
+    source, replica = ProjectIndex(), ProjectIndex()
+    source.replace_all({Path("/p/atlas"): _record("Atlas")})
+    scanner.publish(source)
+    reader.sync(replica)
+    version = replica.version
+    scanner.close()
+    
+    successor = workers()
+    assert successor.try_acquire()
+    successor.publish(source)
+    
+    assert reader.sync(replica) == 1
+    assert replica.version == version
+
+
+def test_scanner_election(workers):
+    """
+    TC-SH3: Only one worker holds the scanner role; another takes over when it leaves
+    
+    Given: Two workers
+    When: Both try to become the scanner, then the scanner closes
+    Then: Only the first succeeds until it closes; then the second does
+    """
+    first, second = workers(), workers()
+    
+    assert first.try_acquire()
+    assert first.try_acquire()
+    assert not second.try_acquire()
+    assert not second.is_scanner
+    
+    first.close()
+    
+    assert second.try_acquire()
+    assert second.is_scanner
+
+
+def test_reader_worker_never_scans(tmp_path, monkeypatch, write_project):
+    """
+    TC-SH4: A worker that isn't the scanner serves the shared index without scanning
+    
+    Given: Another worker holding the scanner role and publishing a project
+    When: This worker starts the shared index and lists projects
+    Then: It lists the published project and never scans the project root
+    """
+    write_project(tmp_path, "unpublished", "Unpublished")
+    monkeypatch.setattr(service.settings, "projects_base_dir", tmp_path)
+    monkeypatch.setattr(service.settings, "shared_index_interval", 0.01)
+    service.project_index.clear()
+    scans = []
+    monkeypatch.setattr(service, "scan_projects", lambda on_load=None: scans.append(1) or {})
+    scanner = SharedIndex(service.shared_index_path())
+    assert scanner.try_acquire()
+    source = ProjectIndex()
+    source.replace_all({tmp_path / "atlas": _record("Atlas")})
+    scanner.publish(source)
+    
+    try:
+        service.start_shared_index()
+        deadline = time.monotonic() + 5
+        while not service.project_index.live and time.monotonic() < deadline:
+            time.sleep(0.01)
+        
+        assert not service.owns_projects()
+        assert [p.project_name for p in service.list_projects()] == ["Atlas"]
+        assert scans == []
+    finally:
+        service.stop_shared_index()
+        scanner.close()
+        service.stop_watching()
+
+
+def test_elected_worker_scans_and_publishes(tmp_path, monkeypatch, write_project):
+    """
+    TC-SH5: The first worker to start becomes the scanner and publishes its scan
+    
+    Given: A project root and no other worker
+    When: This worker starts the shared index
+    Then: It scans the root and a reader sees the project
+    """
+    write_project(tmp_path, "atlas", "Atlas")
+    monkeypatch.setattr(service.settings, "projects_base_dir", tmp_path)
+    monkeypatch.setattr(service.settings, "shared_index_interval", 0.01)
+    monkeypatch.setattr(service.settings, "persist_catalog", False)
+    service.project_index.clear()
+    reader, replica = SharedIndex(service.shared_index_path()), ProjectIndex()
+    
+    try:
+        service.start_shared_index()
+        deadline = time.monotonic() + 5
+        while not replica.live and time.monotonic() < deadline:
+            reader.sync(replica)
+            time.sleep(0.01)
+        
+        assert service.owns_projects()
+        assert not reader.try_acquire()
+        assert [p.project_name for p in replica.snapshot()] == ["Atlas"]
+    finally:
+        service.stop_shared_index()
+        reader.close()
+        service.stop_watching()
+
+
+def test_tags_name_the_published_version(workers, monkeypatch):
+    """
+    TC-SH6: Workers holding the same published version give the same ETag and event id
+    
+    Given: A scanner and a reader in sync, at different local index versions
+    When: Each computes the ETag and event id of its index
+    Then: Both give the same tags, the event id resolves to each worker's
+          own index version, and a change the scanner hasn't published
+          yet falls back to a tag of its own
+    """
+    scanner, reader = workers(), workers()
+    scanner.try_acquire()
+    source, replica = ProjectIndex(), ProjectIndex()
+    source.update(Path("/p/zeta"), _record("Zeta"))
+    source.replace_all({Path("/p/atlas"): _record("Atlas")})
+    source.live = True
+    scanner.publish(source)
+    reader.sync(replica)
+    assert source.version != replica.version
+    
+    tags = []
+    for handle, index in ((scanner, source), (reader, replica)):
+        monkeypatch.setattr(service, "_shared", handle)
+        monkeypatch.setattr(service, "project_index", index)
+        tags.append((service.projects_etag()[0], service.event_id(index.version)))
+        assert service.parse_event_id(tags[0][1]) == index.version
+    assert tags[0] == tags[1]
+    
+    monkeypatch.setattr(service, "_shared", scanner)
+    monkeypatch.setattr(service, "project_index", source)
+    source.update(Path("/p/kjbot"), _record("KJBot"))
+    assert service.projects_etag()[0] not in [etag for etag, _ in tags]
+    assert service.event_id(source.version).startswith(service._BOOT_ID)
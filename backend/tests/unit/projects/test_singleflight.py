@@ -0,0 +1,177 @@
+"""
+Unit tests for single-flight scan coalescing.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+from unittest.mock import patch
+import time
+import pytest
+from modules.projects import service
+from modules.projects.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_run():
+    """
+    TC-SF1: Concurrent callers share one execution and its result
+    
+    Given: A slow function
+    When: 8 threads call do() with the same key at once
+    Then: The function runs once and every caller gets its result
+    """
+    flight = SingleFlight()
+    started = Event()
+    release = Event()
+    calls = []
+    
+    def work():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return object()
+    
+    with ThreadPoolExecutor(8) as pool:
+        leader = pool.submit(flight.do, "scan", work)
+        started.wait(5)
+        followers = [pool.submit(flight.do, "scan", work) for _ in range(7)]
+        while flight.shared < 7:
+            time.sleep(0.001)
+        release.set()
+        results = [leader.result()] + [f.result() for f in followers]
+    
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+    assert (flight.runs, flight.shared) == (1, 7)
+    assert not flight.in_flight("scan")
+
+
+def test_errors_reach_every_caller_and_nothing_is_cached():
+    """
+    TC-SF2: A failed run raises in all callers; the next call runs again
+    """
+    flight = SingleFlight()
+    
+    def fail():
+        raise OSError("mount gone")
+    
+    with pytest.raises(OSError):
+        flight.do("scan", fail)
+    
+    assert flight.do("scan", lambda: 1) == 1
+    assert flight.do("scan", lambda: 2) == 2
+    assert flight.runs == 3
+
+
+def test_concurrent_list_projects_scan_once(tmp_path, monkeypatch):
+    """
+    TC-SF3: Concurrent list_projects() calls coalesce into one scan
+    """
+    monkeypatch.setattr(service.settings, "projects_base_dir", tmp_path)
+    release = Event()
+    scans = []
+    
+    def slow_list_directories(path):
+        scans.append(path)
+        release.wait(5)
+        return []
+    
+    with patch.object(service, "list_directories", slow_list_directories):
+        with ThreadPoolExecutor(16) as pool:
+            futures = [pool.submit(service.list_projects) for _ in range(16)]
+            while service._scan_flight.shared < 15:
+                time.sleep(0.001)
+            release.set()
+            assert all(f.result() == [] for f in futures)
+    
+    assert len(scans) == 1
+
+
+def test_stale_while_revalidate(tmp_path, monkeypatch):
+    """
+    TC-SF4: Within the stale window the index is served and refreshed in the background
+    
+    Given: scan_stale_seconds is 60, scan_fresh_seconds 0 and a scan just finished
+    When: list_projects() is called again
+    Then: It returns without waiting for a scan
+    And: A scan is started in the background
+    """
+    monkeypatch.setattr(service.settings, "projects_base_dir", tmp_path)
+    monkeypatch.setattr(service.settings, "scan_stale_seconds", 60.0)
+    monkeypatch.setattr(service.settings, "scan_fresh_seconds", 0.0)
+    monkeypatch.setattr(service, "_scanned_at", None)
+    release = Event()
+    
+    with patch.object(service, "list_directories", return_value=[]):
+        service.list_projects()
+    
+    def blocked(path):
+        release.wait(5)
+        return []
+    
+    try:
+        with patch.object(service, "list_directories", blocked):
+            start = time.monotonic()
+            assert service.list_projects() == []
+            assert time.monotonic() - start < 1
+            deadline = time.monotonic() + 5
+            while not service._scan_flight.in_flight("scan") and time.monotonic() < deadline:
+                time.sleep(0.001)
+            assert service._scan_flight.in_flight("scan")
+            release.set()
+            while service._scan_flight.in_flight("scan"):
+                time.sleep(0.001)
+    finally:
+        release.set()
+        service.project_index.clear()
+
+
+def test_concurrent_starts_run_once():
+    """
+    TC-SF5: Background starts racing for one key run the function once
+    
+    Given: A slow function
+    When: 16 threads call start() with the same key at once, and do() joins
+    Then: One thread runs it, the other starts return False and do()
+          gets the background run's result
+    """
+    flight = SingleFlight()
+    release = Event()
+    calls = []
+    
+    def work():
+        calls.append(1)
+        release.wait(5)
+        return "scanned"
+    
+    with ThreadPoolExecutor(16) as pool:
+        started = list(pool.map(lambda _: flight.start("scan", work), range(16)))
+        joined = pool.submit(flight.do, "scan", work)
+        while flight.shared < 1:
+            time.sleep(0.001)
+        release.set()
+        assert joined.result() == "scanned"
+    
+    assert started.count(True) == 1
+    assert len(calls) == 1
+
+
+def test_fresh_scan_is_not_revalidated(tmp_path, monkeypatch):
+    """
+    TC-SF6: Within scan_fresh_seconds of the last scan no background scan starts
+    
+    Given: scan_stale_seconds is 60, scan_fresh_seconds 30 and a scan just finished
+    When: list_projects() is called again
+    Then: The index is served without starting another scan
+    """
+    monkeypatch.setattr(service.settings, "projects_base_dir", tmp_path)
+    monkeypatch.setattr(service.settings, "scan_stale_seconds", 60.0)
+    monkeypatch.setattr(service.settings, "scan_fresh_seconds", 30.0)
+    monkeypatch.setattr(service, "_scanned_at", None)
+    
+    try:
+        with patch.object(service, "list_directories", return_value=[]):
+            service.list_projects()
+            runs = service._scan_flight.runs
+            assert service.list_projects() == []
+        assert service._scan_flight.runs == runs
+    finally:
+        service.project_index.clear()
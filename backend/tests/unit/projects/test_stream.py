@@ -0,0 +1,117 @@
+"""
+Unit tests for the project change stream.
+"""
+from datetime import datetime
+from pathlib import Path
+import asyncio
+import json
+import pytest
+from modules.projects import index as index_module
+from modules.projects import service
+from modules.projects.api import project_event_stream
+from modules.projects.index import ProjectIndex
+from modules.projects.models import ProjectDeltaEvent, ProjectSnapshotEvent
+from modules.projects.records import ProjectRecord
+
+
+def _summary(name: str) -> ProjectRecord:
+    return ProjectRecord(name, name.lower(), "Test project", datetime(2025, 11, 15, 10, 30))
+
+
+@pytest.fixture
+def projects_dir(tmp_path, monkeypatch, write_project):
+    monkeypatch.setattr(service.settings, "projects_base_dir", tmp_path)
+    write_project(tmp_path, "kjbot", "KJBot")
+    yield tmp_path
+    service.project_index.clear()
+
+
+def test_changes_since_coalesces():
+    """
+    TC-S1: Changes since a version are coalesced per project
+    
+    Given: An index at version 1 with one project
+    When: A project is added then updated, and another added then removed
+    Then: changes_since(1) reports the net change of each project only
+    """
+    index = ProjectIndex()
+    kjbot = _summary("KJBot")
+    index.replace_all({Path("/p/kjbot"): kjbot})
+    
+    first, second = _summary("TaskFlow"), _summary("TaskFlow v2")
+    index.update(Path("/p/taskflow"), first)
+    index.update(Path("/p/taskflow"), second)
+    index.update(Path("/p/tmp"), _summary("Tmp"))
+    index.update(Path("/p/tmp"), None)
+    
+    version, changes = index.changes_since(1)
+    
+    assert version == index.version
+    assert changes == {Path("/p/taskflow"): (None, second)}
+    assert index.changes_since(index.version) == (index.version, {})
+
+
+def test_changes_since_too_old(monkeypatch):
+    """
+    TC-S2: Versions the change log no longer covers need a snapshot
+    """
+    monkeypatch.setattr(index_module, "CHANGELOG_SIZE", 2)
+    index = ProjectIndex()
+    for i in range(4):
+        index.update(Path(f"/p/{i}"), _summary(f"P{i}"))
+    
+    assert index.changes_since(0)[1] is None
+    assert index.changes_since(2)[1] is not None
+    assert index.changes_since(99)[1] is None
+
+
+def test_project_event_snapshot_then_delta(projects_dir, write_project):
+    """
+    TC-S3: A new subscriber gets a snapshot, then deltas
+    """
+    version, event = service.project_event(None)
+    assert isinstance(event, ProjectSnapshotEvent)
+    assert [(e.id, e.project.project_name) for e in event.projects] == [("kjbot", "KJBot")]
+    
+    assert service.project_event(version) == (version, None)
+    
+    write_project(projects_dir, "taskflow", "TaskFlow")
+    write_project(projects_dir, "kjbot", "KJBot 2")
+    version, event = service.project_event(version)
+    assert isinstance(event, ProjectDeltaEvent)
+    assert [e.id for e in event.added] == ["taskflow"]
+    assert [e.project.project_name for e in event.updated] == ["KJBot 2"]
+    assert event.removed == []
+
+
+def test_parse_event_id():
+    """
+    TC-S4: Only event ids from this server run are resumable
+    """
+    assert service.parse_event_id(service.event_id(42)) == 42
+    assert service.parse_event_id("0000-42") is None
+    assert service.parse_event_id("garbage") is None
+    assert service.parse_event_id(None) is None
+
+
+def test_event_stream_format(projects_dir, monkeypatch, write_project):
+    """
+    TC-S5: The stream emits SSE-framed snapshot and delta events
+    """
+    monkeypatch.setattr(service.settings, "watch_poll_interval", 0.01)
+    
+    async def read_two():
+        stream = project_event_stream()
+        first = await stream.__anext__()
+        write_project(projects_dir, "taskflow", "TaskFlow")
+        second = await stream.__anext__()
+        await stream.aclose()
+        return first.decode(), second.decode()
+    
+    first, second = asyncio.run(read_two())
+    
+    assert first.startswith(f"id: {service._BOOT_ID}-")
+    assert "\nevent: snapshot\n" in first and first.endswith("\n\n")
+    assert "\nevent: delta\n" in second
+    data = json.loads(second.split("data: ", 1)[1])
+    assert data["added"][0]["id"] == "taskflow"
@@ -0,0 +1,158 @@
+"""
+Unit tests for the project watcher (real files, both backends).
+"""
+import time
+from threading import Event, Thread
+import pytest
+from modules.projects import service
+from modules.projects.index import ProjectIndex
+from modules.projects.watcher import ProjectWatcher
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def _names(index):
+    return [p.project_name for p in index.snapshot()]
+
+
+@pytest.fixture(params=[True, False], ids=["inotify", "polling"])
+def watcher(request, tmp_path, monkeypatch, write_project):
+    monkeypatch.setattr(service.settings, "projects_base_dir", tmp_path)
+    write_project(tmp_path, "kjbot", "KJBot")
+    index = ProjectIndex()
+    watcher = ProjectWatcher(
+        tmp_path,
+        index,
+        scan=service.scan_projects,
+        load=service.load_project,
+        poll_interval=0.05,
+        use_inotify=request.param,
+    )
+    watcher.start()
+    assert _wait_for(lambda: index.live)
+    yield watcher
+    watcher.stop()
+
+
+def test_initial_scan_makes_index_live(watcher):
+    """
+    TC-W1: Watcher performs a full scan before going live
+    """
+    assert _names(watcher.index) == ["KJBot"]
+
+
+def test_create_edit_delete_update_index(watcher, tmp_path, write_project):
+    """
+    TC-W2: Create, edit and delete events update the index incrementally
+    
+    Given: A live watcher with one project
+    When: A project is created, its metadata edited, and then deleted
+    Then: The index reflects each change without a restart
+    """
+    index = watcher.index
+    
+    write_project(tmp_path, "taskflow", "TaskFlow")
+    assert _wait_for(lambda: _names(index) == ["KJBot", "TaskFlow"])
+    
+    write_project(tmp_path, "taskflow", "Alpha TaskFlow")
+    assert _wait_for(lambda: _names(index) == ["Alpha TaskFlow", "KJBot"])
+    
+    (tmp_path / "taskflow" / ".contextkeep" / "project.json").unlink()
+    assert _wait_for(lambda: _names(index) == ["KJBot"])
+
+
+def test_stop_marks_index_not_live(watcher):
+    """
+    TC-W3: Stopping the watcher takes the index offline
+    """
+    watcher.stop()
+    assert watcher.index.live is False
+
+
+def test_list_projects_reads_live_index(tmp_path, monkeypatch, write_project):
+    """
+    TC-W4: list_projects() serves the live index without scanning
+    """
+    monkeypatch.setattr(service.settings, "projects_base_dir", tmp_path)
+    write_project(tmp_path, "kjbot", "KJBot")
+    service.start_watching()
+    try:
+        assert _wait_for(lambda: service.project_index.live)
+        monkeypatch.setattr(service, "list_directories", lambda path: pytest.fail("scanned"))
+        assert [p.project_name for p in service.list_projects()] == ["KJBot"]
+    finally:
+        service.stop_watching()
+    assert service.project_index.live is False
+
+
+def test_watcher_joins_request_scan_in_flight(tmp_path, monkeypatch, write_project):
+    """
+    TC-W5: A watcher starting during a request-driven scan shares its result
+    
+    Given: A list_projects() call whose scan is still running
+    When: The watchers start and their initial rescan joins that scan
+    Then: The index goes live with the scanned projects and the watcher
+          thread keeps running
+    """
+    monkeypatch.setattr(service.settings, "projects_base_dir", tmp_path)
+    write_project(tmp_path, "kjbot", "KJBot")
+    service.project_index.clear()
+    scan = service.scan_projects
+    release = Event()
+    
+    def slow_scan(on_load=None):
+        release.wait(5)
+        return scan(on_load)
+    
+    monkeypatch.setattr(service, "scan_projects", slow_scan)
+    request = Thread(target=service.list_projects)
+    request.start()
+    assert _wait_for(lambda: service._scan_flight.in_flight("scan"))
+    try:
+        watchers = service.start_watching()
+        time.sleep(0.1)
+        release.set()
+        request.join(5)
+        
+        assert _wait_for(lambda: service.project_index.live)
+        assert [p.project_name for p in service.list_projects()] == ["KJBot"]
+        assert all(w._thread.is_alive() for w in watchers)
+    finally:
+        release.set()
+        service.stop_watching()
+
+
+def test_failed_initial_scan_is_retried(tmp_path, monkeypatch, write_project):
+    """
+    TC-W6: A failing initial scan doesn't stop the watcher
+    
+    Given: A scan that fails the first time (e.g. a mount not ready yet)
+    When: The watcher starts
+    Then: It retries after poll_interval and the index goes live
+    """
+    write_project(tmp_path, "kjbot", "KJBot")
+    monkeypatch.setattr(service.settings, "projects_base_dir", tmp_path)
+    attempts = []
+    
+    def flaky_scan():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise PermissionError("not yet")
+        return service.scan_projects()
+    
+    index = ProjectIndex()
+    watcher = ProjectWatcher(tmp_path, index, scan=flaky_scan, load=service.load_project, poll_interval=0.05)
+    watcher.start()
+    try:
+        assert _wait_for(lambda: index.live)
+        assert _names(index) == ["KJBot"]
+        assert len(attempts) == 2
+    finally:
+        watcher.stop()
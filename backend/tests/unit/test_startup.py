@@ -0,0 +1,66 @@
+"""
+Startup-time regression tests for the API process.
+
+Each test imports main in a fresh interpreter, since the backend is
+spawned on demand and its cold start is user-visible.
+"""
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+# Budget for importing main and starting its lifespan on top of FastAPI
+# itself (which we can't make cheaper), generous enough for slow CI machines
+OWN_IMPORT_BUDGET_S = 0.3
+
+# Only needed once background services start or on rarely used paths
+DEFERRED_MODULES = ["sqlite3", "ctypes", "modules.projects.watcher", "modules.projects.catalog"]
+
+
+# Imports main and runs the lifespan up to the point uvicorn binds; the
+# background threads it starts are not run, so only the pre-bind path counts
+_STARTUP = """
+import asyncio, json, sys, threading, time
+import fastapi
+threading.Thread.start = lambda self: None
+start = time.perf_counter()
+import main
+asyncio.run(main.lifespan(main.app).__aenter__())
+seconds = time.perf_counter() - start
+print(json.dumps({"seconds": seconds, "loaded": [m for m in %r if m in sys.modules]}))
+""" % (DEFERRED_MODULES,)
+
+
+def _run(code: str) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout)
+
+
+def test_startup_within_budget():
+    """
+    TC-ST1: Importing main:app and starting its lifespan stays within the startup budget
+    
+    Given: A fresh interpreter with FastAPI already imported
+    When: main is imported and the lifespan startup runs
+    Then: The median extra time of 3 runs is below OWN_IMPORT_BUDGET_S
+    """
+    seconds = statistics.median(_run(_STARTUP)["seconds"] for _ in range(3))
+    
+    assert seconds < OWN_IMPORT_BUDGET_S, f"startup took {seconds * 1000:.0f} ms"
+
+
+def test_startup_defers_optional_modules():
+    """
+    TC-ST2: Watcher and catalog dependencies are not loaded before the server binds
+    
+    Given: The default settings (catalog persisted, projects watched)
+    When: main is imported and the lifespan startup runs
+    Then: None of DEFERRED_MODULES has been imported
+    """
+    assert _run(_STARTUP)["loaded"] == []